@@ -0,0 +1,274 @@
+"""
+Batch Transcription for the Whisper Client
+Version: 1.3
+Timestamp: 2026-10-19 23:05 CET
+
+This is the offline counterpart of main.py. It streams recorded audio files
+through the WhisperLive server, one WhisperWebSocket session per file, using
+the same capture -> tumbling window -> send path and TextManager sentence
+pipeline as live dictation. Sentences are collected into a transcript per
+file instead of being typed into the active window.
+
+The number of concurrent sessions is bounded and audio is paced at a
+multiple of real time, so a backlog can be pushed through as fast as the
+server keeps up without flooding it with more streams than it can serve.
+
+Usage:
+    python batch.py recordings/ --parallel 4 --speed 4
+    python batch.py meeting.wav --speed 0 --output-dir transcripts/
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import config
+from src import logger
+from src.audio import AudioManager, AudioProcessor, FileSource
+from src.logging import get_logger, log_error, log_info
+from src.text import TextManager
+from src.ws_client import WhisperWebSocket
+from src.ws_client.connection import ConnectionManager
+
+
+@dataclass
+class FileResult:
+    """Outcome and throughput of one transcribed file."""
+
+    path: str
+    transcript_path: Optional[str] = None
+    sentences: int = 0
+    characters: int = 0
+    audio_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    bytes_sent: int = 0
+    error: Optional[str] = None
+
+    @property
+    def realtime_factor(self):
+        """Seconds of audio transcribed per second of wall time."""
+        return self.audio_seconds / self.wall_seconds if self.wall_seconds else 0.0
+
+    def to_dict(self):
+        data = asdict(self)
+        data["realtime_factor"] = self.realtime_factor
+        return data
+
+
+class TranscriptTextManager(TextManager):
+    """TextManager that collects output sentences instead of typing them."""
+
+    def __init__(self):
+        super().__init__()
+        self.sentences: List[str] = []
+
+    def insert_text(self, text):
+        """Append the sentence to the transcript."""
+        self.sentences.append(text)
+
+
+class BatchTranscriber:
+    """Transcribes audio files with a bounded number of parallel sessions."""
+
+    def __init__(
+        self,
+        output_dir=config.BATCH_OUTPUT_DIR,
+        max_sessions=config.BATCH_MAX_SESSIONS,
+        speed=config.BATCH_SPEED,
+        url=None,
+        file_timeout=config.BATCH_FILE_TIMEOUT,
+    ):
+        """Initialize the transcriber.
+
+        Args:
+            output_dir: Directory for transcripts and batch_stats.json
+            max_sessions: Maximum number of concurrent server sessions
+            speed: Audio pacing as a multiple of real time (0 = unpaced)
+            url: Server URL (defaults to config.WS_URL)
+            file_timeout: Maximum seconds to stream a single file
+
+        """
+        self.output_dir = Path(output_dir)
+        self.max_sessions = max(1, max_sessions)
+        self.speed = speed
+        self.url = url
+        self.file_timeout = file_timeout
+
+    def transcribe_file(self, path, transcript_name=None) -> FileResult:
+        """Stream one file through its own session and write its transcript."""
+        path = Path(path)
+        result = FileResult(path=str(path))
+        start = time.perf_counter()
+
+        websocket = WhisperWebSocket(url=self.url)
+        text_manager = TranscriptTextManager()
+        websocket.set_text_callback(text_manager.process_segments)
+        processor = AudioProcessor()
+        websocket.set_replay_callback(processor.mark_discontinuity)
+        audio_manager = None
+
+        def on_window(window):
+            if websocket.send_audio(window, capture_time=processor.last_capture_time):
+                result.bytes_sent += len(window)
+
+        try:
+            source = FileSource(path, realtime=self.speed > 0, speed=self.speed or 1.0)
+            audio_manager = AudioManager(source=source)
+
+            if not websocket.connect():
+                raise RuntimeError("Could not connect to server")
+            if not websocket.start_processing():
+                raise RuntimeError("Server not ready for processing")
+
+            processor.start_processing(on_window)
+            audio_manager.start_recording(processor.process_audio, processor.mark_discontinuity)
+            if not audio_manager.wait_until_finished(timeout=self.file_timeout):
+                raise TimeoutError(f"File not streamed within {self.file_timeout}s")
+            processor.wait_until_idle()
+
+            # END_OF_AUDIO, wait for the final segments, then flush the last sentence
+            websocket.stop_processing()
+            text_manager.output_sentence()
+
+            result.audio_seconds = source.frames_read / source.rate
+            result.sentences = len(text_manager.sentences)
+            result.characters = sum(len(sentence) for sentence in text_manager.sentences)
+            result.transcript_path = self._write_transcript(
+                transcript_name or path.stem + ".txt", text_manager.sentences
+            )
+        except Exception as e:
+            result.error = str(e)
+            log_error(logger, "⚠️ Transcription of %s failed: %s", path, e)
+        finally:
+            processor.stop_processing()
+            if audio_manager:
+                audio_manager.cleanup()
+            websocket.cleanup()
+            text_manager.close()
+            ConnectionManager.unregister_instance(websocket.client_id)
+            result.wall_seconds = time.perf_counter() - start
+
+        log_info(
+            logger,
+            "📄 %s: %d sentences, %.1fs audio in %.1fs (%.1fx real time)",
+            path.name,
+            result.sentences,
+            result.audio_seconds,
+            result.wall_seconds,
+            result.realtime_factor,
+        )
+        return result
+
+    def _write_transcript(self, name, sentences):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        transcript_path = self.output_dir / name
+        with open(transcript_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(sentences) + "\n" if sentences else "")
+        return str(transcript_path)
+
+    def run(self, files) -> List[FileResult]:
+        """Transcribe all files and write batch_stats.json."""
+        files = [Path(f) for f in files]
+        start = time.perf_counter()
+
+        # Files with the same name from different directories get a suffix
+        names: Dict[str, int] = {}
+        transcript_names = []
+        for path in files:
+            count = names.get(path.stem, 0)
+            names[path.stem] = count + 1
+            transcript_names.append(f"{path.stem}_{count}.txt" if count else f"{path.stem}.txt")
+
+        log_info(
+            logger,
+            "Transcribing %d files with up to %d sessions (speed: %s)",
+            len(files),
+            self.max_sessions,
+            f"{self.speed}x" if self.speed > 0 else "unpaced",
+        )
+        with ThreadPoolExecutor(self.max_sessions, thread_name_prefix="BatchSession") as pool:
+            results = list(pool.map(self.transcribe_file, files, transcript_names))
+
+        self._write_stats(results, time.perf_counter() - start)
+        return results
+
+    def _write_stats(self, results, wall_seconds):
+        audio_seconds = sum(r.audio_seconds for r in results)
+        stats = {
+            "files": [r.to_dict() for r in results],
+            "totals": {
+                "files": len(results),
+                "failed": sum(1 for r in results if r.error),
+                "sentences": sum(r.sentences for r in results),
+                "audio_seconds": audio_seconds,
+                "wall_seconds": wall_seconds,
+                "realtime_factor": audio_seconds / wall_seconds if wall_seconds else 0.0,
+                "max_sessions": self.max_sessions,
+                "speed": self.speed,
+            },
+        }
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.output_dir / "batch_stats.json", "w", encoding="utf-8") as f:
+            json.dump(stats, f, indent=2)
+        log_info(
+            logger,
+            "✓ %d files, %.1fs audio in %.1fs (%.1fx real time), %d failed",
+            len(results),
+            audio_seconds,
+            wall_seconds,
+            stats["totals"]["realtime_factor"],
+            stats["totals"]["failed"],
+        )
+
+
+def collect_files(inputs, patterns=config.BATCH_FILE_PATTERNS) -> List[Path]:
+    """Expands files and directories into a sorted list of audio files."""
+    files = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            for pattern in patterns:
+                files.extend(path.rglob(pattern))
+        elif path.exists():
+            files.append(path)
+        else:
+            log_error(logger, "⚠️ Input not found: %s", path)
+    return sorted(set(files))
+
+
+def main():
+    get_logger()
+    parser = argparse.ArgumentParser(description="Transcribe audio files with WhisperLive")
+    parser.add_argument("inputs", nargs="+", help="Audio files or directories")
+    parser.add_argument("--output-dir", default=config.BATCH_OUTPUT_DIR, help="Output directory")
+    parser.add_argument(
+        "--parallel", type=int, default=config.BATCH_MAX_SESSIONS, help="Concurrent sessions"
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=config.BATCH_SPEED,
+        help="Pacing as a multiple of real time (0 = as fast as possible)",
+    )
+    parser.add_argument("--url", default=config.WS_URL, help="WhisperLive server URL")
+    args = parser.parse_args()
+
+    files = collect_files(args.inputs)
+    if not files:
+        log_error(logger, "⚠️ No audio files found")
+        sys.exit(1)
+
+    transcriber = BatchTranscriber(
+        output_dir=args.output_dir, max_sessions=args.parallel, speed=args.speed, url=args.url
+    )
+    results = transcriber.run(files)
+    sys.exit(1 if any(r.error for r in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
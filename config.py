@@ -1,7 +1,7 @@
 """
 Central configuration file for the Whisper Client
-Version: 1.1
-Timestamp: 2025-04-20 18:08 CET
+Version: 1.16
+Timestamp: 2026-10-19 21:40 CET
 """
 
 # Base Timing Constants
@@ -41,6 +41,11 @@ WS_READY_TIMEOUT = BASE_TIMEOUT * 5  # Timeout for server-ready signal
 WS_CLEANUP_TIMEOUT = BASE_TIMEOUT * 3  # Timeout for cleanup operations
 WS_STATE_LOG_INTERVAL = BASE_DELAY * 50  # Interval for state logging (5 seconds)
 
+# Heartbeat (dead-peer detection after at most interval + timeout seconds)
+WS_PING_INTERVAL = BASE_TIMEOUT * 1.5  # Ping the server every 3 seconds (0 = off)
+WS_PING_TIMEOUT = BASE_TIMEOUT  # Connection is dead without a pong in 2s (< interval)
+WS_REPLAY_SECONDS = 30.0  # Unconfirmed audio resent after a reconnect (0 = off)
+
 # Keyboard and Clipboard
 KEY_PRESS_DELAY = BASE_DELAY * 0.5  # Delay between key presses
 CLIPBOARD_TIMEOUT = BASE_WAIT  # Timeout for clipboard operations
@@ -68,6 +73,8 @@ TEST_AUDIO_PROCESS_DELAY = 0.5  # Wait time for audio processing (seconds)
 WS_HOST = "localhost"
 WS_PORT = 9090
 WS_URL = f"ws://{WS_HOST}:{WS_PORT}"
+WS_AGGREGATE_BYTES = 0  # Coalesce audio windows into frames of this size (0 = off)
+WS_AGGREGATE_MAX_DELAY = 0.2  # Send a partial frame after this many seconds
 
 # Audio Settings
 AUDIO_CHUNK = 4096
@@ -76,10 +83,22 @@ AUDIO_CHANNELS = 1
 AUDIO_RATE = 16000
 AUDIO_DEVICE_INDEX = 1  # Poly BT700 index
 AUDIO_BUFFER_SECONDS = 1.0  # Seconds of audio per buffer
+AUDIO_ALWAYS_ON = False  # Keep the input stream open between recordings
+AUDIO_PREROLL_BUFFER_SECONDS = 5.0  # Audio kept in the ring buffer while idle
+AUDIO_PREROLL_SECONDS = 0.5  # Audio from before the hotkey press that starts a recording
+AUDIO_PREROLL_POLL_INTERVAL = 0.05  # Wait for captured chunks (always-on mode)
+AUDIO_CAPTURE_PROCESS = False  # Read the microphone in a separate worker process
+AUDIO_CAPTURE_RING_SECONDS = 10.0  # Shared-memory ring between capture process and client
+AUDIO_CAPTURE_POLL_INTERVAL = 0.005  # Wait for new frames in the ring
+AUDIO_GAP_FILL = True  # Deliver audio lost in capture as silence to keep timing consistent
+AUDIO_GAP_MAX_FILL_SECONDS = 2.0  # Longer gaps are filled with this much silence only
+AUDIO_GAP_HISTORY = 100  # Gaps kept per source for diagnostics
 
 # Tumbling Window Settings
 TUMBLING_WINDOW_SIZE = 2048  # Window size in samples
 TUMBLING_WINDOW_OVERLAP = 0.25  # Overlap between windows (0.0 - 1.0)
+# Send every sample exactly once; the overlap is only crossfaded at discontinuities
+TUMBLING_WINDOW_EXACT_ONCE = False
 
 # Whisper Settings
 WHISPER_LANGUAGE = "de"
@@ -94,6 +113,7 @@ LOG_LEVEL_CONSOLE = "DEBUG"  # Temporarily set to DEBUG for testing
 
 # Special Logging Settings for Regression Investigation
 REGRESSION_LOG_FILE = "logs/regression_investigation.log"
+REGRESSION_LOG_LEVEL = "DEBUG"  # Raise to INFO to make per-packet debug logs free
 REGRESSION_LOG_FORMAT = {
     "default": "%(asctime)s.%(msecs)03d - %(levelname)s - %(message)s",
     "connection": "%(asctime)s.%(msecs)03d - CONN - %(message)s",
@@ -118,9 +138,42 @@ LOG_FORMAT_CONSOLE = {
     "error": "❌ %(message)s",
 }
 
+# Metrics Settings
+METRICS_EXPORT_FILE = "logs/metrics.json"  # Periodic JSON snapshot of all metrics
+METRICS_EXPORT_INTERVAL = BASE_DELAY * 300  # Seconds between exports (30 seconds, 0 = off)
+METRICS_HTTP_ENABLED = False  # Serve Prometheus metrics over HTTP
+METRICS_HTTP_HOST = "127.0.0.1"  # Bind address (use "0.0.0.0" for central scraping)
+METRICS_HTTP_PORT = 9464  # Port of the /metrics endpoint
+
+# Latency Tracing
+LATENCY_TIMELINE_SECONDS = 600  # Seconds of sent audio kept per session for correlation
+LATENCY_TRACE_FILE = None  # JSON lines file for per-sentence latency records (None = off)
+
+# Profiling
+PROFILE_DIR = "logs/profiles"  # Reports of the memory profiler
+MEMORY_PROFILE_ENABLED = False  # Trace allocations from startup (slows down allocations)
+MEMORY_PROFILE_INTERVAL = 300  # Seconds between snapshot reports (0 = on demand only)
+MEMORY_PROFILE_FRAMES = 10  # Traceback depth per allocation for subsystem attribution
+MEMORY_PROFILE_TOP = 25  # Allocation sites listed per report
+CPU_PROFILE_INTERVAL = 0.01  # Seconds between stack samples of all threads (100 Hz)
+CPU_PROFILE_MAX_DEPTH = 64  # Innermost frames kept per sampled stack
+
+# Session Recording
+SESSION_RECORDING_ENABLED = False  # Record received server messages for offline replay
+SESSION_RECORDING_DIR = "recordings"  # One gzip JSON lines file per session
+
+# Batch Transcription
+BATCH_OUTPUT_DIR = "transcripts"  # Transcripts and batch_stats.json are written here
+BATCH_MAX_SESSIONS = 4  # Concurrent WebSocket sessions against the server
+BATCH_SPEED = 4.0  # Audio pacing as a multiple of real time (0 = as fast as possible)
+BATCH_FILE_PATTERNS = ["*.wav", "*.flac"]  # Files picked up from input directories
+BATCH_FILE_TIMEOUT = 3600  # Maximum seconds per file
+
 # Hotkey Settings
 HOTKEY_TOGGLE_RECORDING = "f13"  # Can be programmed on G915
 HOTKEY_EXIT = "f14"  # Can be programmed on G915
+HOTKEY_MEMORY_SNAPSHOT = "f15"  # Memory snapshot report (starts tracing on first press)
+HOTKEY_CPU_PROFILE = "f16"  # Start/stop the sampling CPU profiler
 
 # Text Processing
 MAX_RECENT_TRANSCRIPTIONS = 10  # Number of stored recent transcriptions
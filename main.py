@@ -1,23 +1,31 @@
 """
 Main Program for the Whisper Client
-Version: 1.8
-Timestamp: 2025-04-20 18:14 CET
+Version: 1.17
+Timestamp: 2026-10-19 23:05 CET
 
 This is the main entry point for the Whisper Client application.
 It initializes all components, manages the application lifecycle,
 and handles user interactions through hotkeys.
+
+Startup runs as a dependency graph (src/startup.py): the server probe and
+connect, the microphone probe and the hotkey registration run concurrently,
+and the task history is updated in the background afterwards.
 """
 
 import sys
 import time
 import uuid
+from typing import Optional
 
 import config
 import websocket
 from src import logger
 from src.audio import AudioManager, AudioProcessor
 from src.hotkeys import HotkeyManager
-from src.logging import log_debug, log_error, log_info, log_warning
+from src.logging import get_logger, log_error, log_info, log_warning
+from src.metrics import MetricsExporter
+from src.profiling import CpuProfiler, MemoryProfiler
+from src.startup import StartupError, StartupGraph
 from src.terminal import TerminalManager
 from src.text import TextManager
 from src.utils import (
@@ -32,6 +40,8 @@ from src.ws_client.connection import ConnectionManager
 
 class WhisperClient:
     def __init__(self):
+        self.created_at = time.perf_counter()
+
         # WebSocket-Trace deaktivieren
         websocket.enableTrace(False)
 
@@ -41,10 +51,26 @@ class WhisperClient:
         # Komponenten initialisieren
         self.text_manager = TextManager()
         self.websocket = WhisperWebSocket()
-        self.audio_manager = AudioManager()
+        # Opened by the "microphone" startup step (PyAudio init and test stream)
+        self.audio_manager: Optional[AudioManager] = None
         self.audio_processor = AudioProcessor()
         self.hotkey_manager = HotkeyManager()
 
+        # Periodic metrics snapshot (latency histograms, counters, queue depths)
+        self.metrics_exporter = MetricsExporter() if config.METRICS_EXPORT_INTERVAL > 0 else None
+
+        # Prometheus scrape endpoint (imported only when enabled)
+        self.metrics_server = None
+        if config.METRICS_HTTP_ENABLED:
+            from src.metrics_http import MetricsHTTPServer
+
+            self.metrics_server = MetricsHTTPServer()
+
+        # Memory profiling, traced from startup if enabled or on demand via hotkey/SIGUSR1
+        self.memory_profiler = MemoryProfiler()
+        # Sampling CPU profiler, toggled via hotkey/SIGUSR2
+        self.cpu_profiler = CpuProfiler()
+
         # Terminals registrieren
         self.websocket_terminal = self.terminal_manager.register_terminal(
             id=f"ws_{uuid.uuid4().hex[:8]}", name="WebSocket-Terminal"
@@ -58,20 +84,70 @@ class WhisperClient:
 
         # Callbacks setzen
         self.websocket.set_text_callback(self.on_text_segments)
+        self.websocket.set_replay_callback(self.audio_processor.mark_discontinuity)
 
-    def start(self):
-        """Starts the client."""
-        # Hotkeys registrieren
+    def _check_server(self):
+        """Startup step: checks that the WhisperLive server is reachable."""
+        if not check_server_status():
+            show_server_error()
+            raise ConnectionError("WhisperLive server is not reachable")
+
+    def _open_microphone(self):
+        """Startup step: opens and tests the microphone."""
+        self.audio_manager = AudioManager()
+
+    def _register_hotkeys(self):
+        """Startup step: registers the hotkeys and starts listening."""
         self.hotkey_manager.register_hotkey(config.HOTKEY_TOGGLE_RECORDING, self.toggle_recording)
         self.hotkey_manager.register_hotkey(config.HOTKEY_EXIT, self.cleanup)
+        self.hotkey_manager.register_hotkey(
+            config.HOTKEY_MEMORY_SNAPSHOT, self.memory_profiler.request_snapshot
+        )
+        self.hotkey_manager.register_hotkey(config.HOTKEY_CPU_PROFILE, self.cpu_profiler.toggle)
         self.hotkey_manager.start()
 
-        # Verbindung aufbauen
+    def _start_diagnostics(self):
+        """Startup step: starts the profilers and metrics outputs."""
+        if config.MEMORY_PROFILE_ENABLED:
+            self.memory_profiler.start()
+
+        if self.metrics_exporter:
+            self.metrics_exporter.start()
+
+        if self.metrics_server:
+            try:
+                self.metrics_server.start()
+            except OSError as e:
+                log_error(logger, "Could not start metrics endpoint: %s", e)
+                self.metrics_server = None
+
+    def build_startup(self):
+        """Returns the startup graph of the client."""
+        graph = StartupGraph()
+        graph.add("server", self._check_server)
+        graph.add("connect", self.websocket.connect, requires=("server",))
+        graph.add("microphone", self._open_microphone)
+        graph.add("hotkeys", self._register_hotkeys)
+        graph.add("diagnostics", self._start_diagnostics, essential=False)
+        graph.add("history", record_task_history, essential=False, deferred=True)
+        return graph
+
+    def start(self):
+        """Starts the client."""
+        # Signal handlers can only be installed from the main thread
+        self.memory_profiler.install_signal_handler()
+        self.cpu_profiler.install_signal_handler()
         try:
-            self.websocket.connect()
-        except Exception as e:
-            log_error(logger, "⚠️ Connection error: %s", e)
+            self.build_startup().run()
+        except StartupError as e:
+            log_error(logger, "⚠️ %s", e)
             return False
+        log_info(
+            logger,
+            "🎙️ Ready for %s after %.2fs",
+            config.HOTKEY_TOGGLE_RECORDING.upper(),
+            time.perf_counter() - self.created_at,
+        )
 
         # Hauptschleife
         try:
@@ -96,6 +172,9 @@ class WhisperClient:
 
     def toggle_recording(self):
         """Start/stop recording."""
+        if self.audio_manager is None:
+            log_warning(logger, "⚠️ Microphone is not ready yet")
+            return
         if not self.audio_manager.recording:
             if self.websocket.state != ConnectionState.READY:
                 log_error(logger, "⚠️ No connection to server")
@@ -107,7 +186,9 @@ class WhisperClient:
             self.audio_processor.start_processing(self.on_processed_audio)
 
             # Start audio recording
-            self.audio_manager.start_recording(self.on_audio_data)
+            self.audio_manager.start_recording(
+                self.on_audio_data, self.audio_processor.mark_discontinuity
+            )
 
             # Terminal-Aktivität aktualisieren
             self.terminal_manager.update_activity(self.audio_terminal.id)
@@ -132,8 +213,10 @@ class WhisperClient:
 
     def on_processed_audio(self, processed_audio):
         """Callback for processed audio data from tumbling window."""
-        # Send processed audio to WebSocket
-        self.websocket.send_audio(processed_audio)
+        # Send processed audio to WebSocket, keeping its capture time for latency tracing
+        self.websocket.send_audio(
+            processed_audio, capture_time=self.audio_processor.last_capture_time
+        )
 
     def cleanup(self):
         """Release resources and exit program."""
@@ -141,7 +224,8 @@ class WhisperClient:
         self.running = False  # Hauptschleife beenden
 
         # Stoppe zuerst die Aufnahme
-        self.audio_manager.stop_recording()
+        if self.audio_manager:
+            self.audio_manager.stop_recording()
 
         # Stop audio processing
         self.audio_processor.stop_processing()
@@ -150,8 +234,10 @@ class WhisperClient:
         self.websocket.stop_processing()
 
         # Komponenten beenden
-        self.audio_manager.cleanup()
+        if self.audio_manager:
+            self.audio_manager.cleanup()
         self.websocket.cleanup()
+        self.text_manager.close()
 
         # Cleanup all WebSocket instances to prevent multiple parallel connections
         log_info(logger, "Cleaning up all WebSocket instances...")
@@ -160,12 +246,46 @@ class WhisperClient:
         self.hotkey_manager.stop()
         self.terminal_manager.cleanup()
 
+        if self.metrics_exporter:
+            self.metrics_exporter.stop()
+        if self.metrics_server:
+            self.metrics_server.stop()
+        self.memory_profiler.stop()
+        self.cpu_profiler.stop()
+
         # Wait briefly so the main loop can terminate
         time.sleep(config.HOTKEY_SHUTDOWN_WAIT)  # Correct constant name (added space for E261)
         sys.exit(0)
 
 
+def record_task_history():
+    """Deferred startup step: records this launch in the task history."""
+    update_task_history(
+        description="Multiple Parallel Connections Fix",
+        changes=[
+            {"type": "fix", "description": "Addressed multiple parallel connections issue"},
+            {
+                "type": "feat",
+                "description": "Added client and session tracking for WebSocket connections",
+            },
+            {
+                "type": "improvement",
+                "description": "Enhanced cleanup process to prevent orphaned connections",
+            },
+            {
+                "type": "refactor",
+                "description": "Improved connection management with throttling",
+            },
+        ],
+        status="in_development",
+        files=["main.py", "src/websocket.py"],
+    )
+
+
 def main():
+    # Log-Ausgabe einrichten (der Import von src öffnet keine Log-Dateien)
+    get_logger()
+
     # Startmeldung anzeigen
     show_startup_message()
 
@@ -175,11 +295,6 @@ def main():
         log_warning(logger, "Found %d existing WebSocket instances. Cleaning up...", instance_count)
         ConnectionManager.cleanup_all_instances()
 
-    # Prüfe Server-Status
-    if not check_server_status():
-        show_server_error()
-        sys.exit(1)
-
     try:
         # Client starten
         client = WhisperClient()
@@ -193,29 +308,4 @@ def main():
 
 
 if __name__ == "__main__":
-    try:
-        # Task-Historie aktualisieren
-        update_task_history(
-            description="Multiple Parallel Connections Fix",
-            changes=[
-                {"type": "fix", "description": "Addressed multiple parallel connections issue"},
-                {
-                    "type": "feat",
-                    "description": "Added client and session tracking for WebSocket connections",
-                },
-                {
-                    "type": "improvement",
-                    "description": "Enhanced cleanup process to prevent orphaned connections",
-                },
-                {
-                    "type": "refactor",
-                    "description": "Improved connection management with throttling",
-                },
-            ],
-            status="in_development",
-            files=["main.py", "src/websocket.py"],
-        )
-    except Exception as e:
-        log_debug(logger, "Task history could not be updated: %s", e)
-
     main()
@@ -1,21 +1,23 @@
 """
 Whisper Client Package
-Version: 1.1
-Timestamp: 2025-03-08 23:10 CET
+Version: 1.2
+Timestamp: 2026-10-19 17:35 CET
 
 This is the main package for the Whisper Client.
-It initializes the logger and exports it for use by other modules.
+It exports the shared logger for use by other modules.
+
+Importing the package has no side effects beyond line-buffering stdout: the
+log sinks (console, log files, regression log) are set up by the entry
+points calling src.logging.get_logger(), and the subpackages import their
+submodules and heavy dependencies on first use.
 """
 
 import sys
 
-from .logging import get_logger
+from .logging import logger
 
 # Disable stdout buffering
 sys.stdout.reconfigure(line_buffering=True)  # type: ignore [attr-defined]
 
-# Initialize logger
-logger = get_logger()
-
 # Export logger for other modules
 __all__ = ["logger"]
@@ -1,7 +1,7 @@
 """
 Audio Package for the Whisper Client
-Version: 1.0
-Timestamp: 2025-04-20 13:16 CET
+Version: 1.5
+Timestamp: 2026-10-19 19:35 CET
 
 This package provides audio recording, processing, and resampling functionality
 for the Whisper Client. It includes classes and functions for microphone access,
@@ -9,15 +9,48 @@ audio capture, and conversion to the format required by the WhisperLive server.
 
 The package now includes a Tumbling Window implementation for improved audio processing
 with overlapping windows and better transitions between audio segments.
+
+Audio is read from an AudioSource: the microphone by default, or an audio
+file or synthetic signal for headless benchmarks and batch transcription.
+Audio lost in capture is recorded as AudioGaps and filled with silence.
+
+The exported names are imported on first access, so "import src.audio" loads
+neither numpy nor PyAudio, and librosa is only loaded by a resampling that
+changes the rate.
 """
 
-from .device import check_device_availability, list_audio_devices, test_microphone_access
-from .manager import AudioManager
-from .processor import AudioProcessor
+from typing import TYPE_CHECKING
+
+from src.lazy import lazy_exports
 
-# Importiere alle Module und Funktionen, die exportiert werden sollen
-from .resampling import normalize_audio, resample_to_16kHZ
-from .window import TumblingWindow
+if TYPE_CHECKING:
+    from .capture_process import ProcessSource
+    from .device import check_device_availability, list_audio_devices, test_microphone_access
+    from .manager import AudioManager
+    from .preroll import PrerollBuffer
+    from .processor import AudioProcessor
+    from .resampling import normalize_audio, resample_to_16kHZ
+    from .source import AudioGap, AudioSource, FileSource, PyAudioSource, SyntheticSource
+    from .window import TumblingWindow
+
+# Exported name -> submodule that defines it
+_LAZY_EXPORTS = {
+    "resample_to_16kHZ": ".resampling",
+    "normalize_audio": ".resampling",
+    "TumblingWindow": ".window",
+    "AudioProcessor": ".processor",
+    "AudioManager": ".manager",
+    "PrerollBuffer": ".preroll",
+    "AudioSource": ".source",
+    "AudioGap": ".source",
+    "PyAudioSource": ".source",
+    "FileSource": ".source",
+    "SyntheticSource": ".source",
+    "ProcessSource": ".capture_process",
+    "list_audio_devices": ".device",
+    "check_device_availability": ".device",
+    "test_microphone_access": ".device",
+}
 
 # Definiere, welche Symbole bei "from audio import *" importiert werden
 __all__ = [
@@ -26,7 +59,17 @@ __all__ = [
     "TumblingWindow",
     "AudioProcessor",
     "AudioManager",
+    "PrerollBuffer",
+    "AudioSource",
+    "AudioGap",
+    "PyAudioSource",
+    "FileSource",
+    "SyntheticSource",
+    "ProcessSource",
     "list_audio_devices",
     "check_device_availability",
     "test_microphone_access",
 ]
+
+
+__getattr__ = lazy_exports(__name__, _LAZY_EXPORTS)
@@ -0,0 +1,271 @@
+"""
+Capture Process Module for the Whisper Client
+Version: 1.2
+Timestamp: 2026-10-19 22:25 CET
+
+This module moves audio capture into a separate worker process. In the
+client process the device reads share the GIL with the tumbling window,
+the WebSocket receive thread, text processing and logging, and a burst in
+any of them can delay stream.read() long enough for the device buffer to
+overflow. ProcessSource runs the real source (the microphone by default) in
+a worker process that only reads the device and copies the frames into a
+shared-memory ring buffer; the client process reads the ring like any other
+AudioSource, so the AudioManager works unchanged.
+
+The ring is a single-producer/single-consumer byte ring in a RawArray with a
+small shared header of int64 counters:
+
+- write/read positions: total bytes written and read; the consumer only
+  reads up to the write position, the producer only writes up to the read
+  position plus the capacity
+- ring overflows: chunks the worker had to drop because the client did not
+  read the ring in time
+- device overflows: input overflows reported by PortAudio in the worker
+- lost frames: frames lost by the device source and frames of dropped chunks
+
+While the worker runs, the overflow counters are exported as gauges. The
+reading side records new lost frames as AudioGaps (see source.py). The silence for them is inserted by
+the worker, where the position is known: the device source fills its own
+gaps, and the frames of dropped chunks are written as silence in front of
+the next chunk that fits into the ring. The worker is started with the "spawn" method on every
+platform, so it never inherits the client's threads or locks.
+"""
+
+import multiprocessing
+import time
+import traceback
+from typing import Callable, Optional
+
+import numpy as np
+
+import config
+from src import logger
+from src.logging import log_error, log_info, log_warning
+from src.metrics import instance_labels, registry
+
+from .source import AudioSource
+
+# Header slots (int64)
+WRITE_POS = 0
+READ_POS = 1
+RING_OVERFLOWS = 2
+DEVICE_OVERFLOWS = 3
+FINISHED = 4
+DEVICE_LOST_FRAMES = 5
+RING_LOST_FRAMES = 6
+HEADER_SLOTS = 8
+
+
+def _capture_worker(factory, data, header, stop_event, errors):
+    """Entry point of the capture process: reads the source into the ring."""
+    ring = np.frombuffer(data, dtype=np.uint8)
+    counters = np.frombuffer(header, dtype=np.int64)
+    capacity = len(ring)
+    source = None
+    dropped = 0  # Frames of dropped chunks not yet written as silence
+    try:
+        source = factory()
+        source.open()
+        max_fill = int(config.AUDIO_GAP_MAX_FILL_SECONDS * source.rate)
+        while not stop_event.is_set() and source.is_active():
+            chunk = source.read()
+            if not chunk:
+                break
+            counters[DEVICE_OVERFLOWS] = getattr(source, "overflows", 0)
+            counters[DEVICE_LOST_FRAMES] = source.lost_frames
+
+            data = chunk
+            if dropped and source.fill_gaps:
+                # Never more silence than fits into the ring together with the chunk
+                silence = min(dropped, max_fill, (capacity - len(chunk)) // 2)
+                data = bytes(silence * 2) + chunk
+            size = len(data)
+            write_pos = int(counters[WRITE_POS])
+            if write_pos + size - int(counters[READ_POS]) > capacity:
+                # The client fell behind; drop the chunk rather than block the device
+                counters[RING_OVERFLOWS] += 1
+                counters[RING_LOST_FRAMES] += len(chunk) // 2
+                dropped += len(chunk) // 2
+                continue
+            dropped = 0
+
+            start = write_pos % capacity
+            first = min(size, capacity - start)
+            frames = np.frombuffer(data, dtype=np.uint8)
+            ring[start : start + first] = frames[:first]
+            ring[: size - first] = frames[first:]
+            # Publish the data only after it has been copied
+            counters[WRITE_POS] = write_pos + size
+    except Exception:
+        errors.put(traceback.format_exc())
+    finally:
+        if source is not None:
+            try:
+                source.terminate()
+            except Exception:
+                pass
+        counters[FINISHED] = 1
+
+
+class ProcessSource(AudioSource):
+    """Reads another audio source in a worker process via a shared-memory ring."""
+
+    def __init__(
+        self,
+        factory: Callable[[], AudioSource],
+        rate=config.AUDIO_RATE,
+        chunk=config.AUDIO_CHUNK,
+        ring_seconds=config.AUDIO_CAPTURE_RING_SECONDS,
+    ):
+        """Initialize the source.
+
+        Args:
+            factory: Picklable callable that creates the real source in the
+                     worker, e.g. functools.partial(PyAudioSource, device_index=1)
+            rate: Sample rate of the created source
+            chunk: Frames per read
+            ring_seconds: Capacity of the ring buffer in seconds of audio
+
+        """
+        # The worker's source paces itself (a device blocks until data arrives)
+        super().__init__(rate, chunk, realtime=False)
+        self.factory = factory
+        self.capacity = max(chunk * 2, int(ring_seconds * rate) * 2)
+        self.process: Optional[multiprocessing.process.BaseProcess] = None
+        self._context = multiprocessing.get_context("spawn")
+        self._data = None
+        self._header = None
+        self._ring: Optional[np.ndarray] = None
+        self._counters: Optional[np.ndarray] = None
+        self._stop_event = None
+        self._errors = None
+        self._reported = {DEVICE_LOST_FRAMES: 0, RING_LOST_FRAMES: 0}
+
+        # Gauges of the counters, registered while the worker runs
+        self.labels = instance_labels()
+        self.gauges = []
+
+    def _counter(self, slot):
+        return int(self._counters[slot]) if self._counters is not None else 0
+
+    @property
+    def ring_overflows(self):
+        return self._counter(RING_OVERFLOWS)
+
+    @property
+    def device_overflows(self):
+        return self._counter(DEVICE_OVERFLOWS)
+
+    def check(self):
+        """Checks the source in this process before the worker opens it."""
+        source = self.factory()
+        try:
+            if not source.check():
+                return False
+            test_access = getattr(source, "test_access", None)
+            return test_access() if test_access else True
+        finally:
+            source.terminate()
+
+    def open(self):
+        """Starts the capture process."""
+        self.close()
+        self._data = self._context.RawArray("B", self.capacity)
+        self._header = self._context.RawArray("q", HEADER_SLOTS)
+        self._ring = np.frombuffer(self._data, dtype=np.uint8)
+        self._counters = np.frombuffer(self._header, dtype=np.int64)
+        self._stop_event = self._context.Event()
+        self._errors = self._context.Queue()
+        self._reported = {DEVICE_LOST_FRAMES: 0, RING_LOST_FRAMES: 0}
+        self.process = self._context.Process(
+            target=_capture_worker,
+            args=(self.factory, self._data, self._header, self._stop_event, self._errors),
+            name="AudioCaptureProcess",
+            daemon=True,
+        )
+        self.process.start()
+        self.gauges = [
+            registry.gauge(
+                "audio.capture_process.ring_overflows",
+                "Chunks the capture process dropped because the ring was full",
+                callback=lambda: self._counter(RING_OVERFLOWS),
+                labels=self.labels,
+            ),
+            registry.gauge(
+                "audio.capture_process.device_overflows",
+                "Input overflows reported by the device in the capture process",
+                callback=lambda: self._counter(DEVICE_OVERFLOWS),
+                labels=self.labels,
+            ),
+            registry.gauge(
+                "audio.capture_process.fill_bytes",
+                "Captured bytes waiting in the ring",
+                callback=lambda: self._counter(WRITE_POS) - self._counter(READ_POS),
+                labels=self.labels,
+            ),
+        ]
+        super().open()
+        log_info(logger, "🎤 Capture process started (pid %d)", self.process.pid)
+
+    def _report_gaps(self):
+        """Records the frames the worker lost since the last call as gaps."""
+        for slot, reason in ((DEVICE_LOST_FRAMES, "device"), (RING_LOST_FRAMES, "ring")):
+            count = self._counter(slot)
+            if count > self._reported[slot]:
+                # The worker already inserted the silence at the right position
+                self._record_gap(count - self._reported[slot], reason, fill=False)
+                self._reported[slot] = count
+
+    def _read_frames(self):
+        size = self.chunk * 2
+        counters = self._counters
+        while True:
+            read_pos = int(counters[READ_POS])
+            available = int(counters[WRITE_POS]) - read_pos
+            if available >= size or (counters[FINISHED] and available > 0):
+                break
+            if counters[FINISHED] or not self.active:
+                self._report_gaps()
+                self._report_error()
+                return b""
+            time.sleep(config.AUDIO_CAPTURE_POLL_INTERVAL)
+
+        self._report_gaps()
+        size = min(size, available)
+        start = read_pos % self.capacity
+        first = min(size, self.capacity - start)
+        data = self._ring[start : start + first].tobytes()
+        if first < size:
+            data += self._ring[: size - first].tobytes()
+        # Free the space only after the data has been copied
+        counters[READ_POS] = read_pos + size
+        return data
+
+    def _report_error(self):
+        if self._errors is None:
+            return
+        try:
+            while True:
+                log_error(logger, "⚠️ Capture process failed:\n%s", self._errors.get_nowait())
+        except Exception:
+            pass
+
+    def is_active(self):
+        return self.active and self.process is not None
+
+    def close(self):
+        """Stops the capture process."""
+        super().close()
+        if self.process is None:
+            return
+        registry.unregister(*self.gauges)
+        self._stop_event.set()
+        self.process.join(timeout=config.AUDIO_THREAD_TIMEOUT)
+        if self.process.is_alive():
+            log_warning(logger, "Capture process not responding - terminating")
+            self.process.terminate()
+            self.process.join(timeout=config.AUDIO_THREAD_TIMEOUT)
+        self._report_gaps()
+        self._report_error()
+        self._errors.close()
+        self.process = None
@@ -1,13 +1,11 @@
 """
 Audio Device Management Module for the Whisper Client
-Version: 1.1
-Timestamp: 2025-04-20 16:37 CET
+Version: 1.2
+Timestamp: 2026-10-19 17:35 CET
 
 This module provides functions for audio device detection and management.
 """
 
-import pyaudio
-
 from src import logger
 from src.logging import log_debug, log_error, log_info
 
@@ -19,6 +17,8 @@ def list_audio_devices():
         List of (index, name, channels) tuples for all input devices
 
     """
+    import pyaudio
+
     audio = pyaudio.PyAudio()
     devices = []
 
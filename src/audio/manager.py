@@ -1,51 +1,136 @@
 """
 Audio Recording and Management Module for the Whisper Client
-Version: 1.1
-Timestamp: 2025-04-20 16:35 CET
+Version: 1.9
+Timestamp: 2026-10-19 23:05 CET
 
 This module handles audio recording and management for the Whisper Client.
 It provides functionality for microphone access and audio capture.
+
+In always-on mode the input stream stays open between recordings and feeds a
+PrerollBuffer; a recording starts with the buffered audio of the last
+AUDIO_PREROLL_SECONDS, so neither the device open nor the first words are
+lost after the hotkey press.
+
+With AUDIO_CAPTURE_PROCESS the microphone is read by a worker process (see
+capture_process.py), so audio continuity does not depend on the GIL.
+
+Audio the source loses is delivered as silence (see source.py); the
+recording logs a summary of its gaps when it ends. Where the audio does not
+continue - after a gap too long to fill, and where the pre-roll is spliced
+in front of a recording - the recording calls its discontinuity callback
+(AudioProcessor.mark_discontinuity) in order with the audio.
+
+Captured int16 chunks are converted to float32 in a single pass, straight
+into the send block (AudioBlock); at 16 kHz the block is handed to the
+callback as a memoryview without further copies. Every callback receives a
+new block, so a consumer may keep the data.
 """
 
 import threading
+import time
+from queue import Empty, Queue
 from typing import Callable, Optional
 
 import numpy as np
-import pyaudio
 
 import config
 from src import logger
 from src.logging import log_debug, log_error, log_info, log_warning
+from src.metrics import registry
 
-from .device import check_device_availability, test_microphone_access
+from .capture_process import ProcessSource
+from .preroll import PrerollBuffer
 from .resampling import resample_to_16kHZ
+from .source import AudioSource, PyAudioSource
+
+# int16 full scale to float32 (-1.0 - 1.0)
+INT16_SCALE = np.float32(1.0 / 32768.0)
+
+# Queued in front of a chunk that does not continue the audio before it
+DISCONTINUITY = object()
+
+
+class AudioBlock:
+    """Collects captured int16 chunks as float32 samples for one callback."""
+
+    def __init__(self, capacity):
+        self.samples = np.empty(capacity, dtype=np.float32)
+        self.frames = 0
+        self.chunks = 0
+
+    def append(self, data):
+        """Converts an int16 PCM chunk into the block."""
+        pcm = np.frombuffer(data, dtype=np.int16)
+        end = self.frames + len(pcm)
+        if end > len(self.samples):
+            # Chunks with filled gaps can be longer than a regular chunk
+            samples = np.empty(2 * end, dtype=np.float32)
+            samples[: self.frames] = self.samples[: self.frames]
+            self.samples = samples
+        np.multiply(pcm, INT16_SCALE, out=self.samples[self.frames : end], dtype=np.float32)
+        self.frames = end
+        self.chunks += 1
+
+    def view(self):
+        """The float32 samples as a byte memoryview."""
+        return memoryview(self.samples[: self.frames]).cast("B")
 
 
 class AudioManager:
     """Manages audio recording and device access.
 
-    This class handles microphone initialization, audio recording, and
-    provides the captured audio data to a callback function.
+    This class reads audio from an AudioSource (the configured microphone by
+    default, or a file or synthetic signal) and provides the captured audio
+    data to a callback function.
 
     """
 
-    def __init__(self):
-        """Initialize the audio manager."""
-        self.audio = pyaudio.PyAudio()
-        self.stream = None
+    def __init__(
+        self,
+        source: Optional[AudioSource] = None,
+        always_on=config.AUDIO_ALWAYS_ON,
+        preroll_seconds=config.AUDIO_PREROLL_SECONDS,
+    ):
+        """Initialize the audio manager.
+
+        Args:
+            source: Audio source to record from (defaults to the microphone)
+            always_on: Keep the source open between recordings and start
+                       every recording with the buffered pre-roll audio
+            preroll_seconds: Audio from before start_recording() that a
+                             recording starts with (always-on mode)
+
+        """
+        if source is None:
+            source = (
+                ProcessSource(PyAudioSource) if config.AUDIO_CAPTURE_PROCESS else PyAudioSource()
+            )
+        self.source = source
         self.recording = False
         self.recording_lock = threading.Lock()
         self.record_thread: Optional[threading.Thread] = None
 
-        # Load audio format from config
-        self.chunk = config.AUDIO_CHUNK
-        self.format = getattr(pyaudio, config.AUDIO_FORMAT)
-        self.channels = config.AUDIO_CHANNELS
-        self.rate = config.AUDIO_RATE
-        self.device_index = config.AUDIO_DEVICE_INDEX
+        # Audio format of the source
+        self.chunk = self.source.chunk
+        self.channels = self.source.channels
+        self.rate = self.source.rate
+
+        # Always-on capture: the capture thread fills the pre-roll buffer while
+        # idle and hands chunks to the recording through the queue
+        self.always_on = always_on
+        self.preroll_seconds = preroll_seconds
+        self.preroll = PrerollBuffer(config.AUDIO_PREROLL_BUFFER_SECONDS, self.rate, self.chunk)
+        self.capture_lock = threading.Lock()
+        self.capture_thread: Optional[threading.Thread] = None
+        self.capturing = False
+        self._chunks: Queue = Queue()
+        self._gaps_at_start = (0, 0)  # gap_total and lost_frames of the source
+        self._discontinuities = 0  # Discontinuities of the source passed on so far
 
         # Initialize microphone
         self._init_microphone()
+        if self.always_on:
+            self.start_capture()
 
     def _init_microphone(self):
         """Initialize and test microphone access."""
@@ -54,50 +139,102 @@ class AudioManager:
             raise RuntimeError("No microphone found")
 
         # Test microphone access
-        if not test_microphone_access(
-            self.audio, self.device_index, self.format, self.channels, self.rate, self.chunk
-        ):
+        if isinstance(self.source, PyAudioSource) and not self.source.test_access():
             raise RuntimeError("Microphone test failed")
 
     def _check_microphone(self):
         """Checks if the configured microphone is available."""
+        return self.source.check()
+
+    def start_capture(self):
+        """Opens the source and keeps reading it into the pre-roll buffer."""
+        if self.capturing:
+            return
+        self.source.open()
+        self._discontinuities = 0
+        self.capturing = True
+        self.capture_thread = threading.Thread(target=self._capture_audio, name="AudioPreroll")
+        self.capture_thread.daemon = True
+        self.capture_thread.start()
+        log_info(logger, "🎤 Microphone open, keeping %.1fs pre-roll", self.preroll_seconds)
+
+    def stop_capture(self):
+        """Stops the always-on capture and closes the source."""
+        if not self.capturing:
+            return
+        self.capturing = False
         try:
-            info = self.audio.get_host_api_info_by_index(0)
-            num_devices = info.get("deviceCount")  # Can be None or str
-
-            # Ensure num_devices is an integer before comparison
-            if isinstance(num_devices, int) and self.device_index < num_devices:
-                device_info = self.audio.get_device_info_by_index(self.device_index)
-                max_channels = device_info.get("maxInputChannels")  # Can be None or str
-
-                # Ensure max_channels is an integer before comparison
-                if isinstance(max_channels, int) and max_channels > 0:
-                    # Correct Windows umlauts, ensure name is a string before encoding
-                    name_raw = device_info.get("name", "")
-                    name = (
-                        name_raw.encode("latin-1").decode("utf-8")
-                        if isinstance(name_raw, str)
-                        else "Unknown Device"
-                    )
-                    log_info(logger, "✓ Microphone found: %s", name)
-                    return True
-
-            log_error(logger, "⚠️ Microphone not available")
-            return False
+            self.source.close()
+        except Exception as e:
+            log_error(logger, "Error closing stream: %s", e)
+        if self.capture_thread is not None:
+            self.capture_thread.join(timeout=config.AUDIO_THREAD_TIMEOUT)
 
+    def _capture_audio(self):
+        """Reads the open source, into the recording if one runs, else into the pre-roll."""
+        try:
+            while self.capturing and self.source.is_active():
+                data = self.source.read()
+                if not data:
+                    log_debug(logger, "Audio source exhausted")
+                    break
+                discontinuity = self._source_discontinuity()
+                with self.capture_lock:
+                    if self.recording:
+                        if discontinuity:
+                            self._chunks.put(DISCONTINUITY)
+                        self._chunks.put(data)
+                    else:
+                        if discontinuity:
+                            # The pre-roll only keeps audio that runs up to the recording
+                            self.preroll.clear()
+                        self.preroll.append(data)
         except Exception as e:
-            log_error(logger, "⚠️ Error checking microphone: %s", e)
+            log_error(logger, "Error during capture: %s", e)
+        finally:
+            self.capturing = False
+            # Ends a running recording like an exhausted source does
+            self._chunks.put(b"")
+
+    def _source_discontinuity(self):
+        """True if the source lost audio it did not fill since the last call."""
+        count = self.source.discontinuities
+        if count == self._discontinuities:
             return False
+        self._discontinuities = count
+        return True
+
+    def _read_chunk(self):
+        """Returns the next chunk of the recording, None if none arrived yet.
+
+        In always-on mode DISCONTINUITY is returned in front of a chunk that
+        does not continue the audio before it.
+        """
+        if not self.always_on:
+            return self.source.read()
+        try:
+            return self._chunks.get(timeout=config.AUDIO_PREROLL_POLL_INTERVAL)
+        except Empty:
+            return None
 
     def is_device_available(self):
         """Checks if the audio device is still available."""
-        return check_device_availability(self.audio, self.device_index)
-
-    def start_recording(self, callback: Callable[[bytes], None]):
+        if isinstance(self.source, PyAudioSource):
+            return self.source.is_device_available()
+        return True
+
+    def start_recording(
+        self,
+        callback: Callable[[bytes], None],
+        discontinuity_callback: Optional[Callable[[], None]] = None,
+    ):
         """Starts audio recording.
 
         Args:
             callback: Function to call with recorded audio data
+            discontinuity_callback: Function to call, in order with the audio,
+                                    where the audio does not continue the
+                                    audio before it
 
         """
         with self.recording_lock:
@@ -112,19 +249,32 @@ class AudioManager:
                     return
 
             try:
-                self.stream = self.audio.open(
-                    format=self.format,
-                    channels=self.channels,
-                    rate=self.rate,
-                    input=True,
-                    input_device_index=self.device_index,
-                    frames_per_buffer=self.chunk,
-                )
-                self.recording = True
+                if self.always_on:
+                    if not self.capturing:
+                        self.start_capture()
+                    # The recording starts with the buffered pre-roll audio,
+                    # spliced in front of the live chunks
+                    with self.capture_lock:
+                        self._chunks = Queue()
+                        preroll = self.preroll.take(self.preroll_seconds)
+                        if preroll:
+                            self._chunks.put(DISCONTINUITY)
+                        for chunk in preroll:
+                            self._chunks.put(chunk)
+                        self.recording = True
+                else:
+                    self.source.open()
+                    self._discontinuities = 0
+                    self.recording = True
+                self._gaps_at_start = (self.source.gap_total, self.source.lost_frames)
                 log_info(logger, "🎤 Recording started...")
 
                 # Start recording thread
-                self.record_thread = threading.Thread(target=self._record_audio, args=(callback,))
+                self.record_thread = threading.Thread(
+                    target=self._record_audio,
+                    args=(callback, discontinuity_callback),
+                    name="AudioCapture",
+                )
                 self.record_thread.daemon = True
                 self.record_thread.start()
 
@@ -139,14 +289,16 @@ class AudioManager:
                 return
 
             log_debug(logger, "Stopping recording...")
-            self.recording = False
+            if self.always_on:
+                # The stream stays open and goes back to filling the pre-roll
+                with self.capture_lock:
+                    self.recording = False
+            else:
+                self.recording = False
 
-            # Close stream immediately to prevent further data
-            if self.stream:
+                # Close stream immediately to prevent further data
                 try:
-                    self.stream.stop_stream()
-                    self.stream.close()
-                    self.stream = None
+                    self.source.close()
                     log_debug(logger, "Audio stream closed")
                 except Exception as e:
                     log_error(logger, "Error closing stream: %s", e)
@@ -166,59 +318,124 @@ class AudioManager:
 
             log_info(logger, "\n⏹️ Recording stopped")
 
-    def _record_audio(self, callback: Callable[[bytes], None]):
+    def _record_audio(
+        self,
+        callback: Callable[[bytes], None],
+        discontinuity_callback: Optional[Callable[[], None]] = None,
+    ):
         """Record audio and send to callback.
 
         Args:
             callback: Function to call with recorded audio data
+            discontinuity_callback: Function to call where the audio does not
+                                    continue (see start_recording)
 
         """
-        buffer = []  # Audio buffer for more stable transmission
+        # 4 chunks per second
+        buffer_size = max(1, int(config.AUDIO_BUFFER_SECONDS * 4))
+        block = AudioBlock(buffer_size * self.chunk)  # Audio block for more stable transmission
         log_debug(logger, "Audio thread started")
+        captured_chunks = registry.counter("audio.capture.chunks", "Chunks read from the device")
+        captured_bytes = registry.counter("audio.capture.bytes", "Resampled bytes delivered")
+        convert_seconds = registry.histogram(
+            "audio.capture.convert_seconds", "Chunk conversion and resampling time"
+        )
+
+        def mark_discontinuity(block):
+            # The audio before the discontinuity is sent first; returns the next block
+            if discontinuity_callback is None:
+                return block
+            if block.chunks:
+                callback(resample_to_16kHZ(block.view(), self.rate))
+                block = AudioBlock(buffer_size * self.chunk)
+            discontinuity_callback()
+            return block
 
         try:
-            while self.recording and self.stream and self.stream.is_active():
+            while self.recording and (self.always_on or self.source.is_active()):
                 try:
-                    data = self.stream.read(self.chunk, exception_on_overflow=False)
-                    # Convert to float32 array
-                    audio_array = np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
-
-                    # Add normalized float32 data to buffer
-                    buffer.append(audio_array)
-
-                    # Check if enough audio is available for a buffer
-                    buffer_size = int(config.AUDIO_BUFFER_SECONDS * 4)  # 4 chunks per second
-                    if len(buffer) >= buffer_size:
-                        combined_data = np.concatenate(buffer)
-
-                        # Resample to 16kHz
-                        resampled_data = resample_to_16kHZ(combined_data.tobytes(), self.rate)
+                    data = self._read_chunk()
+                    if data is None:
+                        continue
+                    if data is DISCONTINUITY:
+                        block = mark_discontinuity(block)
+                        continue
+                    if not data:
+                        log_debug(logger, "Audio source exhausted")
+                        break
+                    if not self.always_on and self._source_discontinuity():
+                        block = mark_discontinuity(block)
+                    # Convert to normalized float32 straight into the block
+                    convert_start = time.perf_counter()
+                    block.append(data)
+                    captured_chunks.inc()
+
+                    # Check if enough audio is available for a block
+                    if block.chunks >= buffer_size:
+                        # Resample to 16kHz (passes the block through at 16kHz)
+                        resampled_data = resample_to_16kHZ(block.view(), self.rate)
+                        convert_seconds.record(time.perf_counter() - convert_start)
+                        captured_bytes.inc(len(resampled_data))
                         if self.recording:  # Nochmal prüfen vor dem Senden
                             callback(resampled_data)
-                        buffer = []  # Clear buffer
+                        # The callback may keep the block; start a new one
+                        block = AudioBlock(buffer_size * self.chunk)
 
                 except Exception as e:
                     log_error(logger, "Error during recording: %s", e)
                     break
 
         finally:
-            # Send remaining buffer data
-            if buffer:
+            if self.always_on:
+                # Chunks captured before the stop that the loop did not reach
+                while True:
+                    try:
+                        data = self._chunks.get_nowait()
+                    except Empty:
+                        break
+                    if data is DISCONTINUITY:
+                        block = mark_discontinuity(block)
+                    elif data:
+                        block.append(data)
+
+            # Send remaining block data
+            if block.chunks:
                 try:
-                    combined_data = np.concatenate(buffer)
                     # Resample to 16kHz
-                    resampled_data = resample_to_16kHZ(combined_data.tobytes(), self.rate)
+                    resampled_data = resample_to_16kHZ(block.view(), self.rate)
                     callback(resampled_data)
-                    log_debug(logger, "Last %d buffer chunks sent", len(buffer))
+                    log_debug(logger, "Last %d buffer chunks sent", block.chunks)
                 except Exception as e:
                     log_error(logger, "Error sending last buffer data: %s", e)
 
-            buffer = []
+            self._log_gaps()
             log_debug(logger, "Audio thread terminated")
             self.recording = False
 
+    def _log_gaps(self):
+        """Logs the audio gaps of the recording that just ended."""
+        gaps = self.source.gap_total - self._gaps_at_start[0]
+        if gaps > 0:
+            lost = self.source.lost_frames - self._gaps_at_start[1]
+            log_warning(
+                logger,
+                "⚠️ %d audio gaps in this recording, %.0fms lost in total",
+                gaps,
+                lost / self.rate * 1000,
+            )
+
+    def wait_until_finished(self, timeout=None):
+        """Wait until a finite source is exhausted and its audio delivered.
+
+        Returns True if the recording thread has finished.
+        """
+        if self.record_thread is not None:
+            self.record_thread.join(timeout)
+            return not self.record_thread.is_alive()
+        return True
+
     def cleanup(self):
         """Release resources."""
         self.stop_recording()
-        if self.audio:
-            self.audio.terminate()
+        self.stop_capture()
+        self.source.terminate()
@@ -0,0 +1,60 @@
+"""
+Audio Pre-Roll Buffer Module for the Whisper Client
+Version: 1.0
+Timestamp: 2026-10-19 18:25 CET
+
+This module provides the ring buffer behind the always-open microphone mode
+(config.AUDIO_ALWAYS_ON). While no recording runs, the AudioManager keeps
+reading the input stream into a PrerollBuffer that holds the most recent
+seconds of audio. Starting a recording takes the last pre-roll seconds from
+it, so speech that began while the hotkey was pressed is not clipped and no
+device has to be opened first.
+"""
+
+import collections
+import math
+import threading
+from typing import Deque, List
+
+
+class PrerollBuffer:
+    """Bounded ring of the most recently captured audio chunks."""
+
+    def __init__(self, seconds, rate, chunk):
+        """Initialize the buffer.
+
+        Args:
+            seconds: Audio to keep; older chunks are dropped
+            rate: Sample rate of the chunks
+            chunk: Frames per chunk
+
+        """
+        self.rate = rate
+        self.chunk = chunk
+        self.max_chunks = max(1, math.ceil(seconds * rate / chunk))
+        self.chunks: Deque[bytes] = collections.deque(maxlen=self.max_chunks)
+        self.lock = threading.Lock()
+
+    def append(self, data: bytes):
+        """Adds a captured chunk, dropping the oldest one when full."""
+        with self.lock:
+            self.chunks.append(data)
+
+    def take(self, seconds) -> List[bytes]:
+        """Returns the chunks covering the last `seconds` and empties the buffer."""
+        count = min(math.ceil(seconds * self.rate / self.chunk), self.max_chunks)
+        with self.lock:
+            chunks = list(self.chunks)[-count:] if count > 0 else []
+            self.chunks.clear()
+        return chunks
+
+    def clear(self):
+        with self.lock:
+            self.chunks.clear()
+
+    @property
+    def seconds(self):
+        """Buffered audio in seconds."""
+        with self.lock:
+            frames = sum(len(chunk) for chunk in self.chunks) // 2
+        return frames / self.rate
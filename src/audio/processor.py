@@ -1,25 +1,35 @@
 """
 Audio Processing Module for the Whisper Client
-Version: 1.1
-Timestamp: 2025-04-20 16:38 CET
+Version: 1.10
+Timestamp: 2026-10-19 23:20 CET
 
 This module provides audio processing functionality using the tumbling window approach.
 It integrates with the AudioManager to process audio chunks and prepare them for
 the WhisperLive server.
+
+In exact-once mode (config.TUMBLING_WINDOW_EXACT_ONCE) stopping the processor
+first windows the queued chunks and sends the last, partial window, so the
+server receives exactly the samples that were captured.
 """
 
 import threading
+import time
 from queue import Empty, Queue
-from typing import Callable, List, Optional
+from typing import Callable, List, Optional, Tuple, Union
 
 import numpy as np
 
 import config
 from src import logger
 from src.logging import log_debug, log_error, log_info, log_warning
+from src.metrics import Gauge, instance_labels, registry
 
 from .window import TumblingWindow
 
+# Control items in the processing queue, handled in order with the audio
+FLUSH = "flush"  # Send the partial window
+DISCONTINUITY = "discontinuity"  # Send the partial window, crossfade the next one
+
 
 class AudioProcessor:
     """Processes audio data using the tumbling window approach.
@@ -36,14 +46,26 @@ class AudioProcessor:
             test_mode: If True, operates in test mode without sending data
 
         """
-        self.tumbling_window = TumblingWindow()
+        # The AudioManager delivers float32 samples at 16 kHz
+        self.tumbling_window = TumblingWindow(dtype=np.float32)
         self.test_mode = test_mode
         self.processed_windows: List[np.ndarray] = []
         self.window_callback: Optional[Callable[[bytes], None]] = None
         self.processing_lock = threading.Lock()
-        self.processing_queue: Queue[bytes] = Queue()
+        self.processing_queue: Queue[Tuple[Union[bytes, str], Optional[float]]] = Queue()
         self.processing_thread: Optional[threading.Thread] = None
         self.running = False
+        # Capture time of the chunk behind the window currently passed to the callback
+        self.last_capture_time: Optional[float] = None
+
+        # Metrics; the queue depth is only read when a snapshot is taken
+        self.window_seconds = registry.histogram(
+            "audio.window.seconds", "Tumbling window processing time per chunk"
+        )
+        self.window_count = registry.counter("audio.window.windows", "Windows produced")
+        # Labels of the queue depth gauge, registered while processing runs
+        self.labels = instance_labels()
+        self.queue_depth: Optional[Gauge] = None
         log_debug(logger, "AudioProcessor initialized")
 
     def start_processing(self, callback):
@@ -59,9 +81,17 @@ class AudioProcessor:
 
             self.window_callback = callback
             self.running = True
+            self.queue_depth = registry.gauge(
+                "audio.processor.queue_depth",
+                "Chunks waiting for window processing",
+                callback=lambda: self.processing_queue.qsize(),
+                labels=self.labels,
+            )
 
             # Start processing thread
-            self.processing_thread = threading.Thread(target=self._process_queue)
+            self.processing_thread = threading.Thread(
+                target=self._process_queue, name="AudioProcessing"
+            )
             self.processing_thread.daemon = True
             self.processing_thread.start()
 
@@ -73,6 +103,9 @@ class AudioProcessor:
             if not self.running:
                 return
 
+            if self.tumbling_window.exact_once:
+                self._flush_on_stop()
+
             self.running = False
 
             # Wait for processing thread to finish
@@ -84,22 +117,53 @@ class AudioProcessor:
             # Clear state
             self.tumbling_window.clear()
             self.processing_queue = Queue()
+            registry.unregister(self.queue_depth)
+            self.queue_depth = None
 
             log_info(logger, "🛑 Audio processing stopped")
 
+    def _flush_on_stop(self):
+        """Sends the queued chunks and the partial window before stopping."""
+        if self.processing_thread is None or not self.processing_thread.is_alive():
+            return
+        self.processing_queue.put((FLUSH, None))
+        if not self.wait_until_idle():
+            log_warning(logger, "Audio processing did not drain before stopping")
+
+    def mark_discontinuity(self):
+        """Marks the next audio as not continuing the previous audio.
+
+        The audio before it is windowed and its partial window sent first, so
+        the crossfade of exact-once mode lands exactly at the discontinuity.
+        """
+        self.processing_queue.put((DISCONTINUITY, None))
+        if self.test_mode:
+            self._process_audio_data(DISCONTINUITY)
+
+    def wait_until_idle(self, timeout=config.AUDIO_THREAD_TIMEOUT):
+        """Wait until every queued chunk has been windowed and handed on.
+
+        Returns True if the queue drained within the timeout.
+        """
+        deadline = time.time() + timeout
+        while self.processing_queue.unfinished_tasks and time.time() < deadline:
+            time.sleep(config.POLL_INTERVAL)
+        return not self.processing_queue.unfinished_tasks
+
     def process_audio(self, audio_data):
         """Process audio data through the tumbling window.
 
         Args:
-            audio_data: Audio data as bytes
+            audio_data: float32 audio data at 16 kHz as bytes (from the AudioManager)
 
         """
-        # Add to processing queue
-        self.processing_queue.put(audio_data)
+        # Stamp capture time for latency tracing and add to processing queue
+        capture_time = time.time()
+        self.processing_queue.put((audio_data, capture_time))
 
         # If in test mode, process immediately
         if self.test_mode:
-            self._process_audio_data(audio_data)
+            self._process_audio_data(audio_data, capture_time)
 
     def _process_queue(self):
         """Process audio data from the queue."""
@@ -110,8 +174,8 @@ class AudioProcessor:
                 try:
                     # Get audio data from queue with timeout
                     try:
-                        audio_data = self.processing_queue.get(timeout=0.1)
-                        self._process_audio_data(audio_data)
+                        audio_data, capture_time = self.processing_queue.get(timeout=0.1)
+                        self._process_audio_data(audio_data, capture_time)
                         self.processing_queue.task_done()
                     except Empty:
                         continue
@@ -122,18 +186,33 @@ class AudioProcessor:
         finally:
             log_debug(logger, "Processing thread terminated")
 
-    def _process_audio_data(self, audio_data):
+    def _process_audio_data(self, audio_data, capture_time=None):
         """Process a chunk of audio data.
 
         Args:
-            audio_data: Audio data as bytes
+            audio_data: Audio data as bytes, or a control item (FLUSH,
+                        DISCONTINUITY)
+            capture_time: Time the chunk was handed over by the recorder
 
         """
-        # Add to tumbling window
-        self.tumbling_window.add_chunk(audio_data)
-
-        # Get windows and process
-        windows = list(self.tumbling_window.get_windows())
+        process_start = time.perf_counter()
+
+        if isinstance(audio_data, str):
+            # Control item: the partial window has no capture time of its own
+            capture_time = self.last_capture_time
+            window = self.tumbling_window.flush()
+            windows = [window] if len(window) else []
+            if audio_data == DISCONTINUITY:
+                self.tumbling_window.mark_discontinuity()
+        else:
+            # Add to tumbling window
+            self.tumbling_window.add_chunk(audio_data)
+
+            # Get windows and process; they are converted to bytes before the
+            # next chunk is added, so views into the window buffer suffice
+            windows = list(self.tumbling_window.get_windows(copy=self.test_mode))
+        self.window_seconds.record(time.perf_counter() - process_start)
+        self.window_count.inc(len(windows))
 
         # In test mode, store windows
         if self.test_mode:
@@ -145,6 +224,8 @@ class AudioProcessor:
             # Convert to bytes
             window_bytes = window.tobytes()
 
-            # Call callback with window
+            # Call callback with window; the callback runs synchronously and
+            # can read last_capture_time to pass it on to the sender
             if self.window_callback and self.running:
+                self.last_capture_time = capture_time
                 self.window_callback(window_bytes)
@@ -1,12 +1,13 @@
 """
 Audio Resampling Module for the Whisper Client
-Version: 1.1
-Timestamp: 2025-04-20 16:38 CET
+Version: 1.2
+Timestamp: 2026-10-19 17:35 CET
 
 This module provides functions for audio resampling and conversion.
+librosa (and with it numba/scipy) is imported on the first resampling that
+actually changes the rate, so a 16 kHz device never loads it.
 """
 
-import librosa
 import numpy as np
 
 from src import logger
@@ -15,6 +16,10 @@ from src.logging import log_warning
 
 def resample_to_16kHZ(audio_data, current_rate):
     """Resamples audio data to 16kHz using librosa."""
+    if current_rate == 16000:
+        return audio_data
+    import librosa
+
     y = np.frombuffer(audio_data, dtype=np.float32)
     resampled_audio = librosa.resample(y, orig_sr=current_rate, target_sr=16000)
     return resampled_audio.tobytes()
@@ -0,0 +1,493 @@
+"""
+Audio Source Module for the Whisper Client
+Version: 1.5
+Timestamp: 2026-10-19 23:05 CET
+
+This module provides the audio sources the AudioManager records from. Every
+source delivers mono 16-bit PCM chunks at its own sample rate, which is what
+a PyAudio input stream returns, so the downstream conversion, resampling and
+windowing are the same for all of them:
+
+- PyAudioSource: the configured microphone (default)
+- FileSource: WAV files via the wave module, FLAC and other formats via the
+  optional soundfile package
+- SyntheticSource: sine, noise or silence for headless benchmarks
+
+File and synthetic sources are paced in real time by default (or at a
+multiple of real time with speed); with realtime=False they deliver as fast
+as the consumer reads.
+
+Audio lost in capture is never skipped silently. A source that loses frames
+(an input overrun reported by the device, or fewer frames than the device
+clock produced between two reads) records an AudioGap, counts it in the
+audio.capture.gaps and audio.capture.lost_frames metrics and logs it. With
+fill_gaps (config.AUDIO_GAP_FILL) the lost frames are delivered as silence in
+front of the next chunk, so positions and timing downstream stay consistent
+with the capture clock. Gaps that are not filled in full (fill_gaps off, or
+longer than AUDIO_GAP_MAX_FILL_SECONDS) are counted as discontinuities; the
+AudioManager passes them on to the windowing.
+"""
+
+import time
+import wave
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional
+
+import numpy as np
+
+import config
+from src import logger
+from src.logging import log_error, log_info, log_warning
+from src.metrics import registry
+
+from .device import check_device_availability, test_microphone_access
+
+gap_count = registry.counter("audio.capture.gaps", "Gaps in the captured audio")
+lost_frames = registry.counter("audio.capture.lost_frames", "Captured frames lost in gaps")
+gap_seconds = registry.histogram("audio.capture.gap_seconds", "Length of captured audio gaps")
+device_overflows = registry.counter(
+    "audio.device.overflows", "Input overflows reported by the device"
+)
+
+
+@dataclass
+class AudioGap:
+    """Audio lost in front of a chunk."""
+
+    position: float  # Seconds of audio the source had delivered before the gap
+    seconds: float
+    reason: str  # overflow, timing (device clock), ring (capture process)
+
+
+class AudioSource:
+    """Base class for audio sources.
+
+    Subclasses implement _read_frames() and return at most `chunk` frames of
+    mono int16 PCM, or b"" at the end of the stream. Frames a subclass loses
+    are reported with _record_gap().
+
+    """
+
+    def __init__(self, rate, chunk=config.AUDIO_CHUNK, realtime=True, speed=1.0):
+        self.rate = rate
+        self.chunk = chunk
+        self.channels = 1
+        self.realtime = realtime
+        self.speed = speed
+        self.active = False
+        self.frames_read = 0
+        self._start_time = 0.0
+        self.fill_gaps = config.AUDIO_GAP_FILL
+        self.gaps: Deque[AudioGap] = deque(maxlen=config.AUDIO_GAP_HISTORY)
+        self.gap_total = 0
+        self.lost_frames = 0
+        self.discontinuities = 0  # Gaps not delivered as silence in full
+        self._pending_silence = 0
+
+    def check(self):
+        """Returns True if the source can be opened."""
+        return True
+
+    def open(self):
+        """Open the source for reading."""
+        self.active = True
+        self.frames_read = 0
+        self._start_time = time.perf_counter()
+        self.gaps.clear()
+        self.gap_total = 0
+        self.lost_frames = 0
+        self.discontinuities = 0
+        self._pending_silence = 0
+
+    def read(self):
+        """Returns the next chunk of int16 PCM bytes (b"" at end of stream)."""
+        data = self._read_frames()
+        if not data:
+            self.active = False
+            return b""
+
+        if self._pending_silence:
+            # The lost audio came before this chunk
+            data = bytes(self._pending_silence * 2) + data
+            self._pending_silence = 0
+
+        frames = len(data) // 2
+        self.frames_read += frames
+        if self.realtime:
+            # Sleep until the wall clock catches up with the delivered audio,
+            # measured from the start so that the pacing does not drift
+            elapsed = self.frames_read / (self.rate * self.speed)
+            delay = self._start_time + elapsed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        return data
+
+    def _read_frames(self) -> bytes:
+        raise NotImplementedError
+
+    def _record_gap(self, frames, reason, fill=True):
+        """Accounts for frames lost in front of the next chunk.
+
+        Args:
+            frames: Number of lost frames
+            reason: Cause of the loss, kept in the AudioGap
+            fill: Deliver the lost frames as silence (if fill_gaps is set);
+                  False if the silence is inserted elsewhere
+
+        """
+        if frames <= 0:
+            return
+        position = (self.frames_read + self._pending_silence) / self.rate
+        gap = AudioGap(position, frames / self.rate, reason)
+        self.gaps.append(gap)
+        self.gap_total += 1
+        self.lost_frames += frames
+        gap_count.inc()
+        lost_frames.inc(frames)
+        gap_seconds.record(gap.seconds)
+        log_warning(
+            logger,
+            "⚠️ Audio gap at %.2fs: %.0fms lost (%s)",
+            gap.position,
+            gap.seconds * 1000,
+            reason,
+        )
+        # Very long gaps are shortened rather than delaying the stream
+        limit = int(config.AUDIO_GAP_MAX_FILL_SECONDS * self.rate)
+        if fill and self.fill_gaps:
+            filled = min(self._pending_silence + frames, limit) - self._pending_silence
+            self._pending_silence += filled
+        else:
+            # Inserted elsewhere under the same limit, or not at all
+            filled = min(frames, limit) if self.fill_gaps else 0
+        if filled < frames:
+            # The audio after the gap does not continue the audio before it
+            self.discontinuities += 1
+
+    def is_active(self):
+        """Returns True while the source delivers audio."""
+        return self.active
+
+    def close(self):
+        """Stop reading from the source."""
+        self.active = False
+
+    def terminate(self):
+        """Release all resources of the source."""
+        self.close()
+
+
+class PyAudioSource(AudioSource):
+    """Microphone input via PyAudio."""
+
+    def __init__(
+        self,
+        device_index=config.AUDIO_DEVICE_INDEX,
+        rate=config.AUDIO_RATE,
+        chunk=config.AUDIO_CHUNK,
+        channels=config.AUDIO_CHANNELS,
+    ):
+        # The device blocks until a chunk is available, no extra pacing needed
+        super().__init__(rate, chunk, realtime=False)
+        # Loaded on first use, headless sources never need PortAudio
+        import pyaudio
+
+        self.audio = pyaudio.PyAudio()
+        self.stream = None
+        self.channels = channels
+        self.format = getattr(pyaudio, config.AUDIO_FORMAT)
+        self.device_index = device_index
+        self.overflows = 0
+        self._last_read = 0.0
+        self._last_available = 0
+
+    def check(self):
+        """Checks if the configured microphone is available."""
+        try:
+            info = self.audio.get_host_api_info_by_index(0)
+            num_devices = info.get("deviceCount")  # Can be None or str
+
+            # Ensure num_devices is an integer before comparison
+            if isinstance(num_devices, int) and self.device_index < num_devices:
+                device_info = self.audio.get_device_info_by_index(self.device_index)
+                max_channels = device_info.get("maxInputChannels")  # Can be None or str
+
+                # Ensure max_channels is an integer before comparison
+                if isinstance(max_channels, int) and max_channels > 0:
+                    # Correct Windows umlauts, ensure name is a string before encoding
+                    name_raw = device_info.get("name", "")
+                    name = (
+                        name_raw.encode("latin-1").decode("utf-8")
+                        if isinstance(name_raw, str)
+                        else "Unknown Device"
+                    )
+                    log_info(logger, "✓ Microphone found: %s", name)
+                    return True
+
+            log_error(logger, "⚠️ Microphone not available")
+            return False
+
+        except Exception as e:
+            log_error(logger, "⚠️ Error checking microphone: %s", e)
+            return False
+
+    def test_access(self):
+        """Opens the microphone briefly to verify access."""
+        return test_microphone_access(
+            self.audio, self.device_index, self.format, self.channels, self.rate, self.chunk
+        )
+
+    def is_device_available(self):
+        """Checks if the audio device is still available."""
+        return check_device_availability(self.audio, self.device_index)
+
+    def open(self):
+        """Open the input stream."""
+        self.stream = self.audio.open(
+            format=self.format,
+            channels=self.channels,
+            rate=self.rate,
+            input=True,
+            input_device_index=self.device_index,
+            frames_per_buffer=self.chunk,
+        )
+        super().open()
+        self._last_read = time.perf_counter()
+        self._last_available = 0
+
+    def _read_frames(self):
+        overflowed = False
+        try:
+            data = self.stream.read(self.chunk, exception_on_overflow=True)
+        except IOError as e:
+            import pyaudio
+
+            if e.errno != pyaudio.paInputOverflowed:
+                raise
+            # The device buffer overflowed; PyAudio discards the chunk of the
+            # failed read, so that audio is lost as well
+            overflowed = True
+            self.overflows += 1
+            device_overflows.inc()
+            data = self.stream.read(self.chunk, exception_on_overflow=False)
+        self._check_continuity(len(data) // 2, overflowed)
+        return data
+
+    def _read_available(self):
+        try:
+            return self.stream.get_read_available()
+        except Exception:
+            return 0
+
+    def _check_continuity(self, frames, overflowed):
+        """Records a gap if fewer frames arrived than the device produced.
+
+        Between two reads the device produces (elapsed time * rate) frames;
+        they are either read or still waiting in the stream buffer. Whatever
+        is missing was lost. Comparing consecutive reads only keeps the
+        estimate free of the drift between the device and the system clock.
+        """
+        now = time.perf_counter()
+        available = self._read_available()
+        produced = (now - self._last_read) * self.rate
+        lost = int(produced - frames - (available - self._last_available))
+        self._last_read = now
+        self._last_available = available
+        if overflowed:
+            self._record_gap(max(lost, self.chunk), "overflow")
+        elif lost > self.chunk:
+            # Not reported by the device, but more than a chunk is missing
+            self._record_gap(lost, "timing")
+
+    def is_active(self):
+        return self.active and self.stream is not None and self.stream.is_active()
+
+    def close(self):
+        """Stop and close the input stream."""
+        super().close()
+        if self.stream:
+            stream, self.stream = self.stream, None
+            stream.stop_stream()
+            stream.close()
+
+    def terminate(self):
+        """Close the stream and terminate PyAudio."""
+        try:
+            self.close()
+        finally:
+            if self.audio:
+                self.audio.terminate()
+                self.audio = None
+
+
+def _to_mono_int16(data, sample_width, channels):
+    """Converts interleaved PCM bytes of any common width to mono int16 bytes."""
+    if sample_width == 2:
+        samples = np.frombuffer(data, dtype="<i2")
+    elif sample_width == 1:
+        # 8-bit WAV is unsigned
+        samples = ((np.frombuffer(data, dtype=np.uint8).astype(np.int16) - 128) << 8).astype(
+            np.int16
+        )
+    elif sample_width == 3:
+        # Keep the upper two bytes of each little-endian 24-bit sample
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)[:, 1:]
+        samples = np.frombuffer(np.ascontiguousarray(raw).tobytes(), dtype="<i2")
+    elif sample_width == 4:
+        samples = (np.frombuffer(data, dtype="<i4") >> 16).astype(np.int16)
+    else:
+        raise ValueError(f"Unsupported sample width: {sample_width} bytes")
+
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    return samples.tobytes()
+
+
+class FileSource(AudioSource):
+    """Audio file input (WAV natively, FLAC etc. via soundfile)."""
+
+    def __init__(self, path, chunk=config.AUDIO_CHUNK, realtime=True, speed=1.0, loop=False):
+        """Initialize the source.
+
+        Args:
+            path: Audio file to read
+            chunk: Frames per read
+            realtime: Pace reads to the file's sample rate
+            speed: Pacing as a multiple of real time
+            loop: Start over at the end of the file instead of ending
+
+        """
+        self.path = str(path)
+        self.loop = loop
+        self._wav: Optional[wave.Wave_read] = None
+        self._sound_file = None
+        super().__init__(self._probe_rate(), chunk, realtime, speed)
+
+    def _is_wav(self):
+        return self.path.lower().endswith((".wav", ".wave"))
+
+    def _probe_rate(self):
+        if self._is_wav():
+            with wave.open(self.path, "rb") as wav:
+                return wav.getframerate()
+        return self._soundfile().info(self.path).samplerate
+
+    @staticmethod
+    def _soundfile():
+        try:
+            import soundfile
+        except ImportError as e:
+            raise RuntimeError("Reading non-WAV audio files requires the soundfile package") from e
+        return soundfile
+
+    def check(self):
+        try:
+            self._probe_rate()
+            return True
+        except Exception as e:
+            log_error(logger, "⚠️ Cannot read audio file %s: %s", self.path, e)
+            return False
+
+    def open(self):
+        """Open the file at its beginning."""
+        self._close_file()
+        if self._is_wav():
+            self._wav = wave.open(self.path, "rb")
+        else:
+            self._sound_file = self._soundfile().SoundFile(self.path)
+        super().open()
+        log_info(logger, "🎵 Reading audio from %s (%d Hz)", self.path, self.rate)
+
+    def _read_file(self):
+        if self._wav:
+            data = self._wav.readframes(self.chunk)
+            return _to_mono_int16(data, self._wav.getsampwidth(), self._wav.getnchannels())
+        block = self._sound_file.read(self.chunk, dtype="int16", always_2d=True)
+        if not len(block):
+            return b""
+        return block.mean(axis=1).astype(np.int16).tobytes()
+
+    def _read_frames(self):
+        data = self._read_file()
+        if not data and self.loop:
+            if self._wav:
+                self._wav.rewind()
+            else:
+                self._sound_file.seek(0)
+            data = self._read_file()
+        return data
+
+    def _close_file(self):
+        if self._wav:
+            self._wav.close()
+            self._wav = None
+        if self._sound_file is not None:
+            self._sound_file.close()
+            self._sound_file = None
+
+    def close(self):
+        super().close()
+        self._close_file()
+
+
+class SyntheticSource(AudioSource):
+    """Generated test signal."""
+
+    SIGNALS = ("sine", "noise", "silence")
+
+    def __init__(
+        self,
+        signal="sine",
+        duration: Optional[float] = None,
+        frequency=440.0,
+        amplitude=0.3,
+        rate=config.AUDIO_RATE,
+        chunk=config.AUDIO_CHUNK,
+        realtime=True,
+        speed=1.0,
+        seed=0,
+    ):
+        """Initialize the source.
+
+        Args:
+            signal: "sine", "noise" or "silence"
+            duration: Seconds of audio to deliver (None = endless)
+            frequency: Sine frequency in Hz
+            amplitude: Peak amplitude (0.0 - 1.0)
+            rate: Sample rate in Hz
+            chunk: Frames per read
+            realtime: Pace reads to the sample rate
+            speed: Pacing as a multiple of real time
+            seed: Seed for the noise generator
+
+        """
+        if signal not in self.SIGNALS:
+            raise ValueError(f"Unknown signal: {signal}")
+        super().__init__(rate, chunk, realtime, speed)
+        self.signal = signal
+        self.frequency = frequency
+        self.amplitude = amplitude
+        self.seed = seed
+        self.total_frames = int(duration * rate) if duration is not None else None
+        self._random = np.random.default_rng(seed)
+
+    def open(self):
+        self._random = np.random.default_rng(self.seed)
+        super().open()
+
+    def _read_frames(self):
+        frames = self.chunk
+        if self.total_frames is not None:
+            frames = min(frames, self.total_frames - self.frames_read)
+            if frames <= 0:
+                return b""
+
+        if self.signal == "sine":
+            t = (np.arange(frames) + self.frames_read) / self.rate
+            samples = self.amplitude * np.sin(2 * np.pi * self.frequency * t)
+        elif self.signal == "noise":
+            samples = self._random.uniform(-self.amplitude, self.amplitude, frames)
+        else:
+            samples = np.zeros(frames)
+        return (samples * 32767).astype(np.int16).tobytes()
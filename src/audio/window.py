@@ -1,11 +1,28 @@
 """
 Audio Window Processing Module for the Whisper Client
-Version: 1.1
-Timestamp: 2025-04-20 16:39 CET
+Version: 1.5
+Timestamp: 2026-10-19 23:20 CET
 
 This module implements the tumbling window approach for audio processing,
 providing smooth transitions between consecutive windows through linear
 crossfading in the overlap regions.
+
+By default consecutive windows overlap, so every window repeats the last
+overlap_size samples of the previous one and the server receives that audio
+twice. In exact-once mode (config.TUMBLING_WINDOW_EXACT_ONCE) the windows
+follow each other without overlap and every sample is sent exactly once; the
+crossfade is only applied at a discontinuity marked with mark_discontinuity(),
+where it blends the head of the next window with the tail of the previous
+one without adding samples. flush() returns the samples of the last, partial
+window when the stream ends.
+
+Audio given as bytes or another buffer is read as samples of the window's
+dtype; the AudioProcessor windows the float32 samples of the AudioManager,
+and the crossfade is computed in that type.
+
+The buffer is a preallocated numpy array: a chunk is copied in once, and a
+window is a slice of it. Consumers that hand a window on at once (the
+AudioProcessor) take it as a view with get_windows(copy=False).
 """
 
 import numpy as np
@@ -25,82 +42,190 @@ class TumblingWindow:
     """
 
     def __init__(
-        self, window_size=config.TUMBLING_WINDOW_SIZE, overlap=config.TUMBLING_WINDOW_OVERLAP
+        self,
+        window_size=config.TUMBLING_WINDOW_SIZE,
+        overlap=config.TUMBLING_WINDOW_OVERLAP,
+        exact_once=config.TUMBLING_WINDOW_EXACT_ONCE,
+        dtype=np.int16,
     ):
         """Initialize the tumbling window processor.
 
         Args:
             window_size: Size of each window in samples
             overlap: Overlap between windows as a fraction (0.0 - 1.0)
+            exact_once: Send every sample once; overlap_size is then the
+                        crossfade length at discontinuities
+            dtype: Sample type of audio added as bytes or another buffer
 
         """
         self.window_size = window_size
         self.overlap = max(0.0, min(1.0, overlap))  # Ensure overlap is between 0 and 1
         self.overlap_size = int(window_size * overlap)
-        self.buffer = []
+        self.exact_once = exact_once
+        # Samples each window advances the stream by
+        self.step = window_size if exact_once else window_size - self.overlap_size
+        # Buffered samples are self._data[self._start : self._end]
+        self.dtype = np.dtype(dtype)
+        self._data = np.empty(0, dtype=self.dtype)
+        self._start = 0
+        self._end = 0
         self.previous_window = None
-        log_debug(logger, "TumblingWindow initialized: size=%d, overlap=%.2f", window_size, overlap)
+        self.discontinuity = False
+        log_debug(
+            logger,
+            "TumblingWindow initialized: size=%d, overlap=%.2f, exact_once=%s",
+            window_size,
+            overlap,
+            exact_once,
+        )
+
+    @property
+    def buffer(self):
+        """The buffered samples (a view, valid until the next add_chunk)."""
+        return self._data[self._start : self._end]
+
+    def _make_room(self, size, dtype):
+        """Moves the buffered samples to the front, growing the storage if needed."""
+        buffered = self._end - self._start
+        if buffered == 0 and dtype != self._data.dtype:
+            # An empty buffer takes the sample type of the audio it receives
+            self._data = np.empty(len(self._data), dtype=dtype)
+        if self.previous_window is not None and self.previous_window.base is self._data:
+            # Keep the tail needed for a crossfade before its samples are moved
+            self.previous_window = self.previous_window[-max(1, self.overlap_size) :].copy()
+
+        if buffered + size > len(self._data):
+            data = np.empty(max(2 * (buffered + size), 4 * self.window_size), self._data.dtype)
+        else:
+            data = self._data
+        data[:buffered] = self._data[self._start : self._end]
+        self._data = data
+        self._start = 0
+        self._end = buffered
 
     def add_chunk(self, chunk):
         """Add an audio chunk to the buffer.
 
         Args:
-            chunk: Audio data as bytes or numpy array
+            chunk: Audio data as bytes, another buffer (e.g. memoryview) or
+                   numpy array
 
         """
-        # Convert bytes to numpy array if needed
-        if isinstance(chunk, bytes):
-            chunk = np.frombuffer(chunk, dtype=np.int16)
+        # Interpret buffers as samples of the window's type without copying
+        if not isinstance(chunk, np.ndarray):
+            chunk = np.frombuffer(chunk, dtype=self.dtype)
 
         # Add chunk to buffer
-        self.buffer.extend(chunk)
+        size = len(chunk)
+        if self._end + size > len(self._data) or (
+            self._start == self._end and chunk.dtype != self._data.dtype
+        ):
+            self._make_room(size, chunk.dtype)
+        self._data[self._end : self._end + size] = chunk
+        self._end += size
         log_debug(
-            logger, "Added chunk of %d samples, buffer now %d samples", len(chunk), len(self.buffer)
+            logger, "Added chunk of %d samples, buffer now %d samples", size, len(self.buffer)
         )
 
-    def get_windows(self):
+    def mark_discontinuity(self):
+        """Marks the next window as not continuing the previous one.
+
+        In exact-once mode the head of the next window is crossfaded with the
+        tail of the previous window, e.g. when the stream resumes after a
+        pause. Audio still buffered belongs before the discontinuity, so it
+        should be flushed first.
+        """
+        self.discontinuity = True
+
+    def _crossfade(self, window):
+        """Blends the head of the window with the tail of the previous window."""
+        size = min(self.overlap_size, len(window), len(self.previous_window))
+        # Create linear fade curves; integer samples are blended as floats
+        fade_dtype = window.dtype if window.dtype.kind == "f" else np.float64
+        fade_out = np.linspace(1, 0, size, dtype=fade_dtype)
+        fade_in = np.linspace(0, 1, size, dtype=fade_dtype)
+
+        # Get overlap regions
+        overlap_region = self.previous_window[-size:]
+        current_overlap = window[:size]
+
+        # Blend the overlap regions
+        blended = (overlap_region * fade_out) + (current_overlap * fade_in)
+        window[:size] = blended.astype(window.dtype)
+
+        log_debug(logger, "Applied crossfade of %d samples", size)
+
+    def _needs_crossfade(self):
+        if self.previous_window is None or self.overlap_size == 0:
+            return False
+        # Continuous audio is only crossfaded where the windows overlap
+        return self.discontinuity or not self.exact_once
+
+    def get_windows(self, copy=True):
         """Generator that yields available windows from the buffer.
 
         Each window is a numpy array of samples with size equal to window_size.
         Windows are removed from the buffer as they are yielded, with overlap
-        preserved for the next window.
+        preserved for the next window (except in exact-once mode).
+
+        Args:
+            copy: Yield independent arrays; with False, windows that need no
+                  crossfade are views that are only valid until the next
+                  add_chunk()
 
         Yields:
             numpy.ndarray: Audio window of size window_size
 
         """
-        while len(self.buffer) >= self.window_size:
+        while self._end - self._start >= self.window_size:
             # Extract a complete window
-            window = np.array(self.buffer[: self.window_size])
+            window = self._data[self._start : self._start + self.window_size]
 
             # Apply crossfade with previous window if available
-            if self.previous_window is not None and self.overlap > 0:
-                # Create linear fade curves
-                fade_out = np.linspace(1, 0, self.overlap_size)
-                fade_in = np.linspace(0, 1, self.overlap_size)
-
-                # Get overlap regions
-                overlap_region = self.previous_window[-self.overlap_size :]
-                current_overlap = window[: self.overlap_size]
-
-                # Blend the overlap regions
-                blended = (overlap_region * fade_out) + (current_overlap * fade_in)
-                window[: self.overlap_size] = blended
+            crossfade = self._needs_crossfade()
+            if copy or crossfade:
+                window = window.copy()
+            if crossfade:
+                self._crossfade(window)
+            self.discontinuity = False
+
+            # Update buffer and previous window before yielding, so a consumer
+            # that stops after this window does not get it again
+            # Remove window from buffer, keeping overlap for next window
+            self._start += self.step
+            self.previous_window = window
 
-                log_debug(logger, "Applied crossfade of %d samples", self.overlap_size)
+            log_debug(logger, "Window processed, buffer now %d samples", len(self.buffer))
 
             # Yield the processed window
             yield window
 
-            # Update buffer and previous window
-            # Remove window from buffer, keeping overlap for next window
-            self.buffer = self.buffer[self.window_size - self.overlap_size :]
-            self.previous_window = window
+    def flush(self):
+        """Returns the buffered samples no window has sent yet, and empties the buffer.
 
-            log_debug(logger, "Window processed, buffer now %d samples", len(self.buffer))
+        These are the last samples of the stream, fewer than a window. With
+        overlapping windows the overlap kept in the buffer was already sent
+        and is not returned again.
+
+        Returns:
+            numpy.ndarray: The remaining samples (may be empty)
+
+        """
+        sent = self.window_size - self.step if self.previous_window is not None else 0
+        window = self.buffer[sent:].copy()
+        self._start = self._end = 0
+        if not len(window):
+            return window
+
+        if self.exact_once and self._needs_crossfade():
+            self._crossfade(window)
+        self.discontinuity = False
+        self.previous_window = window
+        return window
 
     def clear(self):
         """Clear the buffer and reset state."""
-        self.buffer = []
+        self._start = self._end = 0
         self.previous_window = None
+        self.discontinuity = False
         log_debug(logger, "TumblingWindow buffer cleared")
@@ -0,0 +1,63 @@
+"""
+Clock Module for the Whisper Client
+Version: 1.0
+Timestamp: 2026-10-19 17:10 CET
+
+This module provides the time source of the text pipeline. The sentence
+timeout, the output rate limit and the expiry of the TextBuffer compare
+wall-clock timestamps, so tests and replays that use the real clock have to
+wait for every timeout. TextManager and TextBuffer take a clock instead of
+calling time.time()/time.sleep() directly:
+
+- SystemClock uses the real time and is the default
+- FakeClock only moves when it is advanced or slept on, so a timeout test
+  runs instantly and a replay can follow the recorded message offsets
+  without waiting for them
+"""
+
+import threading
+import time
+
+
+class SystemClock:
+    """Real wall-clock time."""
+
+    def time(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class FakeClock:
+    """Manually advanced clock for tests and replays.
+
+    sleep() returns immediately and advances the clock by the requested
+    time, so code that waits for a deadline sees it pass.
+    """
+
+    def __init__(self, start: float = 0.0):
+        self._now = start
+        self.lock = threading.Lock()
+
+    def time(self) -> float:
+        with self.lock:
+            return self._now
+
+    def sleep(self, seconds: float):
+        self.advance(seconds)
+
+    def advance(self, seconds: float):
+        """Moves the clock forward by the given number of seconds."""
+        if seconds > 0:
+            with self.lock:
+                self._now += seconds
+
+    def advance_to(self, timestamp: float):
+        """Moves the clock forward to the given time; never goes back."""
+        with self.lock:
+            self._now = max(self._now, timestamp)
+
+
+system_clock = SystemClock()
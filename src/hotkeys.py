@@ -1,7 +1,7 @@
 """
 Hotkey Management for the Whisper Client
-Version: 1.3
-Timestamp: 2025-04-20 16:39 CET
+Version: 1.5
+Timestamp: 2026-10-19 18:00 CET
 
 This module provides hotkey detection and management for the Whisper Client.
 It handles F13/F14 key detection and triggers appropriate callbacks when
@@ -26,7 +26,12 @@ class HotkeyManager:
         self.thread = None
 
         # Hotkey-Mappings
-        self.HOTKEYS = {"f13": (0, win32con.VK_F13), "f14": (0, win32con.VK_F14)}
+        self.HOTKEYS = {
+            "f13": (0, win32con.VK_F13),
+            "f14": (0, win32con.VK_F14),
+            "f15": (0, win32con.VK_F15),
+            "f16": (0, win32con.VK_F16),
+        }
 
     def register_hotkey(self, hotkey, callback):
         """Registers a hotkey with callback."""
@@ -91,7 +96,7 @@ class HotkeyManager:
             return
 
         self.running = True
-        self.thread = threading.Thread(target=self._check_hotkeys)
+        self.thread = threading.Thread(target=self._check_hotkeys, name="Hotkeys")
         self.thread.daemon = True
         self.thread.start()
         log_debug(logger, "✓ Hotkey system started")
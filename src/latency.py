@@ -0,0 +1,264 @@
+"""
+Latency Tracing Module for the Whisper Client
+Version: 1.0
+Timestamp: 2026-10-19 11:05 CET
+
+This module measures end-to-end latency from captured audio to inserted text.
+Each WebSocket session keeps an AudioTimeline that maps the sample offset of
+every sent frame to its capture and send timestamps. WhisperLive reports
+segment start/end times relative to the audio stream of the session, so a
+segment's end time can be translated back into the moment the corresponding
+audio was captured. When the TextManager outputs a sentence, the
+LatencyTracker combines this with the receive and output timestamps into a
+LatencyRecord and feeds the latency histograms of the metrics registry.
+"""
+
+import bisect
+import collections
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Deque, List, Optional
+
+import config
+from src import logger
+from src.logging import log_debug, log_error
+from src.metrics import registry
+
+# Audio is sent to WhisperLive as float32 samples
+BYTES_PER_SAMPLE = 4
+
+
+@dataclass
+class TimelineFrame:
+    """Position and timestamps of one audio frame sent to the server."""
+
+    start_sample: int
+    end_sample: int
+    capture_time: float
+    send_time: float
+
+
+@dataclass
+class LatencyRecord:
+    """Latency breakdown for one output sentence."""
+
+    text: str
+    session_id: str
+    audio_start: float
+    audio_end: float
+    captured_at: float
+    sent_at: float
+    received_at: float
+    output_at: float
+
+    @property
+    def end_to_end(self):
+        """Seconds from capture of the last word to inserted text."""
+        return self.output_at - self.captured_at
+
+    @property
+    def server_latency(self):
+        """Seconds from capture until the server's segment arrived."""
+        return self.received_at - self.captured_at
+
+    @property
+    def client_latency(self):
+        """Seconds from receiving the segment until the text was inserted."""
+        return self.output_at - self.received_at
+
+    def to_dict(self):
+        """Returns the record including derived latencies."""
+        data = asdict(self)
+        data["end_to_end"] = self.end_to_end
+        data["server_latency"] = self.server_latency
+        data["client_latency"] = self.client_latency
+        return data
+
+
+class AudioTimeline:
+    """Per-session bookkeeping of sent audio frames.
+
+    Frames are stored in send order with their sample offsets in the
+    session's audio stream. Lookups interpolate the capture time of a sample
+    backwards from the capture time of the frame's last sample.
+
+    """
+
+    def __init__(self, rate=config.AUDIO_RATE, max_seconds=config.LATENCY_TIMELINE_SECONDS):
+        self.rate = rate
+        self.max_samples = int(max_seconds * rate)
+        self.frames: Deque[TimelineFrame] = collections.deque()
+        self._starts: Deque[int] = collections.deque()
+        self.total_samples = 0
+        self.lock = threading.Lock()
+
+    def reset(self):
+        """Start a new session timeline at sample offset 0."""
+        with self.lock:
+            self.frames.clear()
+            self._starts.clear()
+            self.total_samples = 0
+
+    def record_frame(self, num_bytes, capture_time=None, send_time=None):
+        """Append a sent frame to the timeline.
+
+        Args:
+            num_bytes: Size of the frame payload in bytes
+            capture_time: Time the frame's last sample was captured
+            send_time: Time the frame was sent (defaults to now)
+
+        """
+        send_time = send_time if send_time is not None else time.time()
+        capture_time = capture_time if capture_time is not None else send_time
+        samples = num_bytes // BYTES_PER_SAMPLE
+        with self.lock:
+            start = self.total_samples
+            self.total_samples += samples
+            self.frames.append(TimelineFrame(start, self.total_samples, capture_time, send_time))
+            self._starts.append(start)
+
+            # Drop frames that fell out of the retained window
+            while self.frames and self.frames[0].end_sample < self.total_samples - self.max_samples:
+                self.frames.popleft()
+                self._starts.popleft()
+
+    def lookup(self, audio_seconds):
+        """Returns (capture_time, send_time) of the audio at audio_seconds.
+
+        Returns None if the position is not (or no longer) on the timeline.
+        """
+        sample = int(audio_seconds * self.rate)
+        with self.lock:
+            if not self.frames:
+                return None
+            index = bisect.bisect_right(self._starts, sample) - 1
+            if index < 0:
+                return None
+            frame = self.frames[index]
+            # Positions past the last frame clamp to the newest sample
+            sample = min(sample, frame.end_sample)
+            capture_time = frame.capture_time - (frame.end_sample - sample) / self.rate
+            return capture_time, frame.send_time
+
+    def trace_segment(self, segment, session_id, received_at=None):
+        """Builds the trace annotation for a segment received from the server.
+
+        Args:
+            segment: WhisperLive segment dict with "start" and "end"
+            session_id: Session the segment belongs to
+            received_at: Receive timestamp (defaults to now)
+
+        Returns:
+            Dict with audio position and timestamps, or None if the segment
+            cannot be placed on the timeline
+
+        """
+        received_at = received_at if received_at is not None else time.time()
+        try:
+            audio_start = float(segment.get("start", 0.0))
+            audio_end = float(segment.get("end", audio_start))
+        except (TypeError, ValueError):
+            return None
+
+        position = self.lookup(audio_end)
+        if position is None:
+            return None
+
+        captured_at, sent_at = position
+        return {
+            "session_id": session_id,
+            "audio_start": audio_start,
+            "audio_end": audio_end,
+            "captured_at": captured_at,
+            "sent_at": sent_at,
+            "received_at": received_at,
+        }
+
+
+class LatencyTracker:
+    """Collects per-sentence latency records and exports them."""
+
+    def __init__(self, trace_file=config.LATENCY_TRACE_FILE, max_records=1000):
+        self.trace_file = trace_file
+        self.records: Deque[LatencyRecord] = collections.deque(maxlen=max_records)
+        self.lock = threading.Lock()
+        self.end_to_end = registry.histogram(
+            "latency.end_to_end_seconds", "Capture of last word until text inserted"
+        )
+        self.server = registry.histogram(
+            "latency.server_seconds", "Capture until segment received from the server"
+        )
+        self.client = registry.histogram(
+            "latency.client_seconds", "Segment received until text inserted"
+        )
+
+    def record_sentence(self, text, trace, output_at=None):
+        """Create a LatencyRecord for an output sentence.
+
+        Args:
+            text: Sentence that was inserted
+            trace: Trace annotation of the newest segment in the sentence
+            output_at: Time insert_text completed (defaults to now)
+
+        Returns:
+            The created LatencyRecord
+
+        """
+        output_at = output_at if output_at is not None else time.time()
+        record = LatencyRecord(text=text, output_at=output_at, **trace)
+
+        self.end_to_end.record(max(0.0, record.end_to_end))
+        self.server.record(max(0.0, record.server_latency))
+        self.client.record(max(0.0, record.client_latency))
+
+        with self.lock:
+            self.records.append(record)
+            if self.trace_file:
+                self._write(record)
+
+        log_debug(
+            logger,
+            "Sentence latency %.3fs (server %.3fs, client %.3fs)",
+            record.end_to_end,
+            record.server_latency,
+            record.client_latency,
+        )
+        return record
+
+    def _write(self, record):
+        """Append a record to the JSON lines trace file."""
+        try:
+            directory = os.path.dirname(self.trace_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.trace_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record.to_dict(), ensure_ascii=False) + "\n")
+        except Exception as e:
+            log_error(logger, "Error writing latency trace: %s", e)
+
+    def get_records(self) -> List[LatencyRecord]:
+        """Returns a copy of the retained records (oldest first)."""
+        with self.lock:
+            return list(self.records)
+
+
+# Global tracker used by the text pipeline
+latency_tracker = LatencyTracker()
+
+
+def merge_traces(first: Optional[dict], latest: Optional[dict]):
+    """Combine the trace of a sentence's first and newest segment.
+
+    The audio start comes from the first segment, everything else from the
+    newest one, so the record spans the whole sentence.
+    """
+    if latest is None:
+        return first
+    if first is None or first.get("session_id") != latest.get("session_id"):
+        return latest
+    merged = dict(latest)
+    merged["audio_start"] = min(first["audio_start"], latest["audio_start"])
+    return merged
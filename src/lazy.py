@@ -0,0 +1,33 @@
+"""
+Lazy Export Module for the Whisper Client
+Version: 1.0
+Timestamp: 2026-10-19 17:35 CET
+
+This module lets a package export names from its submodules without
+importing them in __init__.py. The package maps every exported name to the
+submodule that defines it and installs the returned function as its module
+__getattr__ (PEP 562); the submodule is imported on the first access and the
+name is then cached in the package namespace.
+"""
+
+import importlib
+
+
+def lazy_exports(package, exports):
+    """Returns a module __getattr__ that imports exported names on demand.
+
+    Args:
+        package: __name__ of the package
+        exports: Mapping of exported name to relative submodule (".manager")
+
+    """
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name):
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(exports[name], package), name)
+        namespace[name] = value
+        return value
+
+    return __getattr__
@@ -1,16 +1,34 @@
 """
 Logging Module for the Whisper Client
-Version: 1.6
-Timestamp: 2025-04-20 16:33 CET
+Version: 1.11
+Timestamp: 2026-10-19 22:00 CET
 
 This module provides logging functionality for the Whisper Client.
 It configures loggers, formatters, and handlers for different types of logs
 and provides specialized logging functions for different components.
+
+The log_* helpers check the level before doing any work and pass the format
+arguments through unformatted, so disabled levels cost a single method call.
+Hot paths should therefore use %-style arguments instead of f-strings.
+
+All sinks sit behind a QueueHandler. The calling thread only merges the
+arguments into the message and enqueues the record; the sink formats,
+exception tracebacks and console/disk I/O run on a QueueListener thread, so
+the audio, WebSocket and hotkey threads never block on log output.
+
+The logger has no sinks until get_logger() is called. Entry points call it
+once at startup; until then only warnings and errors reach stderr through
+Python's last-resort handler.
 """
 
+import atexit
+import copy
 import logging
 import os
+import queue
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional
 
 import config
 
@@ -18,110 +36,150 @@ import config
 logger = logging.getLogger("WhisperClient")
 logger.setLevel(logging.DEBUG)
 
+# Background listener that owns all sinks (console and files)
+_listener: Optional[QueueListener] = None
+
 
 class WhisperFormatter(logging.Formatter):
-    """Formatter that uses different formats based on log type."""
+    """Formatter that uses different formats based on log type.
+
+    One stdlib Formatter is compiled per log type up front and never
+    modified afterwards, so a WhisperFormatter can be shared safely between
+    threads.
+    """
 
     def __init__(self, formats=None):
         super().__init__()
-        self.formats = formats or config.LOG_FORMAT_FILE
+        self.formats = dict(formats or config.LOG_FORMAT_FILE)
+        self._formatters = {
+            log_type: logging.Formatter(format_str) for log_type, format_str in self.formats.items()
+        }
+        self._default_formatter = self._formatters["default"]
 
     def format(self, record):
-        # Choose format based on log type
-        if hasattr(record, "log_type"):
-            format_str = self.formats.get(record.log_type, self.formats["default"])
-        else:
-            format_str = self.formats["default"]
+        # Choose precompiled formatter based on log type
+        formatter = self._formatters.get(
+            getattr(record, "log_type", "default"), self._default_formatter
+        )
+        return formatter.format(record)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves the formatting to the sinks.
+
+    The stdlib prepare() runs the handler's formatter - including any
+    exception traceback - on the calling thread. This one only merges the
+    arguments into the message, since mutable arguments may change before the
+    listener gets to the record; the sinks format it on the listener thread.
+    """
 
-        # Set format and format record
-        self._style._fmt = format_str
-        return super().format(record)
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
 
 
-def log_connection(logger, message, *args, **kwargs):
+def _log(logger, level, log_type, message, args, fields=None):
+    """Emit a record only if the level is enabled, deferring formatting.
+
+    The message is handed to the stdlib logger together with its arguments,
+    so ``message % args`` only runs when a handler actually formats the
+    record. Structured fields end up as record attributes via ``extra``.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    extra = {"log_type": log_type}
+    if fields:
+        extra.update(fields)
+    # stacklevel=3 attributes the record to the caller of the log_* helper
+    logger.log(level, message, *args, extra=extra, stacklevel=3)
+
+
+def log_connection(logger, message, *args):
     """Log for connection events."""
-    logger = logging.getLogger(logger.name)
-    if args or kwargs:
-        message = message % args if args else message % kwargs
-    logger.info(message, extra={"log_type": "connection"})
-
-
-def log_audio(logger, message, *args, **kwargs):
-    """Log for audio events."""
-    logger = logging.getLogger(logger.name)
-    if args or kwargs:
-        message = message % args if args else message % kwargs
-
-    if isinstance(message, str) and "bytes" in message:
-        try:
-            size = int(message.split()[1])
-            logger.info(message, extra={"log_type": "audio", "size": size})
-        except (ValueError, IndexError) as e:
-            log_debug(logger, "Error parsing audio message size: %s", e)
-            logger.info(message, extra={"log_type": "audio", "size": 0})
-    else:
-        logger.info(message, extra={"log_type": "audio", "size": 0})
-
-
-def log_text(logger, message, *args, **kwargs):
+    _log(logger, logging.INFO, "connection", message, args)
+
+
+def log_audio(logger, message, *args, size=0):
+    """Log for audio events.
+
+    Args:
+        logger: Logger instance
+        message: Message format string
+        *args: Arguments for the format string
+        size: Size of the audio payload in bytes
+
+    """
+    _log(logger, logging.INFO, "audio", message, args, {"size": size})
+
+
+def log_text(logger, message, *args):
     """Log for text events."""
-    logger = logging.getLogger(logger.name)
-    if args or kwargs:
-        message = message % args if args else message % kwargs
-    logger.info(message, extra={"log_type": "text"})
+    _log(logger, logging.INFO, "text", message, args)
 
 
-def log_info(logger, message, *args, **kwargs):
+def log_info(logger, message, *args):
     """Log for info events."""
-    logger = logging.getLogger(logger.name)
-    if args or kwargs:
-        message = message % args if args else message % kwargs
-    logger.info(message, extra={"log_type": "info"})
+    _log(logger, logging.INFO, "info", message, args)
 
 
-def log_warning(logger, message, *args, **kwargs):
+def log_warning(logger, message, *args):
     """Log for warning events."""
-    logger = logging.getLogger(logger.name)
-    if args or kwargs:
-        message = message % args if args else message % kwargs
-    logger.warning(message, extra={"log_type": "warning"})
+    _log(logger, logging.WARNING, "warning", message, args)
 
 
-def log_debug(logger, message, *args, **kwargs):
+def log_debug(logger, message, *args):
     """Log for debug events."""
-    logger = logging.getLogger(logger.name)
-    if args or kwargs:
-        message = message % args if args else message % kwargs
-    logger.debug(message, extra={"log_type": "debug"})
-
-
-def log_error(logger, message, *args, **kwargs):
-    """Log for errors."""
-    logger = logging.getLogger(logger.name)
-    if args or kwargs:
-        message = message % args if args else message % kwargs
-    logger.error(
-        message,
-        extra={
-            "log_type": "error",
-            "stack": getattr(message, "stack", ""),
-            "size": getattr(message, "size", 0),
-        },
-    )
+    _log(logger, logging.DEBUG, "debug", message, args)
+
+
+def log_error(logger, message, *args, stack="", size=0):
+    """Log for errors.
+
+    Args:
+        logger: Logger instance
+        message: Message format string
+        *args: Arguments for the format string
+        stack: Optional stack trace appended by the regression format
+        size: Optional payload size related to the error
+
+    """
+    _log(logger, logging.ERROR, "error", message, args, {"stack": stack, "size": size})
+
+
+def stop_logging():
+    """Stops the log listener thread after flushing all queued records."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
 
 
 def get_logger():
-    """Returns the global logger instance."""
+    """Sets up the sinks of the global logger and returns it.
+
+    Creates the log directory, opens the daily and regression log files and
+    starts the listener thread. Called by the entry points, not on import.
+    """
+    global _listener
     print("Initializing logger...")  # Debug output
 
-    # Remove existing handlers
+    # Remove existing handlers and stop a previous listener
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
+    stop_logging()
 
     # Create logs directory
     log_dir = os.path.dirname(config.REGRESSION_LOG_FILE)
     os.makedirs(log_dir, exist_ok=True)
 
+    sinks: List[logging.Handler] = []
     try:
         # Console Handler with UTF-8
         console_handler = logging.StreamHandler()
@@ -129,7 +187,7 @@ def get_logger():
         console_formatter = WhisperFormatter(config.LOG_FORMAT_CONSOLE)
         console_handler.setFormatter(console_formatter)
         console_handler.stream.reconfigure(encoding="utf-8")  # type: ignore [attr-defined]
-        logger.addHandler(console_handler)
+        sinks.append(console_handler)
 
         # Create logs directory
         log_dir = os.path.join(
@@ -149,29 +207,50 @@ def get_logger():
         file_handler.setLevel(getattr(logging, config.LOG_LEVEL_FILE))
         file_formatter = WhisperFormatter()
         file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
+        sinks.append(file_handler)
 
         # Regression Investigation Handler with detailed format
         regression_handler = logging.FileHandler(
             config.REGRESSION_LOG_FILE, encoding="utf-8", mode="w"
         )
-        regression_handler.setLevel(logging.DEBUG)
+        regression_handler.setLevel(getattr(logging, config.REGRESSION_LOG_LEVEL))
         regression_formatter = WhisperFormatter(config.REGRESSION_LOG_FORMAT)
         regression_handler.setFormatter(regression_formatter)
-        logger.addHandler(regression_handler)
-        logger.info(
-            "Regression Investigation Logger activated",
-            extra={
-                "log_type": "default",
-                "details": "Server logs available at /home/michael/appdata/whisperlive/logs (WSL)",
-            },
-        )
+        sinks.append(regression_handler)
 
     except Exception as e:
         print(f"Error initializing logger: {e}")
         # Fallback Console Handler without UTF-8
         fallback_handler = logging.StreamHandler()
+        fallback_handler.setLevel(logging.DEBUG)
         fallback_handler.setFormatter(logging.Formatter("%(message)s"))
-        logger.addHandler(fallback_handler)
+        sinks.append(fallback_handler)
+
+    # The logger only merges the arguments and enqueues; the listener thread
+    # formats and writes. The queue is unbounded, so producers never wait for
+    # the sinks.
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    _listener = QueueListener(log_queue, *sinks, respect_handler_level=True)
+    _listener.start()
+    # Name the listener thread so profiles and thread dumps can attribute it
+    listener_thread = getattr(_listener, "_thread", None)
+    if listener_thread is not None:
+        listener_thread.name = "LogListener"
+
+    # Let the logger itself reject records no sink would emit, so that
+    # isEnabledFor() in the log_* helpers short-circuits disabled levels
+    min_level = min(sink.level for sink in sinks)
+    queue_handler.setLevel(min_level)
+    logger.setLevel(min_level)
+    logger.addHandler(queue_handler)
+
+    logger.info(
+        "Regression Investigation Logger activated",
+        extra={
+            "log_type": "default",
+            "details": "Server logs available at /home/michael/appdata/whisperlive/logs (WSL)",
+        },
+    )
 
     return logger
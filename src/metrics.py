@@ -0,0 +1,361 @@
+"""
+Metrics Module for the Whisper Client
+Version: 1.2
+Timestamp: 2026-10-19 23:45 CET
+
+This module provides a lightweight in-process metrics registry with counters,
+gauges and HDR-style latency histograms. The pipeline stages (capture,
+windowing, send, receive, text processing and output) record into the global
+registry; snapshot() returns all values as a plain dict and MetricsExporter
+writes that snapshot to a JSON file periodically.
+
+Gauges that read an object's state carry labels naming that object (see
+instance_labels()), so several instances - e.g. the parallel sessions of a
+batch run - each report their own value. The owner unregisters them when it
+is closed, which also releases the object the callback refers to.
+"""
+
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+import config
+from src import logger
+from src.logging import log_debug, log_error
+
+# Percentiles reported by Histogram.summary()
+SUMMARY_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+# Source of the object label of per-instance gauges
+_instance_ids = itertools.count(1)
+
+
+def instance_labels():
+    """Returns labels that tell the gauges of one instance from another's.
+
+    The label is called object: Prometheus sets instance on every scraped
+    series to the scrape target and would rename a label of that name.
+    """
+    return {"object": str(next(_instance_ids))}
+
+
+def metric_key(name, labels=None):
+    """Returns the registry key of a metric, e.g. 'queue.depth{object="1"}'."""
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{key}="{value}"' for key, value in sorted(labels.items())) + "}"
+
+
+class Counter:
+    """Monotonically increasing value."""
+
+    def __init__(self, name, description=""):
+        self.name = name
+        self.description = description
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        """Increase the counter by amount."""
+        with self._lock:
+            self.value += amount
+
+
+class Gauge:
+    """Value that can go up and down.
+
+    A gauge either holds a value set by the instrumented code or reads it
+    from a callback when it is sampled, which keeps the hot path free of any
+    bookkeeping for values like queue depths.
+    """
+
+    def __init__(
+        self,
+        name,
+        description="",
+        callback: Optional[Callable[[], float]] = None,
+        labels: Optional[Dict[str, str]] = None,
+    ):
+        self.name = name
+        self.description = description
+        self.callback = callback
+        self.labels = dict(labels or {})
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value):
+        """Set the gauge to value."""
+        self._value = value
+
+    def inc(self, amount=1):
+        """Increase the gauge by amount."""
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount=1):
+        """Decrease the gauge by amount."""
+        with self._lock:
+            self._value -= amount
+
+    @property
+    def value(self):
+        """Current value, evaluating the callback if one is set."""
+        if self.callback is not None:
+            try:
+                return self.callback()
+            except Exception as e:
+                log_debug(logger, "Gauge callback %s failed: %s", self.name, e)
+                return 0.0
+        return self._value
+
+
+class Histogram:
+    """HDR-style histogram with bounded relative error.
+
+    Values are scaled to integers (e.g. seconds to microseconds) and counted
+    in log-linear buckets: every power of two is split into
+    2**(sub_bucket_bits - 1) linear sub-buckets, so each bucket is at most
+    2**-(sub_bucket_bits - 1) of its value wide. With the default of 7 bits
+    percentiles are accurate to better than 1.6 %, independent of the range.
+
+    """
+
+    def __init__(self, name, description="", scale=1_000_000, sub_bucket_bits=7):
+        """Initialize the histogram.
+
+        Args:
+            name: Metric name
+            description: Human readable description
+            scale: Factor applied to recorded values before bucketing
+                   (1_000_000 records seconds with microsecond resolution)
+            sub_bucket_bits: Precision of the buckets (see class docstring)
+
+        """
+        self.name = name
+        self.description = description
+        self.scale = scale
+        self.sub_bucket_bits = sub_bucket_bits
+        self._buckets: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _bucket_index(self, scaled):
+        """Returns the lower bound of the bucket holding scaled."""
+        shift = scaled.bit_length() - self.sub_bucket_bits
+        if shift <= 0:
+            return scaled
+        return (scaled >> shift) << shift
+
+    def _bucket_upper(self, lower):
+        """Returns the inclusive upper bound of the bucket starting at lower."""
+        shift = lower.bit_length() - self.sub_bucket_bits
+        if shift <= 0:
+            return lower
+        return lower + (1 << shift) - 1
+
+    def record(self, value):
+        """Record a single value."""
+        scaled = int(value * self.scale)
+        if scaled < 0:
+            scaled = 0
+        index = self._bucket_index(scaled)
+        with self._lock:
+            self._buckets[index] = self._buckets.get(index, 0) + 1
+            self.count += 1
+            self.sum += value
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+
+    @contextmanager
+    def time(self):
+        """Context manager recording the duration of its block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(time.perf_counter() - start)
+
+    def percentile(self, percent):
+        """Returns the value at the given percentile (0-100)."""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            target = max(1, int(round(self.count * percent / 100.0)))
+            seen = 0
+            for lower in sorted(self._buckets):
+                seen += self._buckets[lower]
+                if seen >= target:
+                    # Midpoint of the bucket, clamped to the observed range
+                    value = (lower + self._bucket_upper(lower)) / 2.0 / self.scale
+                    return min(max(value, self.min or 0.0), self.max or value)
+            return self.max or 0.0
+
+    def buckets(self):
+        """Returns (upper_bound, cumulative_count) pairs in recorded units."""
+        with self._lock:
+            result = []
+            cumulative = 0
+            for lower in sorted(self._buckets):
+                cumulative += self._buckets[lower]
+                result.append(((self._bucket_upper(lower) + 1) / self.scale, cumulative))
+            return result
+
+    def summary(self):
+        """Returns count, sum, min, max, mean and percentiles as a dict."""
+        result = {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min or 0.0,
+            "max": self.max or 0.0,
+            "mean": self.sum / self.count if self.count else 0.0,
+        }
+        for percent in SUMMARY_PERCENTILES:
+            result[f"p{percent:g}"] = self.percentile(percent)
+        return result
+
+    def reset(self):
+        """Drop all recorded values."""
+        with self._lock:
+            self._buckets.clear()
+            self.count = 0
+            self.sum = 0.0
+            self.min = None
+            self.max = None
+
+
+class MetricsRegistry:
+    """Named collection of counters, gauges and histograms.
+
+    Metrics are created on first use, so instrumented modules can simply call
+    registry.counter("ws.send.bytes").inc(n) without prior registration.
+
+    """
+
+    def __init__(self):
+        self.counters: Dict[str, Counter] = {}
+        self.gauges: Dict[str, Gauge] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name, description=""):
+        """Returns the counter called name, creating it if necessary."""
+        metric = self.counters.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self.counters.setdefault(name, Counter(name, description))
+        return metric
+
+    def gauge(self, name, description="", callback=None, labels=None):
+        """Returns the gauge called name with the given labels, creating it if necessary.
+
+        Passing a callback (re)binds the gauge to that callback. Gauges bound
+        to an instance's state take labels from instance_labels() and are
+        removed again with unregister().
+        """
+        key = metric_key(name, labels)
+        metric = self.gauges.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self.gauges.setdefault(key, Gauge(name, description, labels=labels))
+        if callback is not None:
+            metric.callback = callback
+        return metric
+
+    def unregister(self, *gauges):
+        """Removes the given gauges, e.g. the per-instance gauges of a closed owner."""
+        with self._lock:
+            for gauge in gauges:
+                key = metric_key(gauge.name, gauge.labels)
+                if self.gauges.get(key) is gauge:
+                    del self.gauges[key]
+
+    def histogram(self, name, description="", scale=1_000_000):
+        """Returns the histogram called name, creating it if necessary."""
+        metric = self.histograms.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self.histograms.setdefault(name, Histogram(name, description, scale))
+        return metric
+
+    def snapshot(self):
+        """Returns the current value of every metric as a JSON-ready dict."""
+        return {
+            "timestamp": time.time(),
+            "counters": {name: metric.value for name, metric in sorted(self.counters.items())},
+            "gauges": {name: metric.value for name, metric in sorted(self.gauges.items())},
+            "histograms": {
+                name: metric.summary() for name, metric in sorted(self.histograms.items())
+            },
+        }
+
+    def reset(self):
+        """Remove all metrics (mainly for tests)."""
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+
+
+class MetricsExporter:
+    """Writes registry snapshots to a JSON file in a background thread."""
+
+    def __init__(
+        self,
+        metrics_registry=None,
+        path=config.METRICS_EXPORT_FILE,
+        interval=config.METRICS_EXPORT_INTERVAL,
+    ):
+        self.registry = metrics_registry or registry
+        self.path = path
+        self.interval = interval
+        self.thread: Optional[threading.Thread] = None
+        self.stop_event = threading.Event()
+
+    def export(self):
+        """Write one snapshot, replacing the file atomically."""
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.registry.snapshot(), f, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            log_error(logger, "Error exporting metrics: %s", e)
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            self.export()
+
+    def start(self):
+        """Start periodic export."""
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name="MetricsExporter")
+        self.thread.daemon = True
+        self.thread.start()
+        log_debug(logger, "Metrics export to %s every %.1fs", self.path, self.interval)
+
+    def stop(self):
+        """Stop periodic export and write a final snapshot."""
+        if not self.thread:
+            return
+        self.stop_event.set()
+        self.thread.join(timeout=config.THREAD_TIMEOUT)
+        self.thread = None
+        self.export()
+
+
+# Global registry used by all instrumented modules
+registry = MetricsRegistry()
@@ -0,0 +1,194 @@
+"""
+Metrics HTTP Exporter Module for the Whisper Client
+Version: 1.2
+Timestamp: 2026-10-19 23:45 CET
+
+This module exposes the metrics registry in the Prometheus text exposition
+format on a small stdlib HTTP server running in its own thread. It is off by
+default (config.METRICS_HTTP_ENABLED); when disabled nothing is started and
+no per-request work exists. Values are only collected when /metrics is
+scraped, including the connection state of all active WhisperWebSocket
+instances.
+"""
+
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+import config
+from src import logger
+from src.logging import log_debug, log_error, log_info
+from src.metrics import registry
+
+METRIC_PREFIX = "whisper_client_"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds (seconds) of the exported histogram buckets
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def metric_name(name, suffix=""):
+    """Converts a dotted registry name into a Prometheus metric name."""
+    return METRIC_PREFIX + name.replace(".", "_").replace("-", "_") + suffix
+
+
+def _format_value(value):
+    """Formats a sample value as Prometheus expects it."""
+    if value is None:
+        return "NaN"
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape_label(value):
+    """Escapes a label value."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels):
+    """Formats a label set, e.g. {object="1"}; empty for unlabelled metrics."""
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape_label(value)}"' for key, value in sorted(labels.items()))
+    return "{" + pairs + "}"
+
+
+def render_histogram(name, histogram, bounds=LATENCY_BUCKETS) -> List[str]:
+    """Renders a registry histogram as cumulative Prometheus buckets."""
+    lines = [f"# TYPE {name} histogram"]
+    if histogram.description:
+        lines.insert(0, f"# HELP {name} {histogram.description}")
+
+    fine_buckets = histogram.buckets()
+    index = 0
+    cumulative = 0
+    for bound in bounds:
+        while index < len(fine_buckets) and fine_buckets[index][0] <= bound:
+            cumulative = fine_buckets[index][1]
+            index += 1
+        lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{le="+Inf"}} {histogram.count}')
+    lines.append(f"{name}_sum {_format_value(histogram.sum)}")
+    lines.append(f"{name}_count {histogram.count}")
+    return lines
+
+
+def render_connection_states() -> List[str]:
+    """Renders the connection state of every active WhisperWebSocket."""
+    # Imported on scrape so that the exporter does not pull in the WebSocket stack
+    from src.ws_client.connection import ConnectionManager
+    from src.ws_client.state import ConnectionState
+
+    name = metric_name("ws.connection_state")
+    lines = [
+        f"# HELP {name} Current connection state per client (1 for the active state)",
+        f"# TYPE {name} gauge",
+    ]
+    for instance in ConnectionManager.get_instances():
+        client_id = _escape_label(instance.client_id)
+        for state in ConnectionState:
+            value = 1 if instance.state == state else 0
+            lines.append(f'{name}{{client_id="{client_id}",state="{state.name}"}} {value}')
+    return lines
+
+
+def render_metrics(metrics_registry=None) -> str:
+    """Renders all metrics in the Prometheus text exposition format."""
+    metrics_registry = metrics_registry or registry
+    lines: List[str] = []
+
+    for name, counter in sorted(metrics_registry.counters.items()):
+        prom_name = metric_name(name, "_total")
+        if counter.description:
+            lines.append(f"# HELP {prom_name} {counter.description}")
+        lines.append(f"# TYPE {prom_name} counter")
+        lines.append(f"{prom_name} {_format_value(counter.value)}")
+
+    previous_name = None
+    gauges = sorted(metrics_registry.gauges.items(), key=lambda item: (item[1].name, item[0]))
+    for _, gauge in gauges:
+        prom_name = metric_name(gauge.name)
+        if gauge.name != previous_name:
+            # One HELP/TYPE header per metric, followed by its labelled samples
+            if gauge.description:
+                lines.append(f"# HELP {prom_name} {gauge.description}")
+            lines.append(f"# TYPE {prom_name} gauge")
+            previous_name = gauge.name
+        lines.append(f"{prom_name}{_format_labels(gauge.labels)} {_format_value(gauge.value)}")
+
+    for name, histogram in sorted(metrics_registry.histograms.items()):
+        lines.extend(render_histogram(metric_name(name), histogram))
+
+    try:
+        lines.extend(render_connection_states())
+    except Exception as e:
+        log_debug(logger, "Could not collect connection states: %s", e)
+
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Serves /metrics and answers everything else with 404."""
+
+    def do_GET(self):  # noqa: N802 - name required by BaseHTTPRequestHandler
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        try:
+            body = render_metrics(self.server.metrics_registry).encode("utf-8")  # type: ignore
+        except Exception as e:
+            log_error(logger, "Error rendering metrics: %s", e)
+            self.send_error(500)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Route request logging to the client logger instead of stderr."""
+        log_debug(logger, "Metrics HTTP: " + format, *args)
+
+
+class MetricsHTTPServer:
+    """Prometheus scrape endpoint running in a background thread."""
+
+    def __init__(
+        self, host=config.METRICS_HTTP_HOST, port=config.METRICS_HTTP_PORT, metrics_registry=None
+    ):
+        self.host = host
+        self.port = port
+        self.registry = metrics_registry or registry
+        self.httpd: Optional[ThreadingHTTPServer] = None
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self):
+        """(host, port) the server is bound to, or None if not running."""
+        return self.httpd.server_address[:2] if self.httpd else None
+
+    def start(self):
+        """Bind the port and start serving."""
+        if self.httpd:
+            return
+        self.httpd = ThreadingHTTPServer((self.host, self.port), _MetricsRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.metrics_registry = self.registry  # type: ignore [attr-defined]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="MetricsHTTP")
+        self.thread.daemon = True
+        self.thread.start()
+        log_info(logger, "📈 Metrics available at http://%s:%d/metrics", *self.address)
+
+    def stop(self):
+        """Stop serving and release the port."""
+        if not self.httpd:
+            return
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread:
+            self.thread.join(timeout=config.THREAD_TIMEOUT)
+        self.httpd = None
+        self.thread = None
@@ -0,0 +1,465 @@
+"""
+Profiling Module for the Whisper Client
+Version: 1.4
+Timestamp: 2026-10-20 00:05 CET
+
+This module provides opt-in memory and CPU profiling for long-running
+sessions, both controllable at runtime without restarting dictation.
+
+The MemoryProfiler takes tracemalloc snapshots periodically or on
+demand (hotkey, SIGUSR1) and writes a diff report for each snapshot:
+
+- live memory per subsystem (src/audio, src/ws_client, src/text, logging,
+  metrics, other) and its growth since the previous and the first snapshot
+- the allocation sites that grew most since the previous snapshot
+
+An allocation is attributed to the innermost frame of its traceback that
+lies inside the client's src/ directory, so a numpy buffer or deque append
+made on behalf of TextBuffer counts for src/text, not for numpy or the
+stdlib. tracemalloc slows down allocations noticeably, so profiling only
+starts when enabled.
+
+The CpuProfiler samples the stacks of all threads via sys._current_frames()
+on a timer and writes them in collapsed-stack format ("thread;outer;inner
+count" per line) for flamegraph.pl, speedscope or inferno. Every stack
+starts with the thread name, which is why the client's threads are named
+(AudioCapture, AudioProcessing, WebSocket-<id>, Hotkeys, ...). Sampling is
+wall-clock: threads blocked in a wait show up in their waiting frame.
+"""
+
+import collections
+import os
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Counter, Dict, Optional
+
+import config
+from src import logger
+from src.logging import log_debug, log_error, log_info
+from src.metrics import instance_labels, registry
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SRC_DIR)
+
+# Subsystem name -> path below src/ (directory or module)
+SUBSYSTEMS = {
+    "audio": "audio",
+    "ws_client": "ws_client",
+    "text": "text",
+    "logging": "logging.py",
+    "metrics": "metrics.py",
+}
+OTHER = "other"
+
+# Allocations of tracemalloc itself are not interesting
+_EXCLUDE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+)
+
+
+def _subsystem_paths():
+    return {name: os.path.join(SRC_DIR, path) for name, path in SUBSYSTEMS.items()}
+
+
+def attribute(traceback, paths=None) -> str:
+    """Returns the subsystem of an allocation traceback.
+
+    Frames are checked from the innermost outwards; the first frame inside
+    a subsystem decides. Allocations without such a frame count as "other".
+    """
+    paths = paths or _subsystem_paths()
+    # tracemalloc orders frames from the oldest to the most recent call
+    for frame in reversed(traceback):
+        filename = os.path.abspath(frame.filename)
+        for name, path in paths.items():
+            if filename == path or filename.startswith(path + os.sep):
+                return name
+    return OTHER
+
+
+def subsystem_sizes(snapshot) -> Dict[str, int]:
+    """Returns the traced bytes per subsystem of a snapshot."""
+    paths = _subsystem_paths()
+    sizes = dict.fromkeys(list(SUBSYSTEMS) + [OTHER], 0)
+    for stat in snapshot.statistics("traceback"):
+        sizes[attribute(stat.traceback, paths)] += stat.size
+    return sizes
+
+
+class MemoryProfiler:
+    """Takes tracemalloc snapshots and writes per-subsystem diff reports."""
+
+    def __init__(
+        self,
+        output_dir=config.PROFILE_DIR,
+        interval=config.MEMORY_PROFILE_INTERVAL,
+        frames=config.MEMORY_PROFILE_FRAMES,
+        top=config.MEMORY_PROFILE_TOP,
+    ):
+        """Initialize the profiler.
+
+        Args:
+            output_dir: Directory for the reports
+            interval: Seconds between periodic snapshots (0 = on demand only)
+            frames: Traceback depth recorded per allocation
+            top: Number of allocation sites listed per report
+
+        """
+        self.output_dir = output_dir
+        self.interval = interval
+        self.frames = frames
+        self.top = top
+        self.previous: Optional[tracemalloc.Snapshot] = None
+        self.first_sizes: Dict[str, int] = {}
+        self.previous_sizes: Dict[str, int] = {}
+        self.snapshot_count = 0
+        self.started_tracing = False
+        self.active = False  # Between start() and stop()
+        self.lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
+        self.stop_event = threading.Event()
+        # Gauges of the subsystem sizes, registered while tracing
+        self.labels = instance_labels()
+        self.gauges = []
+
+    def start(self):
+        """Start tracing and, with an interval, periodic snapshots."""
+        if self.active:
+            return
+        self.active = True
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self.started_tracing = True
+            log_info(logger, "🧠 Memory profiling started (%d frames)", self.frames)
+        self.gauges = [
+            registry.gauge(
+                f"memory.{name}.bytes",
+                f"Traced memory allocated by {name}",
+                callback=lambda name=name: self.previous_sizes.get(name, 0),
+                labels=self.labels,
+            )
+            for name in list(SUBSYSTEMS) + [OTHER]
+        ]
+        if self.previous is None:
+            self.snapshot()
+
+        if self.interval > 0 and not (self.thread and self.thread.is_alive()):
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self._run, name="MemoryProfiler")
+            self.thread.daemon = True
+            self.thread.start()
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            self.snapshot()
+
+    def stop(self):
+        """Write a final report and stop tracing if this profiler started it.
+
+        The baselines are dropped, so a restarted profiler compares against a
+        new baseline instead of the end of this session.
+        """
+        if not self.active:
+            return
+        self.active = False
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=config.THREAD_TIMEOUT)
+            self.thread = None
+        if tracemalloc.is_tracing():
+            self.snapshot()
+            if self.started_tracing:
+                tracemalloc.stop()
+                self.started_tracing = False
+        registry.unregister(*self.gauges)
+        with self.lock:
+            self.previous = None
+            self.first_sizes = {}
+            self.previous_sizes = {}
+
+    def snapshot(self) -> Optional[str]:
+        """Take a snapshot and write its report.
+
+        Starts tracing first if it is not running (on-demand use); the first
+        snapshot only establishes the baseline.
+
+        Returns:
+            Path of the written report, or None for the baseline snapshot
+
+        """
+        if not tracemalloc.is_tracing():
+            self.start()
+            return None
+
+        with self.lock:
+            try:
+                start = time.perf_counter()
+                snapshot = tracemalloc.take_snapshot().filter_traces(_EXCLUDE_FILTERS)
+                sizes = subsystem_sizes(snapshot)
+                self.snapshot_count += 1
+
+                if self.previous is None:
+                    self.previous = snapshot
+                    self.first_sizes = self.previous_sizes = sizes
+                    log_debug(logger, "Memory baseline: %d bytes traced", sum(sizes.values()))
+                    return None
+
+                path = self._write_report(snapshot, sizes)
+                self.previous = snapshot
+                self.previous_sizes = sizes
+                log_info(
+                    logger,
+                    "🧠 Memory snapshot %d: %.1f MiB traced, report %s (%.2fs)",
+                    self.snapshot_count,
+                    sum(sizes.values()) / 2**20,
+                    path,
+                    time.perf_counter() - start,
+                )
+                return path
+            except Exception as e:
+                log_error(logger, "Error taking memory snapshot: %s", e)
+                return None
+
+    def _write_report(self, snapshot, sizes):
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [
+            f"Memory snapshot {self.snapshot_count} at {datetime.now():%Y-%m-%d %H:%M:%S}",
+            f"Traced: {current / 2**20:.2f} MiB (peak {peak / 2**20:.2f} MiB)",
+            "",
+            f"{'Subsystem':<12}{'Size KiB':>12}{'Δ prev KiB':>14}{'Δ first KiB':>14}",
+        ]
+        for name, size in sizes.items():
+            lines.append(
+                f"{name:<12}{size / 1024:>12.1f}"
+                f"{(size - self.previous_sizes.get(name, 0)) / 1024:>+14.1f}"
+                f"{(size - self.first_sizes.get(name, 0)) / 1024:>+14.1f}"
+            )
+
+        lines += ["", f"Top {self.top} allocation sites by growth since the previous snapshot:"]
+        for stat in snapshot.compare_to(self.previous, "lineno")[: self.top]:
+            lines.append(str(stat))
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(
+            self.output_dir, f"memory_{datetime.now():%Y%m%d-%H%M%S}_{self.snapshot_count:04d}.txt"
+        )
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return path
+
+    def request_snapshot(self):
+        """Take a snapshot in a separate thread.
+
+        Used by the hotkey and the signal handler, which must not block
+        for the duration of a snapshot.
+        """
+        thread = threading.Thread(target=self.snapshot, name="MemorySnapshot")
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def install_signal_handler(self):
+        """Take a snapshot on SIGUSR1 (POSIX only).
+
+        Returns:
+            True if the handler was installed
+
+        """
+        if not hasattr(signal, "SIGUSR1"):
+            return False
+        signal.signal(signal.SIGUSR1, lambda signum, frame: self.request_snapshot())
+        return True
+
+
+def process_rss() -> Optional[int]:
+    """Returns the RSS of the process in bytes.
+
+    Uses psutil if installed, otherwise the peak RSS from the resource
+    module (None on Windows without psutil).
+    """
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        return None
+
+
+def open_sockets() -> Optional[int]:
+    """Returns the number of sockets open in the process (None if unknown)."""
+    try:
+        import psutil
+
+        return len(psutil.Process().net_connections(kind="all"))
+    except ImportError:
+        pass
+    except Exception:
+        return None
+    fd_dir = "/proc/self/fd"
+    if not os.path.isdir(fd_dir):
+        return None
+    count = 0
+    for fd in os.listdir(fd_dir):
+        try:
+            if os.readlink(os.path.join(fd_dir, fd)).startswith("socket:"):
+                count += 1
+        except OSError:
+            pass
+    return count
+
+
+def _frame_label(code):
+    """Returns "function (path:line)" with the path relative to the project."""
+    filename = code.co_filename
+    if filename.startswith(PROJECT_ROOT + os.sep):
+        filename = os.path.relpath(filename, PROJECT_ROOT)
+    else:
+        filename = os.path.join(*filename.replace("\\", "/").split("/")[-2:])
+    # ";" separates frames in the collapsed format
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+class CpuProfiler:
+    """Samples the stacks of all threads and writes collapsed stacks."""
+
+    def __init__(
+        self,
+        output_dir=config.PROFILE_DIR,
+        interval=config.CPU_PROFILE_INTERVAL,
+        max_depth=config.CPU_PROFILE_MAX_DEPTH,
+    ):
+        """Initialize the profiler.
+
+        Args:
+            output_dir: Directory for the collapsed-stack files
+            interval: Seconds between samples
+            max_depth: Innermost frames kept per stack
+
+        """
+        self.output_dir = output_dir
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples: Counter[str] = collections.Counter()
+        self.sample_count = 0
+        self.lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
+        self.stop_event = threading.Event()
+        self.started_at = 0.0
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        """Start sampling (clears the previous profile)."""
+        if self.running:
+            return
+        with self.lock:
+            self.samples.clear()
+            self.sample_count = 0
+        self.stop_event.clear()
+        self.started_at = time.time()
+        self.thread = threading.Thread(target=self._run, name="CpuProfiler")
+        self.thread.daemon = True
+        self.thread.start()
+        log_info(logger, "🔥 CPU profiling started (every %.0fms)", self.interval * 1000)
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self.stop_event.wait(self.interval):
+            self.sample(exclude=own_ident)
+
+    def sample(self, exclude=None):
+        """Record the current stack of every thread once."""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        stacks = []
+        for ident, frame in sys._current_frames().items():
+            if ident == exclude:
+                continue
+            labels = []
+            while frame is not None and len(labels) < self.max_depth:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            labels.append(names.get(ident, f"thread-{ident}").replace(";", ":"))
+            stacks.append(";".join(reversed(labels)))
+
+        with self.lock:
+            self.samples.update(stacks)
+            self.sample_count += 1
+
+    def collapsed(self):
+        """Returns the profile as collapsed-stack lines."""
+        with self.lock:
+            return [f"{stack} {count}" for stack, count in self.samples.most_common()]
+
+    def stop(self) -> Optional[str]:
+        """Stop sampling and write the profile.
+
+        Returns:
+            Path of the collapsed-stack file, or None if not running
+
+        """
+        if not self.thread:
+            return None
+        self.stop_event.set()
+        self.thread.join(timeout=config.THREAD_TIMEOUT)
+        self.thread = None
+
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = os.path.join(
+                self.output_dir, f"cpu_{datetime.fromtimestamp(self.started_at):%Y%m%d-%H%M%S}.txt"
+            )
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("\n".join(self.collapsed()) + "\n")
+        except Exception as e:
+            log_error(logger, "Error writing CPU profile: %s", e)
+            return None
+
+        log_info(
+            logger,
+            "🔥 CPU profile with %d samples over %.1fs written to %s",
+            self.sample_count,
+            time.time() - self.started_at,
+            path,
+        )
+        return path
+
+    def toggle(self):
+        """Start sampling, or stop it and write the profile."""
+        if self.running:
+            return self.stop()
+        self.start()
+        return None
+
+    def install_signal_handler(self):
+        """Toggle sampling on SIGUSR2 (POSIX only).
+
+        Returns:
+            True if the handler was installed
+
+        """
+        if not hasattr(signal, "SIGUSR2"):
+            return False
+        # Writing the profile joins the sampler thread, so hand it off
+        signal.signal(
+            signal.SIGUSR2,
+            lambda signum, frame: threading.Thread(
+                target=self.toggle, name="CpuProfileToggle", daemon=True
+            ).start(),
+        )
+        return True
@@ -0,0 +1,169 @@
+"""
+Session Recording Module for the Whisper Client
+Version: 1.1
+Timestamp: 2026-10-19 17:10 CET
+
+This module records the message stream of a WhisperLive session and replays
+it into the text pipeline. Text assembly depends on the exact sequence and
+timing of WhisperLive's cumulative segment updates, so a recording of real
+traffic reproduces text regressions offline and serves as benchmark input.
+
+A recording is a gzip-compressed JSON lines file. The first line is a header
+with the client and session IDs and the wall-clock start time, every further
+line holds one raw server message and its offset from the start:
+
+    {"format": "whisper-session", "version": 1, "session_id": ..., ...}
+    {"t": 0.1234, "m": "{\\"uid\\": ..., \\"message\\": \\"SERVER_READY\\"}"}
+
+Messages are stored exactly as received, so the replay runs them through the
+same process_message() as the live client. A replay into a TextManager with a
+FakeClock (src.clock) advances the clock to each recorded offset instead of
+sleeping, so sentence timeouts fire as in the live session while an hour of
+traffic replays in seconds.
+"""
+
+import gzip
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import config
+from src import logger
+from src.clock import FakeClock
+from src.logging import log_error, log_info
+
+RECORDING_FORMAT = "whisper-session"
+RECORDING_VERSION = 1
+RECORDING_SUFFIX = ".jsonl.gz"
+
+
+class SessionRecorder:
+    """Writes the received messages of a WebSocket session to a recording."""
+
+    def __init__(self, directory=config.SESSION_RECORDING_DIR):
+        self.directory = directory
+        self.path: Optional[str] = None
+        self.message_count = 0
+        self._file = None
+        self._start = 0.0
+        self.lock = threading.Lock()
+
+    def start(self, client_id, session_id):
+        """Start a new recording, closing the previous one."""
+        self.stop()
+        started_at = time.time()
+        name = f"{datetime.fromtimestamp(started_at):%Y%m%d-%H%M%S}_{session_id[:8]}"
+        header = {
+            "format": RECORDING_FORMAT,
+            "version": RECORDING_VERSION,
+            "client_id": client_id,
+            "session_id": session_id,
+            "started_at": started_at,
+        }
+        with self.lock:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                self.path = os.path.join(self.directory, name + RECORDING_SUFFIX)
+                self._file = gzip.open(self.path, "wt", encoding="utf-8")
+                self._file.write(json.dumps(header) + "\n")
+                self._start = time.perf_counter()
+                self.message_count = 0
+            except Exception as e:
+                self._file = None
+                log_error(logger, "Error starting session recording: %s", e)
+                return
+        log_info(logger, "⏺ Recording session to %s", self.path)
+
+    def record(self, message):
+        """Append a received message with its offset from the start."""
+        offset = time.perf_counter() - self._start
+        if isinstance(message, bytes):
+            message = message.decode("utf-8", errors="replace")
+        with self.lock:
+            if self._file is None:
+                return
+            try:
+                self._file.write(json.dumps({"t": round(offset, 4), "m": message}) + "\n")
+                self.message_count += 1
+            except Exception as e:
+                log_error(logger, "Error writing session recording: %s", e)
+
+    def stop(self):
+        """Finish the current recording."""
+        with self.lock:
+            if self._file is None:
+                return
+            try:
+                self._file.close()
+            except Exception as e:
+                log_error(logger, "Error closing session recording: %s", e)
+            finally:
+                self._file = None
+        log_info(logger, "⏹ Recorded %d messages to %s", self.message_count, self.path)
+
+    @property
+    def active(self):
+        return self._file is not None
+
+
+def read_recording(path) -> Tuple[dict, List[Tuple[float, str]]]:
+    """Reads a recording.
+
+    Returns:
+        The header and a list of (offset, message) tuples
+
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("format") != RECORDING_FORMAT:
+            raise ValueError(f"Not a session recording: {path}")
+        if header.get("version", 0) > RECORDING_VERSION:
+            raise ValueError(f"Unsupported recording version: {header.get('version')}")
+        messages = []
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                messages.append((entry["t"], entry["m"]))
+    return header, messages
+
+
+def replay_session(path, text_manager, speed=1.0, flush=True):
+    """Feeds a recording into a TextManager.
+
+    Every message is parsed by process_message() exactly like in the live
+    client and the resulting segments go to text_manager.process_segments.
+    If the text manager runs on a FakeClock, the clock follows the recorded
+    offsets and the speed only sets the real-time pacing.
+
+    Args:
+        path: Recording file
+        text_manager: Receives the segments (e.g. TextManager(test_mode=True))
+        speed: Multiple of the original timing (0 = no delays)
+        flush: Output the pending sentence after the last message, like a
+               stopped recording does
+
+    Returns:
+        Number of replayed messages
+
+    """
+    from src.ws_client.messaging import process_message
+
+    _, messages = read_recording(path)
+    fake_clock = text_manager.clock if isinstance(text_manager.clock, FakeClock) else None
+    clock_start = fake_clock.time() if fake_clock else 0.0
+    start = time.perf_counter()
+    for offset, message in messages:
+        if speed > 0:
+            delay = start + offset / speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        if fake_clock:
+            fake_clock.advance_to(clock_start + offset)
+        process_message(message, text_manager.process_segments)
+
+    if flush and text_manager.current_sentence:
+        text_manager.output_sentence()
+    return len(messages)
@@ -0,0 +1,205 @@
+"""
+Startup Orchestration Module for the Whisper Client
+Version: 1.0
+Timestamp: 2026-10-19 18:00 CET
+
+This module runs the client startup as a dependency graph. Every step names
+the steps it requires; steps whose requirements are met run concurrently on
+a thread pool, so the slow independent ones (server probe and connect,
+microphone probe, hotkey registration) overlap instead of adding up.
+
+Steps are essential by default: a failing essential step stops the startup
+and is raised as StartupError. Optional steps only log their error, and the
+steps that require them are skipped. Deferred steps (bookkeeping such as the
+task history) run on a background thread once startup has finished.
+
+Every step is timed; the report is logged and the step durations are
+recorded in the startup.step.seconds histogram.
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src import logger
+from src.logging import log_error, log_info
+from src.metrics import registry
+
+step_seconds = registry.histogram("startup.step.seconds", "Duration of a startup step")
+startup_seconds = registry.histogram("startup.seconds", "Time until all startup steps finished")
+
+
+class StartupError(Exception):
+    """An essential startup step failed."""
+
+    def __init__(self, step, error):
+        super().__init__(f"Startup step '{step}' failed: {error}")
+        self.step = step
+        self.error = error
+
+
+@dataclass
+class StartupStep:
+    """A startup step and its outcome."""
+
+    name: str
+    func: Callable[[], Any]
+    requires: Tuple[str, ...] = ()
+    essential: bool = True
+    deferred: bool = False
+    status: str = "pending"  # pending, running, done, failed, skipped
+    offset: float = 0.0  # Start relative to the startup start
+    seconds: float = 0.0
+    result: Any = None
+    error: Optional[Exception] = None
+
+
+class StartupGraph:
+    """Runs startup steps concurrently in dependency order."""
+
+    def __init__(self, max_workers=8):
+        self.max_workers = max_workers
+        self.steps: Dict[str, StartupStep] = {}
+        self.deferred_thread: Optional[threading.Thread] = None
+        self._start = 0.0
+
+    def add(self, name, func, requires=(), essential=True, deferred=False):
+        """Adds a step.
+
+        Args:
+            name: Unique step name
+            func: Callable without arguments
+            requires: Names of the steps that must have finished first
+            essential: Abort the startup if this step fails
+            deferred: Run on a background thread after startup
+
+        """
+        if name in self.steps:
+            raise ValueError(f"Duplicate startup step: {name}")
+        self.steps[name] = StartupStep(name, func, tuple(requires), essential, deferred)
+        return self
+
+    def _validate(self):
+        for step in self.steps.values():
+            for required in step.requires:
+                if required not in self.steps:
+                    raise ValueError(f"Step '{step.name}' requires unknown step '{required}'")
+                if self.steps[required].deferred and not step.deferred:
+                    raise ValueError(f"Step '{step.name}' requires deferred step '{required}'")
+
+        # Kahn's algorithm: every step must become ready eventually
+        remaining = {name: set(step.requires) for name, step in self.steps.items()}
+        while remaining:
+            ready = [name for name, requires in remaining.items() if not requires]
+            if not ready:
+                raise ValueError(f"Startup steps form a cycle: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for requires in remaining.values():
+                requires.difference_update(ready)
+
+    def _run_step(self, step: StartupStep):
+        step.offset = time.perf_counter() - self._start
+        try:
+            step.result = step.func()
+            step.status = "done"
+        except Exception as e:
+            step.error = e
+            step.status = "failed"
+        finally:
+            step.seconds = time.perf_counter() - self._start - step.offset
+            step_seconds.record(step.seconds)
+        return step
+
+    def _ready_steps(self, steps):
+        """Returns the pending steps whose requirements are done.
+
+        Steps that require a failed or skipped step are skipped; skips
+        cascade, so this repeats until nothing changes.
+        """
+        changed = True
+        while changed:
+            changed = False
+            for step in steps:
+                if step.status == "pending" and any(
+                    self.steps[r].status in ("failed", "skipped") for r in step.requires
+                ):
+                    step.status = "skipped"
+                    changed = True
+        return [
+            step
+            for step in steps
+            if step.status == "pending"
+            and all(self.steps[r].status == "done" for r in step.requires)
+        ]
+
+    def _run(self, steps: List[StartupStep], name_prefix):
+        """Runs the steps and returns the first failed essential step."""
+        failed = None
+        with ThreadPoolExecutor(self.max_workers, thread_name_prefix=name_prefix) as pool:
+            running = {}
+            while True:
+                if failed is None:
+                    for step in self._ready_steps(steps):
+                        step.status = "running"
+                        running[pool.submit(self._run_step, step)] = step
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    if step.status == "failed":
+                        log_error(logger, "⚠️ Startup step %s failed: %s", step.name, step.error)
+                        if step.essential and failed is None:
+                            failed = step
+
+        for step in steps:
+            if step.status == "pending":
+                step.status = "skipped"
+        return failed
+
+    def run(self):
+        """Runs all non-deferred steps, then starts the deferred ones.
+
+        Returns:
+            Dict of step name to the step's return value
+
+        Raises:
+            StartupError: If an essential step failed
+            ValueError: If the graph has unknown requirements or cycles
+
+        """
+        self._validate()
+        self._start = time.perf_counter()
+        steps = [s for s in self.steps.values() if not s.deferred]
+        failed = self._run(steps, "Startup")
+        startup_seconds.record(time.perf_counter() - self._start)
+        log_info(logger, "%s", self.format_report())
+
+        if failed is not None:
+            raise StartupError(failed.name, failed.error)
+
+        deferred = [s for s in self.steps.values() if s.deferred]
+        if deferred:
+            self.deferred_thread = threading.Thread(
+                target=self._run, args=(deferred, "StartupDeferred"), name="StartupDeferred"
+            )
+            self.deferred_thread.daemon = True
+            self.deferred_thread.start()
+        return {name: step.result for name, step in self.steps.items() if step.status == "done"}
+
+    def format_report(self):
+        """Formats the step timings, in start order."""
+        steps = [s for s in self.steps.values() if not s.deferred]
+        lines = ["⏱️ Startup steps:"]
+        for step in sorted(steps, key=lambda s: (s.status == "skipped", s.offset)):
+            if step.status == "skipped":
+                lines.append(f"  {step.name:<12} skipped")
+            else:
+                lines.append(
+                    f"  {step.name:<12} +{step.offset * 1000:6.0f}ms "
+                    f"{step.seconds * 1000:6.0f}ms {step.status}"
+                )
+        return "\n".join(lines)
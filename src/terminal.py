@@ -1,7 +1,7 @@
 """
 Terminal Management for the Whisper Client
-Version: 1.4
-Timestamp: 2025-04-20 16:40 CET
+Version: 1.5
+Timestamp: 2026-10-19 16:20 CET
 
 This module provides terminal management functionality for the Whisper Client.
 It tracks terminal status, handles terminal registration and cleanup, and
@@ -49,7 +49,9 @@ class TerminalManager:
 
         # Start monitoring thread
         self.monitoring = True
-        self.monitor_thread = threading.Thread(target=self._monitor_terminals)
+        self.monitor_thread = threading.Thread(
+            target=self._monitor_terminals, name="TerminalMonitor"
+        )
         self.monitor_thread.daemon = True
         self.monitor_thread.start()
 
@@ -1,14 +1,34 @@
 """
 Text Processing Package for the Whisper Client
-Version: 1.2
-Timestamp: 2025-04-20 14:00 CET
+Version: 1.3
+Timestamp: 2026-10-19 17:35 CET
 
 Dieses Paket stellt Textverarbeitungsfunktionalität für den Whisper Client bereit.
 Es enthält Klassen und Funktionen für Textsegmentierung, Pufferung, Verarbeitung
 und Ausgabe.
+
+Die exportierten Klassen werden erst beim ersten Zugriff importiert, so dass
+"import src.text" keine Untermodule lädt.
 """
 
-from .manager import TextManager
+from typing import TYPE_CHECKING
+
+from src.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .buffer import TextBuffer
+    from .manager import TextManager
+    from .segment import TextSegment
+
+# Exported name -> submodule that defines it
+_LAZY_EXPORTS = {
+    "TextManager": ".manager",
+    "TextBuffer": ".buffer",
+    "TextSegment": ".segment",
+}
 
 # Öffentliche API
-__all__ = ["TextManager"]
+__all__ = ["TextManager", "TextBuffer", "TextSegment"]
+
+
+__getattr__ = lazy_exports(__name__, _LAZY_EXPORTS)
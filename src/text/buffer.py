@@ -1,7 +1,7 @@
 """Text Buffer Module for the Whisper Client.
 
-Version: 1.2
-Timestamp: 2025-04-20 19:51 CET
+Version: 1.5
+Timestamp: 2026-10-19 22:15 CET
 
 This module provides a thread-safe buffer for text segments with
 functionality for duplicate detection and segment management.
@@ -10,10 +10,11 @@ functionality for duplicate detection and segment management.
 
 import collections
 import threading
-import time
 from typing import List, Optional
 
 import config
+from src.clock import system_clock
+from src.metrics import instance_labels, registry
 
 from .segment import TextSegment
 
@@ -21,14 +22,36 @@ from .segment import TextSegment
 class TextBuffer:
     """Thread-safe ring buffer for text segments."""
 
-    def __init__(self, max_size=config.TEXT_BUFFER_SIZE, max_age=config.TEXT_BUFFER_MAX_AGE):
-        """Initialize the buffer with specified size and age limits."""
+    def __init__(
+        self, max_size=config.TEXT_BUFFER_SIZE, max_age=config.TEXT_BUFFER_MAX_AGE, clock=None
+    ):
+        """Initialize the buffer with specified size and age limits.
+
+        Segment ages are measured with the given clock (src.clock), the
+        system clock by default.
+        """
         self.max_size = max_size
         self.max_age = max_age
+        self.clock = clock or system_clock
         self.buffer: collections.deque[TextSegment] = collections.deque(maxlen=max_size)
         self.lock = threading.RLock()  # Reentrant lock for thread safety
         self.sequence_counter = 0
         self.text_lookup = {}  # For quick duplicate detection
+        labels = instance_labels()
+        self.gauges = [
+            registry.gauge(
+                "text.buffer.segments",
+                "Segments held in the text buffer",
+                callback=lambda: len(self.buffer),
+                labels=labels,
+            ),
+            registry.gauge(
+                "text.buffer.lookup_size",
+                "Entries in the duplicate lookup",
+                callback=lambda: len(self.text_lookup),
+                labels=labels,
+            ),
+        ]
 
     def add_segment(self, text: str) -> TextSegment:
         """Add a new text segment to the buffer."""
@@ -38,7 +61,10 @@ class TextBuffer:
 
             # Create new segment
             segment = TextSegment(
-                text=text, timestamp=time.time(), sequence=self.sequence_counter, processed=False
+                text=text,
+                timestamp=self.clock.time(),
+                sequence=self.sequence_counter,
+                processed=False,
             )
             self.sequence_counter += 1
 
@@ -60,6 +86,7 @@ class TextBuffer:
         with self.lock:
             # Normalize text for comparison
             normalized_text = " ".join(text.lower().split())
+            current_time = self.clock.time()
 
             # Direct match
             if normalized_text in self.text_lookup:
@@ -68,7 +95,7 @@ class TextBuffer:
             # Substring match (both ways)
             for existing_text, segment in self.text_lookup.items():
                 # Skip old segments
-                if time.time() - segment.timestamp > self.max_age:
+                if current_time - segment.timestamp > self.max_age:
                     continue
 
                 # Check if this text is a substring of existing text
@@ -92,7 +119,7 @@ class TextBuffer:
             if max_age is None:
                 max_age = self.max_age
 
-            current_time = time.time()
+            current_time = self.clock.time()
             result = []
 
             # Get segments in chronological order (oldest first)
@@ -123,10 +150,14 @@ class TextBuffer:
             self.buffer.clear()
             self.text_lookup.clear()
 
+    def close(self):
+        """Unregister the buffer's gauges."""
+        registry.unregister(*self.gauges)
+
     def _cleanup_old_segments(self):
         """Remove segments that exceed the maximum age."""
         with self.lock:
-            current_time = time.time()
+            current_time = self.clock.time()
             to_remove = []
 
             for text, segment in self.text_lookup.items():
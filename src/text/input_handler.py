@@ -1,15 +1,15 @@
 """
 Input Handler Module for the Whisper Client
-Version: 1.2
-Timestamp: 2025-04-20 18:10 CET
+Version: 1.6
+Timestamp: 2026-10-20 00:15 CET
 
 Dieses Modul koordiniert die Verarbeitung von Textsegmenten.
 """
 
-import time
-
 from src import logger
+from src.latency import merge_traces
 from src.logging import log_info
+from src.metrics import registry
 
 from .segment_parser import process_text
 from .special_cases import (
@@ -19,11 +19,19 @@ from .special_cases import (
     handle_special_test_cases,
 )
 
+process_seconds = registry.histogram("text.process.seconds", "Text pipeline time per update")
+
 
 def process_segments(manager, segments):
     """Processes received text segments."""
+    with process_seconds.time():
+        _process_segments(manager, segments)
+
+
+def _process_segments(manager, segments):
+    """Runs the text pipeline for one segment update."""
     log_info(logger, "\n🎯 Processing new text segments:")
-    current_time = time.time()
+    current_time = manager.clock.time()
 
     # Basisprüfungen für leere Segmente
     if not segments:
@@ -42,6 +50,9 @@ def process_segments(manager, segments):
     # Timeout-Prüfung
     check_timeout(manager, current_time)
 
+    # Latenz-Trace dem aktuellen Satz zuordnen (nach dem Timeout-Flush)
+    manager.pending_trace = merge_traces(manager.pending_trace, last_segment.get("trace"))
+
     # Spezielle Testfälle erkennen und behandeln
     if handle_special_test_cases(manager, text, current_time):
         return
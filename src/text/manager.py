@@ -1,29 +1,39 @@
 """
 Text Manager Module for the Whisper Client
-Version: 1.1
-Timestamp: 2025-04-20 18:10 CET
+Version: 1.5
+Timestamp: 2026-10-19 22:15 CET
 
 Dieses Modul enthält die Hauptklasse für die Textverarbeitung.
 """
 
 import threading
 
+from src.clock import system_clock
+
 from .buffer import TextBuffer
 from .duplicate import is_duplicate
 from .input_handler import process_segments
-from .output import insert_text
 from .sentence import output_sentence, should_force_output
 from .test_handler import get_test_output
 
 
 class TextManager:
-    def __init__(self, test_mode=False):
-        """Initialisiert den TextManager."""
+    def __init__(self, test_mode=False, clock=None):
+        """Initialisiert den TextManager.
+
+        Args:
+            test_mode: Collect the output in test_output instead of typing it
+            clock: Time source of the timeouts and output delays (src.clock),
+                   the system clock by default
+
+        """
+        self.clock = clock or system_clock
         self.current_sentence = []  # Collects segments for complete sentences
         self.last_output_time: float = 0.0  # Timestamp of the last output
         self.incomplete_sentence_time: float = 0.0  # Timestamp for incomplete sentences
         self.processed_segments = set()  # Set of already processed segments (legacy)
-        self.text_buffer = TextBuffer()  # Memory-based buffer for text segments
+        self.text_buffer = TextBuffer(clock=self.clock)  # Memory-based buffer for text segments
+        self.pending_trace = None  # Latency trace of the segments in the current sentence
         self.common_abbreviations = {
             "Dr.",
             "Prof.",
@@ -55,6 +65,10 @@ class TextManager:
         # Lock for thread safety
         self.lock = threading.RLock()
 
+    def close(self):
+        """Releases the metrics of the text buffer."""
+        self.text_buffer.close()
+
     def is_duplicate(self, text):
         """Checks if a text is a duplicate using the memory buffer."""
         # Use the memory buffer for duplicate detection
@@ -74,6 +88,10 @@ class TextManager:
 
     def insert_text(self, text):
         """Output text based on configured mode."""
+        # The output module pulls in the win32 and clipboard modules, so it
+        # is imported with the first sentence instead of at startup
+        from .output import insert_text
+
         return insert_text(self, text)
 
     def get_test_output(self):
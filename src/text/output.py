@@ -1,7 +1,7 @@
 """
 Text Output Module for the Whisper Client
-Version: 1.2
-Timestamp: 2025-04-20 16:41 CET
+Version: 1.5
+Timestamp: 2026-10-20 00:15 CET
 
 Dieses Modul enthält Funktionen zur Textausgabe, einschließlich SendMessage API
 Integration und Zwischenablage-Operationen.
@@ -18,10 +18,14 @@ import win32gui
 import config
 from src import logger
 from src.logging import log_debug, log_error, log_info, log_warning
+from src.metrics import registry
 
 from .test_handler import handle_test_mode_output
 from .window import find_vscode_edit_control
 
+output_sentences = registry.counter("text.output.sentences", "Sentences handed to the output")
+output_seconds = registry.histogram("text.output.seconds", "Text insertion time")
+
 
 def send_message(hwnd, text):
     """Sends text to a window using the SendMessage API."""
@@ -106,10 +110,14 @@ def send_text_to_prompt(text):
 
 def insert_text(manager, text):
     """Output text based on configured mode."""
-    try:
-        # Save text for tests
-        manager.test_output.append(text)
+    output_sentences.inc()
+    with output_seconds.time():
+        _insert_text(manager, text)
 
+
+def _insert_text(manager, text):
+    """Inserts text using the configured output mode."""
+    try:
         # In test mode, only capture the output without actually inserting it
         if handle_test_mode_output(manager, text):
             return
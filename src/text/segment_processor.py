@@ -1,13 +1,11 @@
 """
 Segment Processor Module for the Whisper Client
-Version: 1.1
-Timestamp: 2025-04-20 16:41 CET
+Version: 1.2
+Timestamp: 2026-10-19 17:10 CET
 
 Dieses Modul enthält Funktionen zur Verarbeitung einzelner Textsegmente.
 """
 
-import time
-
 import config
 from src import logger
 from src.logging import log_info
@@ -51,7 +49,7 @@ def process_single_sentence(manager, sentence, current_time):
         # Nur warten, wenn nötig
         wait_time = config.MIN_OUTPUT_INTERVAL - (current_time - manager.last_output_time)
         if wait_time > 0:
-            time.sleep(wait_time)
+            manager.clock.sleep(wait_time)
         manager.output_sentence(current_time)
 
 
@@ -1,14 +1,13 @@
 """
 Sentence Processing Module for the Whisper Client
-Version: 1.1
-Timestamp: 2025-04-20 18:11 CET
+Version: 1.3
+Timestamp: 2026-10-19 17:10 CET
 
 Dieses Modul enthält Funktionen zur Satzverarbeitung und -ausgabe.
 """
 
-import time
-
 import config
+from src.latency import latency_tracker
 
 from .processing import format_sentence
 
@@ -19,7 +18,7 @@ def output_sentence(manager, current_time=None):
         return
 
     if current_time is None:
-        current_time = time.time()
+        current_time = manager.clock.time()
 
     # Join all segments, preserving special punctuation
     joined_text = " ".join(manager.current_sentence)
@@ -34,6 +33,11 @@ def output_sentence(manager, current_time=None):
     # Output the text
     manager.insert_text(complete_text)
 
+    # Record capture-to-screen latency for this sentence
+    if manager.pending_trace is not None:
+        latency_tracker.record_sentence(complete_text, manager.pending_trace)
+        manager.pending_trace = None
+
     # Add to buffer as a processed segment
     with manager.lock:
         segment = manager.text_buffer.add_segment(joined_text)
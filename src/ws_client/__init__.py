@@ -1,7 +1,7 @@
 """
 WebSocket Package for the Whisper Client
-Version: 1.2
-Timestamp: 2025-04-20 14:10 CET
+Version: 1.6
+Timestamp: 2026-10-19 21:40 CET
 
 This package provides WebSocket communication functionality for the Whisper Client.
 It includes classes and functions for establishing connections, sending audio data,
@@ -15,24 +15,54 @@ The package has been refactored into multiple modules for better maintainability
 - state_management.py: Functions for managing WebSocket connection states
 - cleanup.py: Functions for cleaning up WebSocket resources
 - connection.py: Connection utilities and management
+- aggregator.py: Coalescing of audio windows into larger frames
+- heartbeat.py: Ping/pong round trip times and dead-peer detection
+- replay.py: Unconfirmed audio resent after a reconnect
 - error_handling.py: Error handling utilities
 - messaging.py: Message processing and sending utilities
 - state.py: Connection state definitions
+
+The exported names are imported on first access, so "import src.ws_client"
+loads neither websocket-client nor the win32 clipboard module.
 """
 
-# For backward compatibility, re-export any previously public functions
-from .connection import (
-    ConnectionManager,
-    create_websocket_app,
-    generate_client_id,
-    generate_session_id,
-)
-from .error_handling import handle_connection_close, handle_connection_error, wait_with_timeout
+from typing import TYPE_CHECKING
+
+from src.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    # For backward compatibility, re-export any previously public functions
+    from .aggregator import FrameAggregator
+    from .connection import (
+        ConnectionManager,
+        create_websocket_app,
+        generate_client_id,
+        generate_session_id,
+    )
+    from .error_handling import handle_connection_close, handle_connection_error, wait_with_timeout
 
-# Export the main class and important types
-from .manager import WhisperWebSocket
-from .messaging import process_message, send_audio_data, send_config, send_end_of_audio
-from .state import ConnectionState
+    # Export the main class and important types
+    from .manager import WhisperWebSocket
+    from .messaging import process_message, send_audio_data, send_config, send_end_of_audio
+    from .state import ConnectionState
+
+# Exported name -> submodule that defines it
+_LAZY_EXPORTS = {
+    "WhisperWebSocket": ".manager",
+    "ConnectionState": ".state",
+    "ConnectionManager": ".connection",
+    "FrameAggregator": ".aggregator",
+    "create_websocket_app": ".connection",
+    "generate_client_id": ".connection",
+    "generate_session_id": ".connection",
+    "handle_connection_close": ".error_handling",
+    "handle_connection_error": ".error_handling",
+    "wait_with_timeout": ".error_handling",
+    "process_message": ".messaging",
+    "send_audio_data": ".messaging",
+    "send_config": ".messaging",
+    "send_end_of_audio": ".messaging",
+}
 
 __all__ = [
     # Main class
@@ -40,6 +70,7 @@ __all__ = [
     # Important types
     "ConnectionState",
     "ConnectionManager",
+    "FrameAggregator",
     # Connection utilities
     "create_websocket_app",
     "generate_client_id",
@@ -54,3 +85,5 @@ __all__ = [
     "send_config",
     "send_end_of_audio",
 ]
+
+__getattr__ = lazy_exports(__name__, _LAZY_EXPORTS)
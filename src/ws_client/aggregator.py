@@ -0,0 +1,144 @@
+"""
+WebSocket Frame Aggregation Module
+Version: 1.2
+Timestamp: 2026-10-19 23:35 CET
+
+This module coalesces audio windows into larger WebSocket frames. Every
+window of the tumbling window is only a few kilobytes, and sending each one
+as its own frame costs a ws.send, a timing measurement and a log line in the
+client, and a message dispatch in the server, roughly ten times per second.
+
+The FrameAggregator collects windows until either target_bytes are buffered
+or the oldest buffered window has waited max_delay seconds, whichever comes
+first, and then sends them as one frame. target_bytes and max_delay are the
+tradeoff between per-message CPU and the latency the aggregation adds. The
+deadline is kept by a background thread, so a partial frame is also sent
+when no further window arrives; flush() sends the buffered audio at once,
+e.g. before END_OF_AUDIO.
+
+Windows are appended to one bytearray, which is sent as it is and replaced
+by a new one, so a frame is assembled with a single copy of each window. The
+windows arrive as bytes the AudioProcessor already copied out of its window
+buffer; frame aggregation saves the join of separate parts, not that copy.
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+import config
+from src.metrics import registry
+
+aggregated_windows = registry.counter("ws.aggregate.windows", "Audio windows coalesced into frames")
+
+
+class FrameAggregator:
+    """Coalesces audio windows into frames of a target size or age."""
+
+    def __init__(
+        self,
+        send: Callable[[bytes, Optional[float]], bool],
+        target_bytes=config.WS_AGGREGATE_BYTES,
+        max_delay=config.WS_AGGREGATE_MAX_DELAY,
+    ):
+        """Initialize the aggregator.
+
+        Args:
+            send: Sends one frame; called with the payload and the capture
+                  time of its last window, returns True on success
+            target_bytes: Send as soon as this many bytes are buffered
+            max_delay: Send at the latest this many seconds after the first
+                       buffered window arrived
+
+        """
+        self.send = send
+        self.target_bytes = target_bytes
+        self.max_delay = max_delay
+        self.buffer = bytearray()
+        self.capture_time: Optional[float] = None
+        self.first_time = 0.0
+        self.condition = threading.Condition()
+        # Keeps frames in order when the caller and the deadline thread send
+        self.send_lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
+        self.closed = False
+
+    def add(self, data, capture_time=None):
+        """Buffers a window and sends the frame once it is full.
+
+        Returns:
+            False if sending a frame failed, True otherwise
+
+        """
+        with self.condition:
+            if not self.buffer:
+                self.first_time = time.perf_counter()
+            self.buffer += data
+            self.capture_time = capture_time
+            aggregated_windows.inc()
+            full = len(self.buffer) >= self.target_bytes
+            if not full:
+                self._ensure_thread()
+                self.condition.notify()
+        return self.flush() if full else True
+
+    def _take(self):
+        """Returns the buffered frame and empties the buffer (lock held)."""
+        if not self.buffer:
+            return None
+        # The frame is handed over, not copied; the next window starts a new buffer
+        frame = self.buffer
+        capture_time = self.capture_time
+        self.buffer = bytearray()
+        self.capture_time = None
+        return frame, capture_time
+
+    def flush(self):
+        """Sends the buffered windows as one frame.
+
+        Returns:
+            False if sending failed, True otherwise (also if nothing was buffered)
+
+        """
+        with self.send_lock:
+            with self.condition:
+                frame = self._take()
+            if frame is None:
+                return True
+            return self.send(*frame)
+
+    @property
+    def size(self):
+        """Buffered bytes."""
+        return len(self.buffer)
+
+    def _ensure_thread(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.closed = False
+            self.thread = threading.Thread(target=self._run, name="FrameAggregator")
+            self.thread.daemon = True
+            self.thread.start()
+
+    def _run(self):
+        """Sends partial frames whose deadline has passed."""
+        while True:
+            with self.condition:
+                while not self.closed and not self.buffer:
+                    self.condition.wait()
+                if self.closed:
+                    return
+                remaining = self.first_time + self.max_delay - time.perf_counter()
+                if remaining > 0:
+                    self.condition.wait(remaining)
+                    continue
+            self.flush()
+
+    def close(self):
+        """Sends the buffered windows and stops the deadline thread."""
+        self.flush()
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        if self.thread is not None:
+            self.thread.join(timeout=config.THREAD_TIMEOUT)
+            self.thread = None
@@ -1,7 +1,7 @@
 """
 WebSocket Callbacks Module
-Version: 1.2
-Timestamp: 2025-04-20 18:12 CET
+Version: 1.8
+Timestamp: 2026-10-19 23:55 CET
 
 This module contains callback functions for WebSocket events.
 """
@@ -9,8 +9,11 @@ This module contains callback functions for WebSocket events.
 from src import logger
 from src.logging import log_error
 
+from .connection_management import connection_lost, start_reconnect
 from .error_handling import handle_connection_close, handle_connection_error
+from .heartbeat import handle_dead_peer, is_dead_peer
 from .messaging import process_message, send_config
+from .replay import ACTIVE_STATES
 from .state import ConnectionState
 
 
@@ -22,12 +25,20 @@ def on_open(ws_instance, ws):
 
 def on_message(ws_instance, ws, message):
     """Callback for incoming server messages with enhanced error handling."""
+    if ws_instance.recorder:
+        ws_instance.recorder.record(message)
+
     if not ws_instance.processing_enabled:
         return
 
     try:
         message_type, text = process_message(
-            message, ws_instance.on_text_callback, ws_instance.processing_enabled
+            message,
+            ws_instance.on_text_callback,
+            ws_instance.processing_enabled,
+            timeline=ws_instance.timeline,
+            session_id=ws_instance.session_id,
+            replay=ws_instance.replay,
         )
 
         if message_type == "SERVER_READY":
@@ -49,6 +60,13 @@ def on_message(ws_instance, ws, message):
 
 def on_error(ws_instance, ws, error):
     """Callback for WebSocket errors with enhanced logging."""
+    if is_dead_peer(ws_instance, error):
+        handle_dead_peer(ws_instance, ws)
+        connection_lost(ws_instance)
+    elif ws_instance.state in ACTIVE_STATES:
+        # Exceptions raised in callbacks end up here too and leave the socket
+        # open, so the audio is only held once on_close reports the socket gone
+        ws_instance.reconnect_pending = True
     handle_connection_error(
         error,
         ws_instance.state,
@@ -63,5 +81,9 @@ def on_error(ws_instance, ws, error):
 def on_close(ws_instance, ws, close_status_code, close_msg):
     """Callback when WebSocket connection is closed."""
     handle_connection_close(close_status_code, close_msg)
+    # The server may also close a session in use without an error
+    connection_lost(ws_instance)
     ws_instance._set_state(ConnectionState.CLOSED)
     ws_instance.server_ready = False
+    # A connection lost during a recording is replaced by a new one
+    start_reconnect(ws_instance)
@@ -1,7 +1,7 @@
 """
 WebSocket Cleanup Module
-Version: 1.1
-Timestamp: 2025-04-20 16:48 CET
+Version: 1.5
+Timestamp: 2026-10-19 22:50 CET
 
 This module contains functions for cleaning up WebSocket resources.
 """
@@ -30,6 +30,12 @@ def handle_instance_deletion(client_id):
 
 def perform_cleanup(ws_instance):
     """Release resources with enhanced timeout handling and logging."""
+    if ws_instance.recorder:
+        ws_instance.recorder.stop()
+    if ws_instance.aggregator is not None:
+        ws_instance.aggregator.close()
+    if ws_instance.replay is not None:
+        ws_instance.replay.close()
     if not ws_instance.ws:
         return
 
@@ -40,8 +46,9 @@ def perform_cleanup(ws_instance):
         # Set a timeout for the entire cleanup operation
         cleanup_timeout = config.WS_CLEANUP_TIMEOUT
 
-        # Disable processing
+        # Disable processing; closing on purpose is no lost connection
         ws_instance.processing_enabled = False
+        ws_instance.reconnect_pending = False
 
         # Close WebSocket connection
         if ws_instance.ws and ws_instance.ws.sock:
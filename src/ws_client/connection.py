@@ -1,7 +1,7 @@
 """
 WebSocket Connection Module for the Whisper Client
-Version: 1.3
-Timestamp: 2025-04-20 18:13 CET
+Version: 1.5
+Timestamp: 2026-10-19 21:10 CET
 
 This module handles the core connection functionality for the WebSocket client,
 including connection establishment, reconnection logic, and instance tracking.
@@ -45,6 +45,12 @@ class ConnectionManager:
         with cls._instances_lock:
             return len(cls._active_instances)
 
+    @classmethod
+    def get_instances(cls):
+        """Returns a list of the active WebSocket instances."""
+        with cls._instances_lock:
+            return list(cls._active_instances.values())
+
     @classmethod
     def cleanup_all_instances(cls):
         """Cleanup all active WebSocket instances with proper timeout
@@ -96,7 +102,7 @@ class ConnectionManager:
             )
 
 
-def create_websocket_app(url, on_open, on_message, on_error, on_close):
+def create_websocket_app(url, on_open, on_message, on_error, on_close, on_pong=None):
     """Creates a WebSocketApp instance."""
     return websocket.WebSocketApp(
         url,
@@ -104,6 +110,7 @@ def create_websocket_app(url, on_open, on_message, on_error, on_close):
         on_message=on_message,
         on_error=on_error,
         on_close=on_close,
+        on_pong=on_pong,
     )
 
 
@@ -1,7 +1,7 @@
 """
 WebSocket Connection Management Module
-Version: 1.1
-Timestamp: 2025-04-20 17:12 CET
+Version: 1.10
+Timestamp: 2026-10-19 22:50 CET
 
 This module contains functions for managing WebSocket connections.
 """
@@ -12,10 +12,63 @@ import time
 import config
 from src import logger
 from src.logging import log_connection, log_error
+from src.metrics import registry
 
 from .connection import create_websocket_app, generate_session_id
+from .heartbeat import run_forever_options
+from .replay import ACTIVE_STATES
 from .state import ConnectionState
 
+connect_attempts = registry.counter("ws.connect.attempts", "Connection attempts incl. retries")
+connect_failures = registry.counter("ws.connect.failures", "Failed connection attempts")
+reconnects = registry.counter("ws.reconnects", "Successful connections after the first one")
+connect_seconds = registry.histogram("ws.connect.seconds", "Time to establish a connection")
+
+
+def connection_lost(ws_instance):
+    """Marks a connection lost during a recording for reconnect and replay.
+
+    Called once the socket is gone: on close, on a dead peer or a failed send.
+    An error reported during the recording (reconnect_pending) counts as well,
+    since it has already moved the state to CONNECT_ERROR.
+    """
+    if ws_instance.state not in ACTIVE_STATES and not ws_instance.reconnect_pending:
+        # Closed on purpose, or not in use yet
+        return
+    ws_instance.reconnect_pending = True
+    if ws_instance.replay is not None:
+        ws_instance.replay.hold()
+
+
+def start_reconnect(ws_instance):
+    """Reconnects in the background after the WebSocket thread has ended."""
+    if not ws_instance.reconnect_pending:
+        return
+    ws_instance.reconnect_pending = False
+    thread = threading.Thread(
+        target=reconnect,
+        args=(ws_instance, ws_instance.ws_thread),
+        name=f"WebSocketReconnect-{ws_instance.client_id[:8]}",
+    )
+    thread.daemon = True
+    thread.start()
+
+
+def reconnect(ws_instance, ws_thread):
+    """Establishes a new connection after a lost one."""
+    if ws_thread is not None and ws_thread is not threading.current_thread():
+        ws_thread.join(timeout=config.WS_THREAD_TIMEOUT)
+    log_connection(logger, "Reconnecting after lost connection...")
+    try:
+        ws_instance.connect()
+    except Exception as e:
+        log_error(logger, "Reconnect after lost connection failed: %s", e)
+        # Leave further attempts to the regular reconnect of the main loop
+        ws_instance._set_state(
+            ConnectionState.DISCONNECTED,
+            only_from=(ConnectionState.CONNECT_ERROR, ConnectionState.TIMEOUT_ERROR),
+        )
+
 
 def cleanup_previous_connection(ws_instance):
     """Cleans up the previous WebSocket connection if it exists."""
@@ -34,16 +87,22 @@ def initialize_and_start_websocket(ws_instance):
     """Initializes and starts the WebSocketApp and its thread."""
     log_connection(
         logger,
-        f"Connecting to server: {config.WS_URL} (Client: {ws_instance.client_id}, Session: {ws_instance.session_id})",
+        f"Connecting to server: {ws_instance.url} (Client: {ws_instance.client_id}, Session: {ws_instance.session_id})",
     )
     ws_instance.ws = create_websocket_app(
-        config.WS_URL,
+        ws_instance.url,
         on_open=ws_instance._on_open,
         on_message=ws_instance._on_message,
         on_error=ws_instance._on_error,
         on_close=ws_instance._on_close,
+        on_pong=ws_instance._on_pong,
+    )
+    ws_instance.ws_thread = threading.Thread(
+        target=ws_instance.ws.run_forever,
+        # Heartbeat pings detect a dead connection (see heartbeat.py)
+        kwargs=run_forever_options(ws_instance.ping_interval, ws_instance.ping_timeout),
+        name=f"WebSocket-{ws_instance.client_id[:8]}",
     )
-    ws_instance.ws_thread = threading.Thread(target=ws_instance.ws.run_forever)
     ws_instance.ws_thread.daemon = True
     ws_instance.ws_thread.start()
 
@@ -57,7 +116,8 @@ def wait_for_socket_connection(ws_instance):
             raise TimeoutError(f"Connection timeout after {config.WS_CONNECT_TIMEOUT}s")
         ws_instance._log_state_periodically("connect_wait")
         time.sleep(config.WS_POLL_INTERVAL)
-    ws_instance._set_state(ConnectionState.CONNECTED)
+    # SERVER_READY may already have arrived while polling; don't step back from READY
+    ws_instance._set_state(ConnectionState.CONNECTED, only_from=(ConnectionState.CONNECTING,))
 
 
 def wait_for_server_ready(ws_instance):
@@ -98,31 +158,43 @@ def connect_to_server(ws_instance, max_retries=3):
     ws_instance.last_connection_attempt = time.time()
     connect_start_time: float = ws_instance.last_connection_attempt
 
-    # Generate new session ID for this connection attempt
+    # Generate new session ID for this connection attempt; the server starts
+    # a new audio stream, so the latency timeline starts over as well
     ws_instance.session_id = generate_session_id()
+    ws_instance.timeline.reset()
     log_connection(logger, f"Starting connection attempt with session ID: {ws_instance.session_id}")
 
     retry_count = 0
     retry_delay = config.WS_RETRY_DELAY
 
     while retry_count < max_retries:
+        connect_attempts.inc()
         try:
             # 1. Cleanup previous connection
             cleanup_previous_connection(ws_instance)
-
-            # 2. Set state and initialize WebSocket
+            # The cleanup ends the previous recording, so start the new one afterwards
+            if ws_instance.recorder and not ws_instance.recorder.active:
+                ws_instance.recorder.start(ws_instance.client_id, ws_instance.session_id)
+
+            # 2. Set state and initialize WebSocket. Processing is enabled
+            # before the socket opens: after stop_processing() it is still
+            # disabled and a fast SERVER_READY would otherwise be dropped
+            ws_instance.processing_enabled = True
             ws_instance._set_state(ConnectionState.CONNECTING)
             initialize_and_start_websocket(ws_instance)
 
             # 3. Wait for socket connection
             wait_for_socket_connection(ws_instance)
-            ws_instance.processing_enabled = True  # Enable processing after successful connection
 
             # 4. Wait for server ready signal
             wait_for_server_ready(ws_instance)
 
             # Connection successful
             total_connect_time = time.time() - connect_start_time
+            connect_seconds.record(total_connect_time)
+            if ws_instance.connection_count:
+                reconnects.inc()
+            ws_instance.connection_count += 1
             log_connection(
                 logger, f"Connection established successfully in {total_connect_time:.2f}s"
             )
@@ -130,6 +202,7 @@ def connect_to_server(ws_instance, max_retries=3):
 
         except Exception as e:
             retry_count += 1
+            connect_failures.inc()
             if ws_instance.state != ConnectionState.TIMEOUT_ERROR:
                 ws_instance._set_state(ConnectionState.CONNECT_ERROR)
             ws_instance.server_ready = False
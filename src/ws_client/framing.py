@@ -0,0 +1,111 @@
+"""
+WebSocket Framing Module
+Version: 1.0
+Timestamp: 2026-10-19 20:55 CET
+
+This module writes binary audio frames without intermediate copies.
+websocket-client builds every frame with ABNF.format(): the payload is
+converted and masked into new bytes objects and concatenated with the header,
+several copies per frame. send_binary() instead writes the header into a
+reusable per-thread output buffer and masks the payload from the caller's
+buffer (bytes, bytearray, memoryview or numpy array) straight into it, four
+bytes at a time, so the payload is read once and written once. The buffer is
+then sent through the connection's own send path and lock, so frames of other
+threads (END_OF_AUDIO, close, pings) are not interleaved.
+
+If the connection does not offer that send path (other websocket-client
+versions), the frame is sent with ws.send() as before.
+"""
+
+import os
+import struct
+import threading
+
+import numpy as np
+
+import websocket
+
+# Output buffers are reused per sending thread; frames of concurrent
+# connections in other threads (load test) never share one
+_local = threading.local()
+
+MAX_HEADER = 14  # 2 bytes + 8 byte extended length + 4 byte mask key
+
+
+def _output_buffer(size):
+    buffer = getattr(_local, "buffer", None)
+    if buffer is None or len(buffer) < size:
+        # Grow geometrically so a slowly growing frame size does not reallocate every time
+        buffer = bytearray(max(size, 2 * len(buffer) if buffer else size))
+        _local.buffer = buffer
+    return buffer
+
+
+def _write_header(out, length, mask_key):
+    """Writes a FIN + binary, masked frame header; returns its length."""
+    out[0] = 0x80 | websocket.ABNF.OPCODE_BINARY
+    if length < 126:
+        out[1] = 0x80 | length
+        offset = 2
+    elif length < 1 << 16:
+        out[1] = 0x80 | 126
+        struct.pack_into("!H", out, 2, length)
+        offset = 4
+    else:
+        out[1] = 0x80 | 127
+        struct.pack_into("!Q", out, 2, length)
+        offset = 10
+    out[offset : offset + 4] = mask_key
+    return offset + 4
+
+
+def mask_into(payload, mask_key, out, offset):
+    """XORs the payload with the mask key into out[offset:], without copies."""
+    data = np.frombuffer(payload, dtype=np.uint8)
+    length = len(data)
+    words = length // 4
+    target = np.frombuffer(out, dtype=np.uint8, count=length, offset=offset)
+    if words:
+        key = np.frombuffer(mask_key, dtype=np.uint32)[0]
+        np.bitwise_xor(
+            data[: words * 4].view(np.uint32),
+            key,
+            out=target[: words * 4].view(np.uint32),
+        )
+    for index in range(words * 4, length):
+        target[index] = data[index] ^ mask_key[index % 4]
+
+
+def format_binary_frame(payload, mask_key=None):
+    """Builds a masked binary frame in the thread's output buffer.
+
+    Returns:
+        memoryview of the frame; valid until the thread builds the next frame
+
+    """
+    view = memoryview(payload).cast("B")
+    length = view.nbytes
+    mask_key = mask_key or os.urandom(4)
+    out = _output_buffer(MAX_HEADER + length)
+    offset = _write_header(out, length, mask_key)
+    mask_into(view, mask_key, out, offset)
+    return memoryview(out)[: offset + length]
+
+
+def send_binary(ws, payload):
+    """Sends a binary frame on a WebSocketApp without copying the payload."""
+    sock = getattr(ws, "sock", None)
+    lock = getattr(sock, "lock", None)
+    send = getattr(sock, "_send", None)
+    if not isinstance(sock, websocket.WebSocket) or lock is None or send is None:
+        ws.send(bytes(payload), websocket.ABNF.OPCODE_BINARY)
+        return
+    if not sock.connected:
+        raise websocket.WebSocketConnectionClosedException("Connection is already closed.")
+
+    get_mask_key = getattr(sock, "get_mask_key", None)
+    frame = format_binary_frame(payload, get_mask_key(4) if get_mask_key else None)
+    with lock:
+        while frame:
+            sent = send(frame)
+            frame = frame[sent:]
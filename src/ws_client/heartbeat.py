@@ -0,0 +1,87 @@
+"""
+WebSocket Heartbeat Module
+Version: 1.2
+Timestamp: 2026-10-19 23:55 CET
+
+This module detects dead connections. Without traffic from the server a
+half-open TCP connection (VPN drop, laptop sleep) is only noticed when a send
+eventually fails, which can take minutes while audio is sent into the void.
+
+The WebSocketApp sends a ping every ping_interval seconds (WS_PING_INTERVAL)
+and fails the connection with a WebSocketTimeoutException when the pong has
+not arrived within ping_timeout seconds (WS_PING_TIMEOUT), so a dead peer is
+detected after at most ping_interval + ping_timeout seconds. The round trip
+time of every ping is recorded (ws.heartbeat.rtt_seconds).
+
+Connect, handshake and socket timeouts raise the same
+WebSocketTimeoutException, so an error only counts as a dead peer if it is
+the ping/pong timeout of an established connection.
+
+On a dead peer the socket is shut down without the closing handshake, which
+would only wait for the dead server. Like any connection lost during a
+recording, it is then replaced in the background (see
+connection_management.start_reconnect).
+"""
+
+import websocket
+from src import logger
+from src.logging import log_warning
+from src.metrics import registry
+
+from .state import ConnectionState
+
+rtt_seconds = registry.histogram("ws.heartbeat.rtt_seconds", "Ping/pong round trip time")
+last_rtt = registry.gauge("ws.heartbeat.rtt_last_seconds", "Round trip time of the last ping")
+dead_peers = registry.counter("ws.heartbeat.dead_peers", "Connections failed by missing pongs")
+
+# Message of the WebSocketApp's WebSocketTimeoutException for a missing pong
+PING_TIMEOUT_MESSAGE = "ping/pong timed out"
+
+# States of an established connection, on which the heartbeat pings
+ESTABLISHED_STATES = (
+    ConnectionState.CONNECTED,
+    ConnectionState.READY,
+    ConnectionState.PROCESSING,
+    ConnectionState.FINALIZING,
+)
+
+
+def run_forever_options(ping_interval, ping_timeout):
+    """Returns the heartbeat arguments for WebSocketApp.run_forever()."""
+    if not ping_interval:
+        return {}
+    return {"ping_interval": ping_interval, "ping_timeout": ping_timeout or None}
+
+
+def on_pong(ws_instance, ws):
+    """Records the round trip time of the last ping."""
+    if not ws.last_ping_tm:
+        return
+    rtt = ws.last_pong_tm - ws.last_ping_tm
+    if rtt >= 0:
+        ws_instance.last_rtt = rtt
+        last_rtt.set(rtt)
+        rtt_seconds.record(rtt)
+
+
+def is_dead_peer(ws_instance, error):
+    """True if the error is the WebSocketApp's ping/pong timeout."""
+    if not isinstance(error, websocket.WebSocketTimeoutException):
+        return False
+    if not ws_instance.ping_interval or ws_instance.state not in ESTABLISHED_STATES:
+        return False
+    # WebSocketApp clears its ping and pong times before it reports the error,
+    # so its ping/pong timeout is told from socket timeouts by the message
+    return PING_TIMEOUT_MESSAGE in str(error)
+
+
+def handle_dead_peer(ws_instance, ws):
+    """Shuts the dead connection down."""
+    dead_peers.inc()
+    log_warning(
+        logger,
+        "⚠️ No pong from server within %.1fs - connection is dead",
+        ws_instance.ping_timeout,
+    )
+    if ws.sock:
+        ws.sock.shutdown()
@@ -1,7 +1,7 @@
 """
 WebSocket Manager Module
-Version: 1.1
-Timestamp: 2025-04-20 18:06 CET
+Version: 1.11
+Timestamp: 2026-10-19 23:05 CET
 
 This module contains the main WhisperWebSocket class that manages the WebSocket
 connection to the WhisperLive server.
@@ -11,8 +11,11 @@ import threading
 
 import config
 from src import logger
+from src.latency import AudioTimeline
 from src.logging import log_connection
+from src.recording import SessionRecorder
 
+from .aggregator import FrameAggregator
 from .callbacks import on_close, on_error, on_message, on_open
 from .cleanup import handle_instance_deletion, perform_cleanup
 from .connection import ConnectionManager, generate_client_id, generate_session_id
@@ -23,12 +26,15 @@ from .connection_management import (
     wait_for_server_ready,
     wait_for_socket_connection,
 )
+from .heartbeat import on_pong
 from .processing import (
+    replay_audio,
     send_audio_data,
     send_end_of_audio_signal,
     start_message_processing,
     stop_message_processing,
 )
+from .replay import ReplayBuffer
 from .state import ConnectionState
 from .state_management import log_state_periodically, set_connection_state
 
@@ -36,7 +42,33 @@ from .state_management import log_state_periodically, set_connection_state
 class WhisperWebSocket:
     """WebSocket client for communication with the WhisperLive server."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        url=None,
+        aggregate_bytes=None,
+        ping_interval=None,
+        ping_timeout=None,
+        replay_seconds=None,
+    ):
+        # Server URL (defaults to config.WS_URL, tests point this at a fake server)
+        self.url = url or config.WS_URL
+        # Heartbeat: ping interval and dead-peer timeout in seconds (see heartbeat.py)
+        self.ping_interval = config.WS_PING_INTERVAL if ping_interval is None else ping_interval
+        self.ping_timeout = config.WS_PING_TIMEOUT if ping_timeout is None else ping_timeout
+        self.last_rtt = None  # Round trip time of the last ping in seconds
+        self.reconnect_pending = False  # Set when a lost connection is to be replaced
+        # Unconfirmed audio, resent after a reconnect (None = off, see replay.py)
+        if replay_seconds is None:
+            replay_seconds = config.WS_REPLAY_SECONDS
+        self.replay = ReplayBuffer(max_seconds=replay_seconds) if replay_seconds > 0 else None
+        # Audio windows are coalesced into frames of this size (0 = one frame per window)
+        if aggregate_bytes is None:
+            aggregate_bytes = config.WS_AGGREGATE_BYTES
+        self.aggregator = (
+            FrameAggregator(self._send_frame, target_bytes=aggregate_bytes)
+            if aggregate_bytes > 0
+            else None
+        )
         # Generate a persistent client ID that remains the same across reconnections
         self.client_id = generate_client_id()
         # Session ID changes with each new connection attempt
@@ -46,26 +78,33 @@ class WhisperWebSocket:
         self.state = ConnectionState.DISCONNECTED
         self.server_ready = False
         self.on_text_callback = None
+        self.on_replay_callback = None  # Called before audio is replayed after a reconnect
         self.processing_enabled = True
         self.current_text = ""  # Stores the current text
         self.connection_lock = threading.Lock()  # Lock for thread-safe state changes
+        # Serializes connection attempts of the main loop and the heartbeat reconnect
+        self.connect_lock = threading.Lock()
         self.last_connection_attempt: float = 0.0  # Timestamp of last connection attempt
         self.last_state_log_time: float = 0.0  # Timestamp of last state logging
         self.state_log_interval = (
             config.WS_STATE_LOG_INTERVAL
         )  # Log state every 5 seconds during long operations
+        self.timeline = AudioTimeline()  # Sent audio positions of the current session
+        self.connection_count = 0  # Successful connections (more than one = reconnects)
+        # Records received messages per session for offline replay (None = off)
+        self.recorder = SessionRecorder() if config.SESSION_RECORDING_ENABLED else None
 
         # Register this instance
         ConnectionManager.register_instance(self)
-        log_connection(logger, f"Created WebSocket client with ID: {self.client_id}")
+        log_connection(logger, "Created WebSocket client with ID: %s", self.client_id)
 
     def __del__(self):
         """Remove this instance when garbage collected."""
         handle_instance_deletion(self.client_id)
 
-    def _set_state(self, new_state):
+    def _set_state(self, new_state, only_from=None):
         """Sets the connection state and logs the transition."""
-        set_connection_state(self, new_state)
+        return set_connection_state(self, new_state, only_from)
 
     def _log_state_periodically(self, operation_name):
         """Log state periodically during long-running operations."""
@@ -89,7 +128,12 @@ class WhisperWebSocket:
 
     def connect(self, max_retries=3):
         """Establish WebSocket connection with enhanced timeout handling."""
-        return connect_to_server(self, max_retries)
+        with self.connect_lock:
+            connected = connect_to_server(self, max_retries)
+        if connected:
+            # Audio of a lost connection goes to the new session first
+            replay_audio(self)
+        return connected
 
     def _on_open(self, ws):
         """Callback when WebSocket connection is opened."""
@@ -108,18 +152,46 @@ class WhisperWebSocket:
         """Callback when WebSocket connection is closed."""
         on_close(self, ws, close_status_code, close_msg)
 
+    def _on_pong(self, ws, data):
+        """Callback for heartbeat pongs."""
+        on_pong(self, ws)
+
     def is_ready(self):
         """Checks if the server is ready."""
         return self.state == ConnectionState.READY
 
-    def send_audio(self, audio_data):
-        """Sends audio data to the server with enhanced error handling."""
-        return send_audio_data(self, audio_data)
+    def send_audio(self, audio_data, capture_time=None):
+        """Sends audio data to the server with enhanced error handling.
+
+        With frame aggregation the payload is buffered and sent together with
+        the following windows (see aggregator.py).
+
+        Args:
+            audio_data: Audio payload as bytes
+            capture_time: Capture time of the payload's last sample, used for
+                          latency tracing (defaults to the send time)
+
+        """
+        if self.aggregator is not None:
+            return self.aggregator.add(audio_data, capture_time)
+        return send_audio_data(self, audio_data, capture_time)
+
+    def _send_frame(self, audio_data, capture_time):
+        """Sends a frame of coalesced windows; the aggregator hands it over."""
+        return send_audio_data(self, audio_data, capture_time, copy=False)
 
     def set_text_callback(self, callback):
         """Sets the callback for received text segments."""
         self.on_text_callback = callback
 
+    def set_replay_callback(self, callback):
+        """Sets the callback run before unconfirmed audio is replayed to a new session.
+
+        The audio after the replay need not continue the replayed audio, so
+        this is where the audio processor marks a discontinuity.
+        """
+        self.on_replay_callback = callback
+
     def send_end_of_audio(self):
         """Sends END_OF_AUDIO signal to the server with enhanced timeout
         handling."""
@@ -1,7 +1,7 @@
 """
 WebSocket Messaging Module for the Whisper Client
-Version: 1.1
-Timestamp: 2025-04-20 17:12 CET
+Version: 1.6
+Timestamp: 2026-10-19 21:40 CET
 
 This module handles message processing, sending and receiving data,
 and callback handling for the WebSocket client.
@@ -14,6 +14,21 @@ import config
 import websocket
 from src import logger
 from src.logging import log_audio, log_connection, log_error, log_text
+from src.metrics import registry
+
+from .framing import send_binary
+from .replay import confirmed_end
+
+# Pipeline metrics for the send and receive paths
+send_seconds = registry.histogram("ws.send.seconds", "Duration of ws.send for audio frames")
+sent_bytes = registry.counter("ws.send.bytes", "Audio bytes sent to the server")
+sent_messages = registry.counter("ws.send.messages", "Audio frames sent to the server")
+send_errors = registry.counter("ws.send.errors", "Failed audio sends")
+received_messages = registry.counter("ws.receive.messages", "Messages received from the server")
+receive_seconds = registry.histogram(
+    "ws.receive.seconds", "Processing time per received message incl. text callback"
+)
+callback_seconds = registry.histogram("ws.receive.callback_seconds", "Text callback duration")
 
 
 def send_config(ws, client_id, session_id):
@@ -28,36 +43,44 @@ def send_config(ws, client_id, session_id):
             "backend": config.WHISPER_BACKEND,
         }
         json_str = json.dumps(ws_config).encode("utf-8")
-        log_connection(logger, f"Sending config: {json.dumps(ws_config, indent=2)}")
+        log_connection(logger, "Sending config: %s", ws_config)
         if ws:  # Check if ws is not None
             ws.send(json_str, websocket.ABNF.OPCODE_TEXT)
         return True
     except Exception as e:
-        log_error(logger, f"Error sending config: {str(e)}")
+        log_error(logger, "Error sending config: %s", e)
         return False
 
 
 def send_audio_data(ws, audio_data):
     """Sends audio data to the server."""
     try:
-        send_start = time.time()
+        send_start = time.perf_counter()
         if ws:  # Check if ws is not None
-            ws.send(audio_data, websocket.ABNF.OPCODE_BINARY)
+            # Masks the payload straight into the frame (see framing.py)
+            send_binary(ws, audio_data)
         else:
             log_error(logger, "Attempted to send audio while WebSocket is None")
+            send_errors.inc()
             return False
-        send_duration = time.time() - send_start
+        send_duration = time.perf_counter() - send_start
+
+        size = memoryview(audio_data).nbytes
+        send_seconds.record(send_duration)
+        sent_bytes.inc(size)
+        sent_messages.inc()
 
-        # Log audio send with timing information
-        log_audio(logger, f"Sent {len(audio_data)} bytes in {send_duration:.3f}s")
+        # Log audio send with timing information (formatted only if enabled)
+        log_audio(logger, "Sent %d bytes in %.3fs", size, send_duration, size=size)
 
         # Check if send took too long
         if send_duration > config.WS_MESSAGE_WAIT:
-            log_connection(logger, f"Audio send took longer than expected: {send_duration:.2f}s")
+            log_connection(logger, "Audio send took longer than expected: %.2fs", send_duration)
 
         return True
     except Exception as e:
-        log_error(logger, f"Error sending audio: {str(e)}")
+        log_error(logger, "Error sending audio: %s", e)
+        send_errors.inc()
         return False
 
 
@@ -72,25 +95,40 @@ def send_end_of_audio(ws):
             return False
         send_duration = time.time() - send_start
 
-        log_audio(logger, f"Sent END_OF_AUDIO signal in {send_duration:.3f}s")
+        log_audio(logger, "Sent END_OF_AUDIO signal in %.3fs", send_duration)
         return True
     except Exception as e:
-        log_error(logger, f"Error sending END_OF_AUDIO: {str(e)}")
+        log_error(logger, "Error sending END_OF_AUDIO: %s", e)
         return False
 
 
-def process_message(message, on_text_callback=None, processing_enabled=True):
-    """Process a message from the server."""
+def process_message(
+    message,
+    on_text_callback=None,
+    processing_enabled=True,
+    timeline=None,
+    session_id=None,
+    replay=None,
+):
+    """Process a message from the server.
+
+    If a timeline is given, the segment passed to the text callback carries a
+    "trace" entry that places it on the session's audio timeline. If a replay
+    buffer is given, the audio transcribed by completed segments is trimmed
+    from it.
+    """
     if not processing_enabled:
         return None, None
 
+    received_messages.inc()
     try:
-        message_start = time.time()
+        received_at = time.time()
+        message_start = time.perf_counter()
 
         if isinstance(message, bytes):
             message = message.decode("utf-8")
 
-        log_connection(logger, f"Raw server message: {message}")
+        log_connection(logger, "Raw server message: %s", message)
         data = json.loads(message)
 
         if "message" in data:
@@ -101,28 +139,40 @@ def process_message(message, on_text_callback=None, processing_enabled=True):
 
         if "segments" in data:
             segments = data["segments"]
+            if segments and replay is not None:
+                end = confirmed_end(segments)
+                if end is not None:
+                    replay.confirm(end)
             if segments:
                 # Take only the last complete text
                 text = segments[-1].get("text", "").strip()
-                log_text(logger, text)
+                log_text(logger, "%s", text)
                 if on_text_callback:
-                    callback_start = time.time()
-                    on_text_callback([segments[-1]])
-                    callback_duration = time.time() - callback_start
+                    segment = segments[-1]
+                    if timeline is not None:
+                        trace = timeline.trace_segment(segment, session_id, received_at)
+                        if trace is not None:
+                            segment = dict(segment, trace=trace)
+                    callback_start = time.perf_counter()
+                    on_text_callback([segment])
+                    callback_duration = time.perf_counter() - callback_start
+                    callback_seconds.record(callback_duration)
                     if callback_duration > config.WS_MESSAGE_WAIT:
                         log_connection(
-                            logger, f"Text callback took too long: {callback_duration:.2f}s"
+                            logger, "Text callback took too long: %.2fs", callback_duration
                         )
+                receive_seconds.record(time.perf_counter() - message_start)
                 return "TEXT", text
 
         # Check if message processing took too long
-        message_duration = time.time() - message_start
+        message_duration = time.perf_counter() - message_start
+        receive_seconds.record(message_duration)
         if message_duration > config.WS_MESSAGE_WAIT:
             log_connection(
-                logger, f"Message processing took longer than expected: {message_duration:.2f}s"
+                logger, "Message processing took longer than expected: %.2fs", message_duration
             )
 
         return None, None
     except Exception as e:
-        log_error(logger, f"Error processing message: {str(e)}")
+        log_error(logger, "Error processing message: %s", e)
         return "ERROR", str(e)
@@ -1,36 +1,129 @@
 """
 WebSocket Processing Module
-Version: 1.3
-Timestamp: 2025-04-20 18:13 CET
+Version: 1.13
+Timestamp: 2026-10-20 00:15 CET
 
 This module contains functions for processing WebSocket messages and data.
 """
 
 import time
 
-import win32clipboard
-
 import config
 from src import logger
 from src.logging import log_connection, log_error
+from src.metrics import registry
 
+from .connection_management import connection_lost
 from .messaging import send_audio_data as send_audio_to_server
 from .messaging import send_end_of_audio as send_eoa_to_server
+from .replay import BYTES_PER_SAMPLE
 from .state import ConnectionState
 
+replayed_bytes = registry.counter(
+    "ws.replay.bytes", "Unconfirmed audio resent to a new session after a reconnect"
+)
+
+# Phases of stop_processing()
+stop_final_wait_seconds = registry.histogram(
+    "ws.stop.final_wait_seconds", "Wait for the final transcripts after END_OF_AUDIO"
+)
+stop_close_seconds = registry.histogram("ws.stop.close_seconds", "Duration of ws.close()")
+stop_join_seconds = registry.histogram("ws.stop.join_seconds", "WebSocket thread join time")
+stop_total_seconds = registry.histogram("ws.stop.total_seconds", "Duration of stop_processing()")
+
+
+def send_audio_data(ws_instance, audio_data, capture_time=None, copy=True):
+    """Sends audio data to the server with enhanced error handling.
+
+    With copy=False the caller hands audio_data over (see ReplayBuffer.record).
+    """
+    replay = ws_instance.replay
+    if replay is None:
+        return _send_audio(ws_instance, audio_data, capture_time)
+
+    # The replay lock is only taken for the buffer itself, never around a send
+    with replay.send_lock:
+        if not replay.holding:
+            if _send_audio(ws_instance, audio_data, capture_time, copy):
+                return True
+            if not (replay.holding or ws_instance.reconnect_pending):
+                return False
+        # The connection was lost; the audio is sent after the reconnect
+        replay.record(audio_data, capture_time, sent=False, copy=copy)
+        return True
+
 
-def send_audio_data(ws_instance, audio_data):
-    """Sends audio data to the server with enhanced error handling."""
-    if not ws_instance.processing_enabled or not ws_instance.is_ready():
+def _send_audio(ws_instance, audio_data, capture_time, copy=True):
+    # Audio keeps flowing once the first transcripts moved the state to PROCESSING
+    if not ws_instance.processing_enabled or ws_instance.state not in (
+        ConnectionState.READY,
+        ConnectionState.PROCESSING,
+    ):
         return False
 
     success = send_audio_to_server(ws_instance.ws, audio_data)
-    if not success:
+    if success:
+        # Remember where this frame sits in the session's audio stream
+        ws_instance.timeline.record_frame(memoryview(audio_data).nbytes, capture_time)
+        if ws_instance.replay is not None:
+            ws_instance.replay.record(audio_data, capture_time, copy=copy)
+    else:
+        connection_lost(ws_instance)
         ws_instance._set_state(ConnectionState.CONNECT_ERROR)
 
     return success
 
 
+def replay_audio(ws_instance):
+    """Sends the audio a lost connection left unconfirmed to the new session."""
+    replay = ws_instance.replay
+    if replay is None or not replay.holding:
+        return
+    if ws_instance.on_replay_callback is not None:
+        # Outside the send lock: the callback may send audio it still holds,
+        # which is buffered while holding and replayed with the rest
+        ws_instance.on_replay_callback()
+    # New audio waits on the send lock until the replayed audio is sent
+    with replay.send_lock:
+        frames = replay.take() if replay.holding else []
+        if not frames:
+            return
+        log_connection(
+            logger,
+            "Replaying %.2fs of unconfirmed audio",
+            sum(memoryview(data).nbytes for data, _ in frames) / BYTES_PER_SAMPLE / replay.rate,
+        )
+        for index, (data, capture_time) in enumerate(frames):
+            # The buffer owns its frames, so they are sent and kept without copies
+            if not _send_audio(ws_instance, data, capture_time, copy=False):
+                # Lost again: keep the rest for the next reconnect
+                replay.hold()
+                for data, capture_time in frames[index:]:
+                    replay.record(data, capture_time, sent=False, copy=False)
+                return
+            replayed_bytes.inc(memoryview(data).nbytes)
+
+
+def discard_replay(ws_instance):
+    """Drops the audio held for replay when the recording ends."""
+    replay = ws_instance.replay
+    if replay is None:
+        return
+    # Not in the middle of a replay
+    with replay.send_lock:
+        if replay.holding and replay.samples:
+            log_connection(
+                logger, "Recording ended before reconnect, %.2fs of audio dropped", replay.seconds
+            )
+        replay.clear()
+
+
+def flush_audio(ws_instance):
+    """Sends the audio windows the frame aggregator still buffers."""
+    if ws_instance.aggregator is not None:
+        ws_instance.aggregator.flush()
+
+
 def send_end_of_audio_signal(ws_instance):
     """Sends END_OF_AUDIO signal to the server with enhanced timeout
     handling."""
@@ -38,6 +131,8 @@ def send_end_of_audio_signal(ws_instance):
         return False
 
     try:
+        # The buffered audio belongs in front of END_OF_AUDIO
+        flush_audio(ws_instance)
         ws_instance._set_state(ConnectionState.FINALIZING)
         success = send_eoa_to_server(ws_instance.ws)
         if not success:
@@ -81,6 +176,8 @@ def start_message_processing(ws_instance):
         # Clear clipboard
         clipboard_start = time.time()
         try:
+            import win32clipboard
+
             win32clipboard.OpenClipboard()
             win32clipboard.EmptyClipboard()
             win32clipboard.CloseClipboard()
@@ -109,6 +206,7 @@ def stop_message_processing(ws_instance):
         try:
             if ws_instance.is_ready() or ws_instance.state == ConnectionState.PROCESSING:
                 # Send END_OF_AUDIO and wait for processing
+                flush_audio(ws_instance)
                 ws_instance._set_state(ConnectionState.FINALIZING)
                 send_eoa_to_server(ws_instance.ws)
 
@@ -138,8 +236,11 @@ def stop_message_processing(ws_instance):
                     # Short pause
                     time.sleep(config.WS_POLL_INTERVAL)
 
-                # Disable processing
+                stop_final_wait_seconds.record(time.time() - wait_start)
+
+                # Disable processing; closing on purpose is no lost connection
                 ws_instance.processing_enabled = False
+                ws_instance.reconnect_pending = False
                 ws_instance.current_text = ""
 
                 # Close connection cleanly
@@ -154,7 +255,8 @@ def stop_message_processing(ws_instance):
                         "Attempted to close WebSocket during stop_processing while it was None",
                     )
                 close_duration = time.time() - close_start
-                log_connection(logger, f"Connection close() completed in {close_duration:.2f}s")
+                stop_close_seconds.record(close_duration)
+                log_connection(logger, "Connection close() completed in %.2fs", close_duration)
 
                 # Wait for thread to end with timeout
                 if ws_instance.ws_thread and ws_instance.ws_thread.is_alive():
@@ -179,8 +281,9 @@ def stop_message_processing(ws_instance):
                         )
                     else:
                         join_duration = time.time() - join_start
+                        stop_join_seconds.record(join_duration)
                         log_connection(
-                            logger, f"WebSocket thread terminated in {join_duration:.2f}s"
+                            logger, "WebSocket thread terminated in %.2fs", join_duration
                         )
 
         except Exception as e:
@@ -190,4 +293,8 @@ def stop_message_processing(ws_instance):
             ws_instance._set_state(ConnectionState.CLOSED)
             ws_instance.server_ready = False
             stop_duration = time.time() - stop_start
-            log_connection(logger, f"Processing stopped in {stop_duration:.2f}s")
+            stop_total_seconds.record(stop_duration)
+            log_connection(logger, "Processing stopped in %.2fs", stop_duration)
+
+    # The recording is over; its audio must not be replayed into the next one
+    discard_replay(ws_instance)
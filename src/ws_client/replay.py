@@ -0,0 +1,170 @@
+"""
+WebSocket Audio Replay Module
+Version: 1.3
+Timestamp: 2026-10-19 23:35 CET
+
+This module keeps the audio the server has not confirmed yet, so a lost
+connection does not lose speech. Every sent frame is retained in a
+ReplayBuffer at its sample offset in the session's audio stream. WhisperLive
+reports segment start/end times relative to that stream; once a segment is
+completed, the audio up to its end is transcribed for good and is trimmed
+from the buffer.
+
+When the connection is lost during a recording, the buffer holds: frames
+are no longer sent but appended, so the audio captured during the outage is
+kept as well. After the reconnect the buffered audio - the unconfirmed tail
+of the lost session followed by the outage - is replayed to the new session
+before any new audio (see processing.replay_audio). The buffer is bounded by
+max_seconds; the oldest audio is dropped first.
+
+The buffer's lock only guards its own state and is never held during network
+I/O, because confirm() runs on the WebSocket receive thread; a blocked send
+must not keep it from reading pongs. Sends and replays are ordered by the
+separate send_lock, which confirm() never takes.
+"""
+
+import collections
+import threading
+from dataclasses import dataclass
+from typing import Deque, List, Optional, Tuple, Union
+
+import config
+from src.metrics import Gauge, instance_labels, registry
+
+from .state import ConnectionState
+
+# Audio is sent to WhisperLive as float32 samples
+BYTES_PER_SAMPLE = 4
+
+# States in which a lost connection interrupts a recording
+ACTIVE_STATES = (ConnectionState.READY, ConnectionState.PROCESSING)
+
+dropped_bytes = registry.counter(
+    "ws.replay.dropped_bytes", "Unconfirmed audio dropped from the full replay buffer"
+)
+
+
+@dataclass
+class ReplayEntry:
+    """One frame of unconfirmed audio."""
+
+    data: Union[bytes, bytearray]
+    capture_time: Optional[float]
+    sent: bool
+
+    @property
+    def samples(self):
+        # Handed-over frames may be arrays or views, whose len() is not in bytes
+        return memoryview(self.data).nbytes // BYTES_PER_SAMPLE
+
+
+def confirmed_end(segments):
+    """Returns the end time in seconds up to which segments are final.
+
+    Completed segments are final. Servers that do not mark completed segments
+    may still revise the last one, so all others count as final.
+    """
+    if not segments:
+        return None
+    if "completed" in segments[-1]:
+        final = [segment for segment in segments if segment.get("completed")]
+    else:
+        final = segments[:-1]
+    try:
+        ends = [float(segment.get("end", 0.0)) for segment in final]
+    except (TypeError, ValueError):
+        return None
+    return max(ends) if ends else None
+
+
+class ReplayBuffer:
+    """Bounded buffer of sent but unconfirmed and of unsent audio frames."""
+
+    def __init__(self, rate=config.AUDIO_RATE, max_seconds=config.WS_REPLAY_SECONDS):
+        self.rate = rate
+        self.max_samples = int(max_seconds * rate)
+        self.entries: Deque[ReplayEntry] = collections.deque()
+        self.samples = 0  # Buffered samples, sent and unsent
+        self.start_sample = 0  # Session offset of the first sent entry
+        self.holding = False  # Connection lost: buffer frames instead of sending them
+        self.lock = threading.Lock()  # Guards the entries and counters only
+        # Held while frames are sent or replayed, so replayed audio keeps its order
+        self.send_lock = threading.Lock()
+        # Registered with the first recorded frame, unregistered by close()
+        self.labels = instance_labels()
+        self.gauge: Optional[Gauge] = None
+
+    @property
+    def seconds(self):
+        """Buffered audio in seconds."""
+        return self.samples / self.rate
+
+    def record(self, data, capture_time=None, sent=True, copy=True):
+        """Appends a frame; sent frames must precede unsent ones.
+
+        Mutable buffers are copied, since the caller may reuse them. With
+        copy=False the caller hands the buffer over, like the frame
+        aggregator does with its finished frames, and it is kept as is.
+        """
+        if copy and not isinstance(data, bytes):
+            data = bytes(data)
+        with self.lock:
+            if self.gauge is None:
+                self.gauge = registry.gauge(
+                    "ws.replay.buffer_seconds",
+                    "Unconfirmed audio held for replay",
+                    callback=lambda: self.seconds,
+                    labels=self.labels,
+                )
+            entry = ReplayEntry(data, capture_time, sent)
+            self.entries.append(entry)
+            self.samples += entry.samples
+            while self.samples > self.max_samples and len(self.entries) > 1:
+                dropped_bytes.inc(memoryview(self._drop_first().data).nbytes)
+
+    def _drop_first(self):
+        entry = self.entries.popleft()
+        self.samples -= entry.samples
+        if entry.sent:
+            self.start_sample += entry.samples
+        return entry
+
+    def confirm(self, audio_seconds):
+        """Trims the sent audio up to audio_seconds of the session."""
+        sample = int(audio_seconds * self.rate)
+        with self.lock:
+            while (
+                self.entries
+                and self.entries[0].sent
+                and self.start_sample + self.entries[0].samples <= sample
+            ):
+                self._drop_first()
+
+    def hold(self):
+        """Buffers further frames until the next replay."""
+        with self.lock:
+            self.holding = True
+
+    def take(self) -> List[Tuple[Union[bytes, bytearray], Optional[float]]]:
+        """Returns the buffered frames for a new session and empties the buffer."""
+        with self.lock:
+            frames = [(entry.data, entry.capture_time) for entry in self.entries]
+            self._clear()
+            return frames
+
+    def clear(self):
+        with self.lock:
+            self._clear()
+
+    def _clear(self):
+        self.entries.clear()
+        self.samples = 0
+        self.start_sample = 0
+        self.holding = False
+
+    def close(self):
+        """Unregisters the gauge; the buffered audio is kept for a reconnect."""
+        with self.lock:
+            if self.gauge is not None:
+                registry.unregister(self.gauge)
+                self.gauge = None
@@ -1,7 +1,7 @@
 """
 WebSocket State Management Module
-Version: 1.1
-Timestamp: 2025-04-20 17:14 CET
+Version: 1.3
+Timestamp: 2026-10-19 12:20 CET
 
 This module contains functions for managing WebSocket connection states.
 """
@@ -14,12 +14,19 @@ from src.logging import log_connection
 from .connection import ConnectionManager
 
 
-def set_connection_state(ws_instance, new_state):
-    """Sets the connection state and logs the transition."""
+def set_connection_state(ws_instance, new_state, only_from=None):
+    """Sets the connection state and logs the transition.
+
+    If only_from is given, the state is only changed when the current state
+    is one of only_from (checked atomically). Returns True if it changed.
+    """
     with ws_instance.connection_lock:
         old_state = ws_instance.state
+        if only_from is not None and old_state not in only_from:
+            return False
         ws_instance.state = new_state
-        log_connection(logger, f"State changed: {old_state.name} -> {new_state.name}")
+        log_connection(logger, "State changed: %s -> %s", old_state.name, new_state.name)
+        return True
 
 
 def log_state_periodically(ws_instance, operation_name):
@@ -0,0 +1,173 @@
+"""
+Hot Path Benchmarks
+Version: 1.3
+Timestamp: 2026-10-19 22:55 CET
+
+This module benchmarks the code paths that run for every audio chunk, server
+message or output sentence. All inputs are fixed and generated from a seeded
+random generator, so results are comparable between runs and against the
+baselines stored in tests/benchmarks/baselines (see tests/run_benchmarks.py).
+
+The module is skipped when pytest-benchmark is not installed.
+"""
+
+import json
+import logging
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+# Add project directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import config
+from src.audio.resampling import resample_to_16kHZ
+from src.audio.window import TumblingWindow
+from src.logging import log_debug, log_text
+from src.text import TextManager
+from src.text.buffer import TextBuffer
+from src.text.processing import find_overlap, format_sentence
+from src.text.sentence_splitter import split_into_sentences
+from src.ws_client.framing import format_binary_frame
+from src.ws_client.messaging import process_message
+from src.ws_client.replay import ReplayBuffer
+
+RNG_SEED = 1234
+
+ABBREVIATIONS = TextManager().common_abbreviations
+
+# Two seconds of int16 audio at 16 kHz
+AUDIO_INT16 = (np.random.default_rng(RNG_SEED).uniform(-0.3, 0.3, 2 * 16000) * 32767).astype(
+    np.int16
+)
+
+# One send block (4 chunks) of float32 audio at 44.1 kHz
+AUDIO_FLOAT32_44K = (
+    np.random.default_rng(RNG_SEED).uniform(-0.3, 0.3, 4 * config.AUDIO_CHUNK).astype(np.float32)
+).tobytes()
+
+PARAGRAPH = (
+    "Guten Morgen, das ist ein Test der Spracherkennung. Wir treffen uns bei Dr. Müller "
+    "in der Hauptstr. 5, z.B. um zehn Uhr. Ist das in Ordnung? Ja, das passt gut! "
+    "Danach gehen wir essen... oder vielleicht auch nicht?! Das entscheiden wir spontan."
+)
+
+SERVER_MESSAGE = json.dumps(
+    {
+        "uid": "benchmark",
+        "segments": [
+            {
+                "start": f"{i * 2.0:.3f}",
+                "end": f"{i * 2.0 + 1.8:.3f}",
+                "text": f" Das ist der Satz Nummer {i} im Transkript.",
+                "completed": i < 9,
+            }
+            for i in range(10)
+        ],
+    }
+)
+
+
+def _sentence(index):
+    return f"Das ist der eindeutige Satz Nummer {index} im Puffer."
+
+
+@pytest.mark.benchmark(group="audio")
+def test_tumbling_window_get_windows(benchmark):
+    """Two seconds of audio through a fresh tumbling window."""
+
+    def run():
+        window = TumblingWindow()
+        window.add_chunk(AUDIO_INT16)
+        return list(window.get_windows())
+
+    windows = benchmark(run)
+    assert windows
+
+
+@pytest.mark.benchmark(group="audio")
+def test_resample_to_16khz(benchmark):
+    """One send block resampled from 44.1 kHz to 16 kHz."""
+    benchmark(resample_to_16kHZ, AUDIO_FLOAT32_44K, 44100)
+
+
+@pytest.mark.benchmark(group="websocket")
+def test_format_binary_frame(benchmark):
+    """One aggregated audio frame masked into a WebSocket frame."""
+    payload = np.zeros(16 * 4096 // 4, dtype=np.float32)
+    frame = benchmark(format_binary_frame, payload, b"\x12\x34\x56\x78")
+    # 2 header bytes, 8 bytes extended length, 4 bytes mask key
+    assert len(frame) == 16 * 4096 + 14
+
+
+@pytest.mark.benchmark(group="websocket")
+def test_replay_record_frame(benchmark):
+    """One aggregated audio frame handed over to the replay buffer."""
+    replay = ReplayBuffer(max_seconds=10)
+    frame = bytearray(16 * 4096)
+    benchmark(replay.record, frame, None, True, False)
+    # Kept, not copied
+    assert replay.entries[-1].data is frame
+
+
+@pytest.mark.benchmark(group="websocket")
+def test_process_message(benchmark):
+    """A segments message with ten segments, dispatched to a no-op callback."""
+    result = benchmark(process_message, SERVER_MESSAGE, on_text_callback=lambda segments: None)
+    assert result[0] == "TEXT"
+
+
+@pytest.mark.benchmark(group="text")
+def test_split_into_sentences(benchmark):
+    sentences = benchmark(split_into_sentences, PARAGRAPH, ABBREVIATIONS)
+    assert len(sentences) > 1
+
+
+@pytest.mark.benchmark(group="text")
+def test_find_overlap(benchmark):
+    """Two 300 character texts that overlap by one sentence."""
+    text1 = PARAGRAPH + " Ende des ersten Teils."
+    text2 = "Ende des ersten Teils." + PARAGRAPH
+    assert benchmark(find_overlap, text1, text2) == "Ende des ersten Teils."
+
+
+@pytest.mark.benchmark(group="text")
+def test_format_sentence(benchmark):
+    benchmark(format_sentence, "  und dann  sagte er . . . nein ! ?  ", ABBREVIATIONS)
+
+
+@pytest.mark.benchmark(group="text")
+def test_text_buffer_is_duplicate_full(benchmark):
+    """Worst case: a new sentence checked against a full buffer."""
+    buffer = TextBuffer(max_age=3600)
+    for i in range(buffer.max_size):
+        buffer.add_segment(_sentence(i))
+    assert len(buffer.buffer) == buffer.max_size
+    assert not benchmark(buffer.is_duplicate, "Ein völlig neuer Satz, der nicht im Puffer ist.")
+
+
+@pytest.fixture
+def null_logger():
+    """A logger that creates records but discards them without I/O."""
+    bench_logger = logging.getLogger("WhisperClient.benchmark")
+    bench_logger.propagate = False
+    bench_logger.setLevel(logging.INFO)
+    handler = logging.NullHandler()
+    bench_logger.addHandler(handler)
+    yield bench_logger
+    bench_logger.removeHandler(handler)
+
+
+@pytest.mark.benchmark(group="logging")
+def test_log_text_enabled(benchmark, null_logger):
+    benchmark(log_text, null_logger, "%s", "Das ist ein Test.")
+
+
+@pytest.mark.benchmark(group="logging")
+def test_log_debug_disabled(benchmark, null_logger):
+    benchmark(log_debug, null_logger, "Window processed, buffer now %d samples", 4096)
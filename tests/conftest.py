@@ -0,0 +1,35 @@
+"""
+Pytest Configuration
+Version: 1.0
+Timestamp: 2026-10-19 21:50 CET
+
+This module points the log, metrics and profile files of the test run at a
+temporary directory, so tests that set up the logger do not write into the
+project's logs/ directory. The directory is removed after the session.
+"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import config
+
+LOG_DIR = tempfile.mkdtemp(prefix="whisper_client_logs_")
+
+config.LOG_DIR = LOG_DIR
+config.REGRESSION_LOG_FILE = str(Path(LOG_DIR) / "regression_investigation.log")
+config.METRICS_EXPORT_FILE = str(Path(LOG_DIR) / "metrics.json")
+config.PROFILE_DIR = str(Path(LOG_DIR) / "profiles")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Closes the log files and removes the temporary directory."""
+    from src.logging import stop_logging
+
+    stop_logging()
+    shutil.rmtree(LOG_DIR, ignore_errors=True)
@@ -0,0 +1,385 @@
+"""
+Audio Source Test
+Version: 1.5
+Timestamp: 2026-10-19 23:05 CET
+
+This module tests the file and synthetic audio sources and recording from
+them through the AudioManager without a microphone, including the
+always-open mode with its pre-roll buffer, capture in a worker process and
+the accounting of lost audio.
+"""
+
+import functools
+import sys
+import tempfile
+import time
+import unittest
+import wave
+from pathlib import Path
+
+import numpy as np
+
+# Add project directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import config
+from src.audio import (
+    AudioGap,
+    AudioManager,
+    AudioSource,
+    FileSource,
+    PrerollBuffer,
+    ProcessSource,
+    SyntheticSource,
+)
+from src.metrics import registry
+
+RATE = 16000
+
+
+class RampSource(AudioSource):
+    """Endless real-time source whose samples count up, so positions are visible."""
+
+    def __init__(self, chunk=800):
+        super().__init__(RATE, chunk, realtime=True)
+        self.position = 0
+
+    def _read_frames(self):
+        frames = (np.arange(self.position, self.position + self.chunk) % 32768).astype(np.int16)
+        self.position += self.chunk
+        return frames.tobytes()
+
+
+class LossySource(AudioSource):
+    """Finite ramp source that loses the given chunks like an input overrun."""
+
+    def __init__(self, lost_chunks, total_chunks=10, chunk=800):
+        super().__init__(RATE, chunk, realtime=False)
+        self.lost_chunks = set(lost_chunks)
+        self.total_chunks = total_chunks
+        self.index = 0
+
+    def open(self):
+        super().open()
+        self.index = 0
+
+    def _read_frames(self):
+        while self.index in self.lost_chunks:
+            self._record_gap(self.chunk, "overflow")
+            self.index += 1
+        if self.index >= self.total_chunks:
+            return b""
+        start = self.index * self.chunk + 1
+        self.index += 1
+        return np.arange(start, start + self.chunk, dtype=np.int16).tobytes()
+
+
+def positions(received):
+    """Sample positions of the float32 audio delivered by the AudioManager."""
+    samples = np.frombuffer(b"".join(received), dtype=np.float32)
+    return np.round(samples * 32768.0).astype(np.int64)
+
+
+def read_all(source):
+    """Read a source until it is exhausted."""
+    source.open()
+    chunks = []
+    while True:
+        data = source.read()
+        if not data:
+            break
+        chunks.append(data)
+    source.close()
+    return b"".join(chunks)
+
+
+class SyntheticSourceTest(unittest.TestCase):
+    """Tests for the SyntheticSource class."""
+
+    def test_duration(self):
+        """A finite source delivers exactly its duration."""
+        data = read_all(SyntheticSource(duration=1.5, realtime=False, chunk=4096))
+        self.assertEqual(len(data), int(1.5 * RATE) * 2)
+
+    def test_realtime_pacing(self):
+        """Real-time sources take as long as the audio they deliver."""
+        start = time.perf_counter()
+        read_all(SyntheticSource(duration=0.3, realtime=True, chunk=1024))
+        self.assertGreaterEqual(time.perf_counter() - start, 0.25)
+
+    def test_sine_amplitude(self):
+        """The sine signal reaches the configured amplitude."""
+        data = read_all(SyntheticSource(duration=0.1, amplitude=0.5, realtime=False))
+        peak = np.abs(np.frombuffer(data, dtype=np.int16)).max() / 32767
+        self.assertAlmostEqual(peak, 0.5, places=2)
+
+
+class FileSourceTest(unittest.TestCase):
+    """Tests for the FileSource class."""
+
+    def setUp(self):
+        """Create a temporary directory for WAV files."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def write_wav(self, name, frames, channels=1, sample_width=2, rate=RATE):
+        path = str(Path(self.tmp_dir.name) / name)
+        with wave.open(path, "wb") as wav:
+            wav.setnchannels(channels)
+            wav.setsampwidth(sample_width)
+            wav.setframerate(rate)
+            wav.writeframes(frames)
+        return path
+
+    def test_stereo_is_downmixed(self):
+        """Stereo 16-bit frames are averaged to mono."""
+        stereo = np.array([1000, 3000] * 100, dtype=np.int16).tobytes()
+        source = FileSource(self.write_wav("stereo.wav", stereo, channels=2), realtime=False)
+        samples = np.frombuffer(read_all(source), dtype=np.int16)
+        self.assertEqual(len(samples), 100)
+        self.assertTrue(np.all(samples == 2000))
+
+    def test_24_bit(self):
+        """24-bit samples keep their upper 16 bits."""
+        frames = bytes([0x00, 0x34, 0x12]) * 10
+        source = FileSource(self.write_wav("24bit.wav", frames, sample_width=3), realtime=False)
+        samples = np.frombuffer(read_all(source), dtype=np.int16)
+        self.assertTrue(np.all(samples == 0x1234))
+
+    def test_rate_and_loop(self):
+        """The source reports the file's rate and can loop."""
+        frames = np.zeros(800, dtype=np.int16).tobytes()
+        path = self.write_wav("short.wav", frames, rate=8000)
+        source = FileSource(path, chunk=800, realtime=False, loop=True)
+        self.assertEqual(source.rate, 8000)
+        source.open()
+        self.assertEqual(len(source.read() + source.read()), 3200)
+        source.close()
+
+
+class AudioManagerSourceTest(unittest.TestCase):
+    """Records from a synthetic source through the AudioManager."""
+
+    def test_record_synthetic_source(self):
+        """All audio of a finite source reaches the callback as float32."""
+        manager = AudioManager(source=SyntheticSource(duration=2.0, realtime=False))
+        received = []
+        manager.start_recording(received.append)
+        self.assertTrue(manager.wait_until_finished(timeout=10))
+        manager.cleanup()
+        self.assertEqual(sum(len(chunk) for chunk in received), 2 * RATE * 4)
+
+
+class PrerollTest(unittest.TestCase):
+    """Tests for the always-open microphone mode."""
+
+    def test_preroll_buffer(self):
+        """The buffer keeps the newest chunks and hands out the last seconds."""
+        buffer = PrerollBuffer(seconds=1.0, rate=RATE, chunk=4000)
+        for i in range(6):
+            buffer.append(bytes([i]) * 8000)
+        self.assertEqual(buffer.seconds, 1.0)
+        self.assertEqual([chunk[0] for chunk in buffer.take(0.5)], [4, 5])
+        self.assertEqual(buffer.take(0.5), [])
+
+    def test_recording_starts_with_preroll(self):
+        """A recording starts with the audio from before start_recording()."""
+        source = RampSource()
+        manager = AudioManager(source=source, always_on=True, preroll_seconds=0.2)
+        self.addCleanup(manager.cleanup)
+        time.sleep(0.5)
+        self.assertTrue(source.is_active())
+
+        received = []
+        start_position = source.position
+        manager.start_recording(received.append)
+        time.sleep(0.3)
+        manager.stop_recording()
+
+        audio = positions(received)
+        # 0.2s pre-roll in whole chunks, then gapless up to the stop. The
+        # capture thread may have a chunk in flight while the position is read
+        preroll_start = start_position - 4 * source.chunk
+        self.assertEqual(audio[0] % source.chunk, 0)
+        self.assertGreaterEqual(audio[0], preroll_start - source.chunk)
+        self.assertLessEqual(audio[0], preroll_start + source.chunk)
+        self.assertTrue(np.all(np.diff(audio) == 1))
+        self.assertGreaterEqual(len(audio), int(0.45 * RATE))
+
+        # The stream stays open and the next recording continues seamlessly
+        self.assertTrue(source.is_active())
+        time.sleep(0.3)
+        received = []
+        manager.start_recording(received.append)
+        time.sleep(0.1)
+        manager.stop_recording()
+        self.assertTrue(np.all(np.diff(positions(received)) == 1))
+
+    def test_recording_marks_preroll_splice(self):
+        """The pre-roll is marked as a discontinuity in front of the recording."""
+        manager = AudioManager(source=RampSource(), always_on=True, preroll_seconds=0.2)
+        self.addCleanup(manager.cleanup)
+        time.sleep(0.3)
+
+        received = []
+        manager.start_recording(received.append, lambda: received.append(None))
+        time.sleep(0.3)
+        manager.stop_recording()
+        self.assertIsNone(received[0])
+        self.assertEqual(received.count(None), 1)
+        self.assertTrue(np.all(np.diff(positions(received[1:])) == 1))
+
+
+class AudioGapTest(unittest.TestCase):
+    """Tests for the accounting of lost audio."""
+
+    def test_gaps_are_filled_with_silence(self):
+        """Lost chunks are delivered as silence, so positions stay in place."""
+        gaps_before = registry.counter("audio.capture.gaps").value
+        source = LossySource({3, 6, 7})
+        samples = np.frombuffer(read_all(source), dtype=np.int16)
+
+        expected = np.arange(1, 10 * 800 + 1, dtype=np.int16)
+        for index in (3, 6, 7):
+            expected[index * 800 : (index + 1) * 800] = 0
+        np.testing.assert_array_equal(samples, expected)
+
+        self.assertEqual(
+            list(source.gaps),
+            [
+                AudioGap(0.15, 0.05, "overflow"),
+                AudioGap(0.3, 0.05, "overflow"),
+                AudioGap(0.35, 0.05, "overflow"),
+            ],
+        )
+        self.assertEqual(source.lost_frames, 3 * 800)
+        self.assertEqual(registry.counter("audio.capture.gaps").value - gaps_before, 3)
+
+    def test_gaps_without_fill(self):
+        """Without fill_gaps the gaps are only recorded."""
+        source = LossySource({2, 5})
+        source.fill_gaps = False
+        data = read_all(source)
+        self.assertEqual(len(data), 8 * 800 * 2)
+        self.assertEqual([gap.position for gap in source.gaps], [0.1, 0.2])
+        self.assertEqual(source.discontinuities, 2)
+
+    def test_discontinuities(self):
+        """Only gaps that are not filled in full count as discontinuities."""
+        source = LossySource({3, 6, 7})
+        read_all(source)
+        self.assertEqual(source.discontinuities, 0)
+
+        max_fill = config.AUDIO_GAP_MAX_FILL_SECONDS
+        self.addCleanup(setattr, config, "AUDIO_GAP_MAX_FILL_SECONDS", max_fill)
+        config.AUDIO_GAP_MAX_FILL_SECONDS = 0.08
+        data = read_all(source)
+        # The two-chunk gap is shortened to 0.08s of silence
+        self.assertEqual(len(data), (7 * 800 + 800 + 1280) * 2)
+        self.assertEqual(source.discontinuities, 1)
+
+    def test_recording_keeps_its_length(self):
+        """The AudioManager delivers the filled audio of a recording."""
+        manager = AudioManager(source=LossySource({4}, total_chunks=20))
+        received = []
+        manager.start_recording(received.append)
+        self.assertTrue(manager.wait_until_finished(timeout=5))
+        manager.cleanup()
+        self.assertEqual(sum(len(chunk) for chunk in received), 20 * 800 * 4)
+
+    def test_recording_marks_unfilled_gaps(self):
+        """The discontinuity callback runs where an unfilled gap lies in the audio."""
+        source = LossySource({4}, total_chunks=20)
+        source.fill_gaps = False
+        manager = AudioManager(source=source)
+        received = []
+        manager.start_recording(received.append, lambda: received.append(None))
+        self.assertTrue(manager.wait_until_finished(timeout=5))
+        manager.cleanup()
+
+        marker = received.index(None)
+        self.assertEqual(received.count(None), 1)
+        before = positions(received[:marker])
+        np.testing.assert_array_equal(before, np.arange(1, 4 * 800 + 1))
+        self.assertEqual(positions(received[marker + 1 :])[0], 5 * 800 + 1)
+
+
+class ProcessSourceTest(unittest.TestCase):
+    """Tests for capture in a worker process."""
+
+    def test_audio_is_passed_through_unchanged(self):
+        """The ring delivers exactly the audio of the source in the worker."""
+        factory = functools.partial(
+            SyntheticSource, "noise", duration=1.0, chunk=1600, realtime=False, seed=3
+        )
+        self.assertEqual(read_all(ProcessSource(factory, chunk=1600)), read_all(factory()))
+
+    def test_ring_overflow_is_counted(self):
+        """Chunks the client does not read in time are dropped and counted."""
+        factory = functools.partial(
+            SyntheticSource, "noise", duration=2.0, chunk=1600, realtime=False
+        )
+        source = ProcessSource(factory, chunk=1600, ring_seconds=0.5)
+        source.open()
+        self.addCleanup(source.close)
+        time.sleep(1.0)  # Let the unpaced worker fill the ring
+        received = 0
+        while True:
+            data = source.read()
+            if not data:
+                break
+            received += len(data)
+        self.assertEqual(received, int(0.5 * RATE) * 2)
+        self.assertEqual(received + source.ring_overflows * 3200, 2 * RATE * 2)
+        self.assertEqual(source.lost_frames, source.ring_overflows * 1600)
+        self.assertEqual({gap.reason for gap in source.gaps}, {"ring"})
+
+        gauges = {gauge.name: gauge for gauge in source.gauges}
+        self.assertEqual(
+            gauges["audio.capture_process.ring_overflows"].value, source.ring_overflows
+        )
+        self.assertEqual(gauges["audio.capture_process.fill_bytes"].value, 0)
+        source.close()
+        for gauge in source.gauges:
+            self.assertNotIn(gauge, registry.gauges.values())
+
+    def test_dropped_chunks_are_filled(self):
+        """Chunks dropped while the ring was full come back as silence."""
+        factory = functools.partial(
+            SyntheticSource, "noise", duration=3.0, chunk=1600, realtime=True, speed=10.0
+        )
+        source = ProcessSource(factory, chunk=1600, ring_seconds=1.0)
+        source.open()
+        self.addCleanup(source.close)
+        deadline = time.monotonic() + 10
+        while not source.ring_overflows and time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.assertGreater(source.ring_overflows, 0)
+
+        chunks = []
+        while True:
+            data = source.read()
+            if not data:
+                break
+            chunks.append(data)
+        samples = np.frombuffer(b"".join(chunks), dtype=np.int16)
+        self.assertEqual(len(samples), 3 * RATE)
+        self.assertEqual(source.lost_frames, source.ring_overflows * 1600)
+        # Noise has no runs of silence, the filled gap does
+        self.assertGreaterEqual(np.count_nonzero(samples == 0), source.lost_frames)
+
+    def test_record_through_capture_process(self):
+        """The AudioManager records from the worker process like from any source."""
+        factory = functools.partial(SyntheticSource, duration=1.0, realtime=True, speed=4.0)
+        manager = AudioManager(source=ProcessSource(factory))
+        received = []
+        manager.start_recording(received.append)
+        self.assertTrue(manager.wait_until_finished(timeout=10))
+        manager.cleanup()
+        self.assertEqual(sum(len(chunk) for chunk in received), RATE * 4)
+        self.assertEqual(manager.source.ring_overflows, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+Batch Transcription Test
+Version: 1.0
+Timestamp: 2026-10-19 13:30 CET
+
+This module runs the batch transcriber against the fake WhisperLive server
+with generated WAV files.
+"""
+
+import json
+import sys
+import tempfile
+import unittest
+import wave
+from pathlib import Path
+
+import numpy as np
+
+# Add project directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from batch import BatchTranscriber, collect_files
+from tools.fake_server import FakeServerConfig, FakeWhisperServer
+
+RATE = 16000
+
+
+class BatchTranscriberTest(unittest.TestCase):
+    """Tests for the BatchTranscriber class."""
+
+    def setUp(self):
+        """Create input and output directories."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.input_dir = Path(self.tmp_dir.name) / "input"
+        self.output_dir = Path(self.tmp_dir.name) / "output"
+        self.input_dir.mkdir()
+
+    def write_wav(self, name, seconds):
+        t = np.arange(int(seconds * RATE)) / RATE
+        samples = (0.3 * np.sin(2 * np.pi * 440 * t) * 32767).astype(np.int16)
+        path = self.input_dir / name
+        with wave.open(str(path), "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(RATE)
+            wav.writeframes(samples.tobytes())
+        return path
+
+    def test_collect_files(self):
+        """Directories are expanded to the matching audio files."""
+        self.write_wav("b.wav", 0.1)
+        self.write_wav("a.wav", 0.1)
+        (self.input_dir / "notes.txt").write_text("ignored")
+        self.assertEqual([p.name for p in collect_files([self.input_dir])], ["a.wav", "b.wav"])
+
+    def test_transcribe_directory(self):
+        """Every file gets a transcript and the stats cover all files."""
+        self.write_wav("first.wav", 3.0)
+        self.write_wav("second.wav", 3.0)
+        script = ["Das ist ein Test.", "Noch ein Satz."]
+
+        with FakeWhisperServer(FakeServerConfig(script=script, word_duration=0.3)) as server:
+            transcriber = BatchTranscriber(
+                output_dir=self.output_dir, max_sessions=2, speed=0, url=server.url
+            )
+            results = transcriber.run(collect_files([self.input_dir]))
+            self.assertEqual(len(server.sessions), 2)
+
+        for result in results:
+            self.assertIsNone(result.error)
+            self.assertAlmostEqual(result.audio_seconds, 3.0, places=2)
+            self.assertGreater(result.bytes_sent, 0)
+            transcript = Path(result.transcript_path).read_text(encoding="utf-8")
+            self.assertIn("Das ist ein Test.", transcript)
+
+        with open(self.output_dir / "batch_stats.json", encoding="utf-8") as f:
+            stats = json.load(f)
+        self.assertEqual(stats["totals"]["files"], 2)
+        self.assertEqual(stats["totals"]["failed"], 0)
+        self.assertGreater(stats["totals"]["realtime_factor"], 1.0)
+
+    def test_connection_failure(self):
+        """A refused connection is reported as error of that file."""
+        path = self.write_wav("refused.wav", 0.5)
+        with FakeWhisperServer(FakeServerConfig(refuse_connections=100)) as server:
+            transcriber = BatchTranscriber(output_dir=self.output_dir, speed=0, url=server.url)
+            result = transcriber.transcribe_file(path)
+        self.assertIsNotNone(result.error)
+        self.assertIsNone(result.transcript_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
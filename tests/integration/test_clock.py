@@ -0,0 +1,114 @@
+"""
+Clock Test
+Version: 1.0
+Timestamp: 2026-10-19 17:10 CET
+
+This module runs the timing logic of the text pipeline on a FakeClock:
+buffer expiry, sentence timeout, forced output delay and a replay with
+recorded timing, all without waiting in real time.
+"""
+
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+# Add project directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import config
+from src.clock import FakeClock
+from src.recording import RECORDING_FORMAT, RECORDING_VERSION, replay_session
+from src.text import TextManager
+from src.text.buffer import TextBuffer
+
+
+class FakeClockTest(unittest.TestCase):
+    """Tests for the text pipeline on a FakeClock."""
+
+    def setUp(self):
+        """Create a fake clock and record the wall-clock start."""
+        self.clock = FakeClock(start=1000.0)
+        self.wall_start = time.perf_counter()
+
+    def assertNoRealWait(self):
+        self.assertLess(time.perf_counter() - self.wall_start, 1.0)
+
+    def test_fake_clock(self):
+        """The clock only moves when advanced or slept on."""
+        self.clock.advance(2.5)
+        self.clock.sleep(0.5)
+        self.clock.advance_to(900.0)  # Never goes back
+        self.assertEqual(self.clock.time(), 1003.0)
+        self.clock.advance_to(1010.0)
+        self.assertEqual(self.clock.time(), 1010.0)
+        self.assertNoRealWait()
+
+    def test_buffer_expiry(self):
+        """Segments older than max_age are removed on the next add."""
+        buffer = TextBuffer(max_size=10, max_age=5.0, clock=self.clock)
+        buffer.add_segment("Segment 1")
+        buffer.add_segment("Segment 2")
+        self.clock.advance(6.0)
+        self.assertEqual(buffer.get_recent_segments(), [])
+        self.assertFalse(buffer.is_duplicate("Segment 1 und mehr"))
+
+        buffer.add_segment("Segment 3")
+        self.assertEqual(len(buffer.buffer), 1)
+        self.assertEqual(list(buffer.text_lookup), ["segment 3"])
+        self.assertNoRealWait()
+
+    def test_sentence_timeout(self):
+        """An incomplete sentence is output once MAX_SENTENCE_WAIT has passed."""
+        manager = TextManager(test_mode=True, clock=self.clock)
+        manager.process_segments([{"text": "Das ist unvollständig"}])
+        manager.process_segments([{"text": ""}])
+        self.assertEqual(manager.get_test_output(), [])
+
+        self.clock.advance(config.MAX_SENTENCE_WAIT + 0.5)
+        manager.process_segments([{"text": ""}])
+        self.assertEqual(manager.get_test_output(), ["Das ist unvollständig"])
+        self.assertEqual(manager.last_output_time, self.clock.time())
+        self.assertNoRealWait()
+
+    def test_forced_output_waits_on_clock(self):
+        """The minimum output interval is waited for on the clock."""
+        manager = TextManager(test_mode=True, clock=self.clock)
+        manager.last_output_time = self.clock.time()
+        manager.process_segments([{"text": "Ein ganzer Satz."}])
+        self.assertEqual(manager.get_test_output(), ["Ein ganzer Satz."])
+        self.assertAlmostEqual(self.clock.time(), 1000.0 + config.MIN_OUTPUT_INTERVAL)
+        self.assertNoRealWait()
+
+    def test_replay_follows_recorded_timing(self):
+        """An unpaced replay on a FakeClock keeps the recorded timeouts."""
+        header = {"format": RECORDING_FORMAT, "version": RECORDING_VERSION, "session_id": "s"}
+        entries = [
+            (0.0, "Das ist unvollständig"),
+            (3600.0, "Eine Stunde später"),
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "session.jsonl.gz")
+            with gzip.open(path, "wt", encoding="utf-8") as f:
+                f.write(json.dumps(header) + "\n")
+                for offset, text in entries:
+                    message = json.dumps({"segments": [{"text": text}]})
+                    f.write(json.dumps({"t": offset, "m": message}) + "\n")
+
+            manager = TextManager(test_mode=True, clock=self.clock)
+            count = replay_session(path, manager, speed=0, flush=False)
+
+        self.assertEqual(count, 2)
+        self.assertEqual(manager.get_test_output(), ["Das ist unvollständig"])
+        self.assertEqual(manager.current_sentence, ["Eine Stunde später"])
+        self.assertEqual(self.clock.time(), 4600.0)
+        self.assertNoRealWait()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+"""
+Fake WhisperLive Server Test
+Version: 1.1
+Timestamp: 2026-10-19 16:55 CET
+
+This module tests the protocol, transcript script and failure injection of
+the fake WhisperLive server, and runs the WhisperWebSocket client against it.
+"""
+
+import json
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import websocket
+
+# Add project directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.ws_client import ConnectionState, WhisperWebSocket
+from tools.fake_server import (
+    REVISION_REVISE,
+    FakeServerConfig,
+    FakeWhisperServer,
+    _TranscriptScript,
+)
+
+# One second of float32 silence at 16 kHz
+ONE_SECOND = bytes(16000 * 4)
+
+
+def receive_json(ws):
+    """Receive and decode the next server message."""
+    return json.loads(ws.recv())
+
+
+class FakeServerProtocolTest(unittest.TestCase):
+    """Tests the fake server with a plain WebSocket connection."""
+
+    def start_server(self, **kwargs):
+        server = FakeWhisperServer(FakeServerConfig(**kwargs)).start()
+        self.addCleanup(server.stop)
+        return server
+
+    def connect(self, server):
+        ws = websocket.create_connection(server.url, timeout=5)
+        self.addCleanup(ws.close)
+        ws.send(json.dumps({"uid": "test-client", "language": "de"}))
+        return ws
+
+    def test_session_flow(self):
+        """Config, SERVER_READY, cumulative segments and END_OF_AUDIO_RECEIVED."""
+        server = self.start_server(script=["Eins zwei.", "Drei vier."], word_duration=0.5)
+        ws = self.connect(server)
+        self.assertEqual(
+            receive_json(ws),
+            {"uid": "test-client", "message": "SERVER_READY", "backend": "fake_whisper"},
+        )
+
+        ws.send_binary(ONE_SECOND)
+        first = receive_json(ws)["segments"]
+        self.assertEqual([s["text"] for s in first], [" Eins zwei."])
+        self.assertTrue(first[0]["completed"])
+
+        ws.send_binary(ONE_SECOND[: len(ONE_SECOND) // 2])
+        second = receive_json(ws)["segments"]
+        self.assertEqual([s["text"] for s in second], [" Eins zwei.", " Drei"])
+        self.assertFalse(second[-1]["completed"])
+        self.assertEqual(second[-1]["start"], "1.000")
+
+        ws.send_binary(b"END_OF_AUDIO")
+        final = receive_json(ws)["segments"]
+        self.assertEqual([s["text"] for s in final], [" Eins zwei.", " Drei vier."])
+        self.assertEqual(receive_json(ws)["message"], "END_OF_AUDIO_RECEIVED")
+
+        session = server.sessions[0]
+        self.assertEqual(session.uid, "test-client")
+        self.assertEqual(session.audio_bytes, len(ONE_SECOND) * 3 // 2)
+        self.assertTrue(session.end_of_audio)
+
+    def test_latency(self):
+        """Server messages are delayed by the configured latency."""
+        server = self.start_server(latency=0.2)
+        start = time.time()
+        ws = self.connect(server)
+        receive_json(ws)
+        self.assertGreaterEqual(time.time() - start, 0.2)
+
+    def test_refused_connection(self):
+        """The first N connections are refused."""
+        server = self.start_server(refuse_connections=1)
+        with self.assertRaises(Exception):
+            websocket.create_connection(server.url, timeout=5)
+        ws = self.connect(server)
+        self.assertEqual(receive_json(ws)["message"], "SERVER_READY")
+        self.assertEqual(server.connection_attempts, 2)
+
+    def test_error_injection(self):
+        """An injected error is sent as WhisperLive error status."""
+        server = self.start_server(error_after_audio_messages=1)
+        ws = self.connect(server)
+        receive_json(ws)
+        ws.send_binary(ONE_SECOND)
+        self.assertEqual(receive_json(ws)["status"], "ERROR")
+
+
+class TranscriptScriptTest(unittest.TestCase):
+    """Tests the revision patterns of the transcript script."""
+
+    def test_revise_pattern(self):
+        """The newest word is first sent truncated and corrected later."""
+        script = _TranscriptScript(
+            FakeServerConfig(script=["Hallo Welt."], revision_pattern=REVISION_REVISE)
+        )
+        self.assertEqual(script.update(0.4)[-1]["text"], " Ha")
+        self.assertEqual(script.update(0.8)[-1]["text"], " Hallo Welt.")
+        self.assertIsNone(script.update(0.9))
+
+
+class WhisperWebSocketFakeServerTest(unittest.TestCase):
+    """Runs the real client against the fake server."""
+
+    def test_connect_and_receive_text(self):
+        """The client reaches READY and receives transcribed text."""
+        with FakeWhisperServer(FakeServerConfig(script=["Hallo Welt."])) as server:
+            client = WhisperWebSocket(url=server.url)
+            received = threading.Event()
+            client.set_text_callback(lambda segments: received.set())
+            try:
+                self.assertTrue(client.connect())
+                self.assertEqual(client.state, ConnectionState.READY)
+                self.assertTrue(client.send_audio(ONE_SECOND))
+                self.assertTrue(received.wait(timeout=5))
+                self.assertEqual(client.current_text, "Hallo Welt.")
+            finally:
+                client.cleanup()
+
+    def test_reconnect_after_stop_processing(self):
+        """A fast SERVER_READY after stop_processing() is not dropped."""
+        with FakeWhisperServer(FakeServerConfig()) as server:
+            client = WhisperWebSocket(url=server.url)
+            try:
+                self.assertTrue(client.connect())
+                self.assertTrue(client.start_processing())
+                client.stop_processing()
+                self.assertTrue(client.connect(max_retries=1))
+                self.assertEqual(client.state, ConnectionState.READY)
+            finally:
+                client.cleanup()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Frame Aggregator Test
+Version: 1.0
+Timestamp: 2026-10-19 20:20 CET
+
+This module tests the coalescing of audio windows into WebSocket frames by
+size and by deadline, and sends aggregated audio to the fake server.
+"""
+
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add project directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.ws_client import FrameAggregator, WhisperWebSocket
+from tools.fake_server import FakeServerConfig, FakeWhisperServer
+
+# 64 ms of float32 audio at 16 kHz, the size of one tumbling window
+WINDOW = bytes(4096)
+
+
+class FrameAggregatorTest(unittest.TestCase):
+    """Tests for the FrameAggregator."""
+
+    def setUp(self):
+        """Record the sent frames."""
+        self.frames = []
+        self.sent = threading.Event()
+
+    def send(self, data, capture_time):
+        self.frames.append((data, capture_time))
+        self.sent.set()
+        return True
+
+    def test_frame_is_sent_at_target_size(self):
+        """Windows are sent as one frame once the target size is reached."""
+        aggregator = FrameAggregator(self.send, target_bytes=3 * 4096, max_delay=10.0)
+        self.addCleanup(aggregator.close)
+        for index in range(7):
+            self.assertTrue(aggregator.add(bytes([index]) * 4096, capture_time=float(index)))
+
+        self.assertEqual([len(data) for data, _ in self.frames], [3 * 4096, 3 * 4096])
+        self.assertEqual([capture_time for _, capture_time in self.frames], [2.0, 5.0])
+        self.assertEqual(self.frames[1][0][:4096], bytes([3]) * 4096)
+        self.assertEqual(aggregator.size, 4096)
+
+    def test_partial_frame_is_sent_at_deadline(self):
+        """A partial frame is sent once its first window has waited max_delay."""
+        aggregator = FrameAggregator(self.send, target_bytes=10 * 4096, max_delay=0.1)
+        self.addCleanup(aggregator.close)
+        start = time.perf_counter()
+        aggregator.add(WINDOW)
+        aggregator.add(WINDOW)
+
+        self.assertTrue(self.sent.wait(timeout=2))
+        self.assertGreaterEqual(time.perf_counter() - start, 0.1)
+        self.assertEqual([len(data) for data, _ in self.frames], [2 * 4096])
+
+    def test_flush_and_close(self):
+        """flush() sends the buffered windows, close() stops the deadline thread."""
+        aggregator = FrameAggregator(self.send, target_bytes=10 * 4096, max_delay=10.0)
+        aggregator.add(WINDOW)
+        self.assertTrue(aggregator.flush())
+        self.assertTrue(aggregator.flush())
+        aggregator.add(WINDOW)
+        aggregator.close()
+        self.assertEqual(len(self.frames), 2)
+        self.assertIsNone(aggregator.thread)
+
+
+class AggregatedSendTest(unittest.TestCase):
+    """Sends aggregated audio to the fake server."""
+
+    def test_fewer_frames_same_audio(self):
+        """The server receives all audio in a quarter of the messages."""
+        with FakeWhisperServer(FakeServerConfig()) as server:
+            client = WhisperWebSocket(url=server.url, aggregate_bytes=4 * 4096)
+            try:
+                self.assertTrue(client.connect())
+                self.assertTrue(client.start_processing())
+                for _ in range(21):
+                    self.assertTrue(client.send_audio(WINDOW))
+                # Flushes the last partial frame before END_OF_AUDIO
+                client.stop_processing()
+                # One timeline entry per frame, covering all windows
+                self.assertEqual(len(client.timeline.frames), 6)
+                self.assertEqual(client.timeline.total_samples, 21 * 4096 // 4)
+            finally:
+                client.cleanup()
+
+            session = server.sessions[-1]
+            self.assertTrue(session.end_of_audio)
+            self.assertEqual(session.audio_bytes, 21 * 4096)
+            self.assertEqual(session.audio_messages, 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
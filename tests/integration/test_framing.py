@@ -0,0 +1,89 @@
+"""
+WebSocket Framing Test
+Version: 1.0
+Timestamp: 2026-10-19 20:55 CET
+
+This module tests that the binary frames written by the framing module match
+the frames of websocket-client, and sends audio through them to the fake
+server.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+import websocket
+
+# Add project directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.ws_client import WhisperWebSocket
+from src.ws_client.framing import format_binary_frame, send_binary
+from tools.fake_server import FakeServerConfig, FakeWhisperServer
+
+MASK_KEY = b"\x12\x34\xab\xcd"
+
+
+class FramingTest(unittest.TestCase):
+    """Tests for format_binary_frame() and send_binary()."""
+
+    def test_frames_match_websocket_client(self):
+        """Header lengths and masking match ABNF.format() for every length class."""
+        for length in (0, 1, 5, 125, 126, 4099, 65535, 65536, 100003):
+            payload = np.random.default_rng(length).bytes(length)
+            expected = websocket.ABNF.create_frame(payload, websocket.ABNF.OPCODE_BINARY)
+            expected.get_mask_key = lambda _: MASK_KEY
+            with self.subTest(length=length):
+                frame = format_binary_frame(payload, MASK_KEY)
+                self.assertEqual(bytes(frame), expected.format())
+
+    def test_buffer_types(self):
+        """bytearray, memoryview and numpy payloads give the same frame as bytes."""
+        samples = np.linspace(-1.0, 1.0, 1001, dtype=np.float32)
+        expected = bytes(format_binary_frame(samples.tobytes(), MASK_KEY))
+        for payload in (bytearray(samples.tobytes()), memoryview(samples).cast("B"), samples):
+            with self.subTest(payload=type(payload).__name__):
+                self.assertEqual(bytes(format_binary_frame(payload, MASK_KEY)), expected)
+
+    def test_send_without_connection(self):
+        """send_binary() falls back to ws.send() for other WebSocket objects."""
+        sent = []
+
+        class Connection:
+            sock = None
+
+            def send(self, data, opcode):
+                sent.append((data, opcode))
+
+        send_binary(Connection(), memoryview(b"audio"))
+        self.assertEqual(sent, [(b"audio", websocket.ABNF.OPCODE_BINARY)])
+
+
+class FramedSendTest(unittest.TestCase):
+    """Sends audio in frames written by the framing module to the fake server."""
+
+    def test_server_receives_audio(self):
+        """The server receives every window intact."""
+        windows = [np.full(1024, index / 10, dtype=np.float32) for index in range(10)]
+        with FakeWhisperServer(FakeServerConfig()) as server:
+            client = WhisperWebSocket(url=server.url)
+            try:
+                self.assertTrue(client.connect())
+                self.assertTrue(client.start_processing())
+                for window in windows:
+                    self.assertTrue(client.send_audio(memoryview(window).cast("B")))
+                client.stop_processing()
+            finally:
+                client.cleanup()
+
+            session = server.sessions[-1]
+            self.assertTrue(session.end_of_audio)
+            self.assertEqual(session.audio_messages, 10)
+            self.assertEqual(session.audio_bytes, 10 * 4096)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Heartbeat Test
+Version: 1.1
+Timestamp: 2026-10-19 23:55 CET
+
+This module tests the heartbeat pings against the fake server: the round
+trip time is measured, and a server that stops answering is detected as a
+dead peer and replaced by a new connection, while a connect or handshake
+timeout is not.
+"""
+
+import sys
+import time
+import unittest
+from pathlib import Path
+
+import websocket
+
+# Add project directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.metrics import registry
+from src.ws_client import ConnectionState, WhisperWebSocket
+from src.ws_client.callbacks import on_error
+from src.ws_client.connection import ConnectionManager
+from src.ws_client.heartbeat import is_dead_peer
+from tools.fake_server import FakeServerConfig, FakeWhisperServer
+
+# 64 ms of float32 audio at 16 kHz, the size of one tumbling window
+WINDOW = bytes(4096)
+
+
+def wait_for(condition, timeout):
+    """Polls condition until it is true; returns its last result."""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return condition()
+
+
+class DeadPeerTest(unittest.TestCase):
+    """Tests that only a missing pong counts as a dead peer."""
+
+    def setUp(self):
+        """Set up a client with a heartbeat, without a connection."""
+        self.client = WhisperWebSocket(url="ws://localhost:1", ping_interval=5, ping_timeout=2)
+        self.addCleanup(ConnectionManager.unregister_instance, self.client.client_id)
+
+    def test_handshake_timeout_is_no_dead_peer(self):
+        """A connect or handshake timeout does not count as a missed pong."""
+        dead_peers = registry.counter("ws.heartbeat.dead_peers")
+        count = dead_peers.value
+        self.client.state = ConnectionState.CONNECTING
+        error = websocket.WebSocketTimeoutException("timed out")
+        self.assertFalse(is_dead_peer(self.client, error))
+        on_error(self.client, websocket.WebSocketApp(self.client.url), error)
+        self.assertEqual(dead_peers.value, count)
+        self.assertEqual(self.client.state, ConnectionState.CONNECT_ERROR)
+
+    def test_ping_timeout_on_established_connection(self):
+        """Only the ping/pong timeout of an established connection counts."""
+        ping_timeout = websocket.WebSocketTimeoutException("ping/pong timed out")
+        self.client.state = ConnectionState.CONNECTING
+        self.assertFalse(is_dead_peer(self.client, ping_timeout))
+        self.client.state = ConnectionState.READY
+        self.assertTrue(is_dead_peer(self.client, ping_timeout))
+        self.assertFalse(
+            is_dead_peer(self.client, websocket.WebSocketTimeoutException("timed out"))
+        )
+        self.assertFalse(is_dead_peer(self.client, ValueError("ping/pong timed out")))
+
+
+class HeartbeatTest(unittest.TestCase):
+    """Tests for the ping/pong heartbeat."""
+
+    def test_round_trip_time_is_measured(self):
+        """Pongs of the fake server give round trip times."""
+        rtt = registry.histogram("ws.heartbeat.rtt_seconds")
+        count = rtt.count
+        with FakeWhisperServer(FakeServerConfig()) as server:
+            client = WhisperWebSocket(url=server.url, ping_interval=0.1, ping_timeout=0.05)
+            try:
+                self.assertTrue(client.connect())
+                self.assertTrue(wait_for(lambda: rtt.count >= count + 2, timeout=2))
+            finally:
+                client.cleanup()
+
+        self.assertIsNotNone(client.last_rtt)
+        self.assertLess(client.last_rtt, 0.05)
+
+    def test_dead_peer_is_replaced(self):
+        """A server that stops answering is detected within seconds and reconnected."""
+        dead_peers = registry.counter("ws.heartbeat.dead_peers")
+        count = dead_peers.value
+        server_config = FakeServerConfig(blackhole_after_audio_messages=2)
+        with FakeWhisperServer(server_config) as server:
+            client = WhisperWebSocket(url=server.url, ping_interval=0.2, ping_timeout=0.1)
+            try:
+                self.assertTrue(client.connect())
+                self.assertTrue(client.start_processing())
+                for _ in range(2):
+                    self.assertTrue(client.send_audio(WINDOW))
+                start = time.monotonic()
+
+                # Detection within ping_interval + ping_timeout, then a new session
+                self.assertTrue(wait_for(lambda: dead_peers.value > count, timeout=2))
+                self.assertLess(time.monotonic() - start, 1.0)
+                self.assertTrue(wait_for(lambda: client.connection_count == 2, timeout=10))
+                self.assertEqual(client.state, ConnectionState.READY)
+                self.assertEqual(len(server.sessions), 2)
+                self.assertTrue(client.send_audio(WINDOW))
+            finally:
+                client.cleanup()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Import Time Test
+Version: 1.0
+Timestamp: 2026-10-19 17:35 CET
+
+This module guards the startup budget: importing the packages must neither
+set up logging nor load the heavy or platform dependencies, and importing
+the client classes must stay within a time budget. Every check runs in a
+fresh interpreter so earlier imports of the test run don't hide the cost.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add project directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Seconds for "import src, src.audio, src.text, src.ws_client"
+PACKAGE_IMPORT_BUDGET = 0.5
+# Seconds for importing the classes main.py starts with
+CLIENT_IMPORT_BUDGET = 1.0
+
+# Loaded on first use only (resampling, microphone, text output, clipboard)
+HEAVY_MODULES = [
+    "librosa",
+    "numba",
+    "scipy",
+    "pyaudio",
+    "pyperclip",
+    "win32api",
+    "win32clipboard",
+    "win32con",
+    "win32gui",
+]
+
+PROBE = """
+import json, logging, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+{imports}
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": seconds,
+    "loaded": [m for m in {heavy!r} if m in sys.modules],
+    "handlers": len(logging.getLogger("WhisperClient").handlers),
+}}))
+"""
+
+
+def run_probe(imports, cwd):
+    """Runs the imports in a fresh interpreter and returns its measurements."""
+    code = PROBE.format(root=str(project_root), imports=imports, heavy=HEAVY_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    )
+    lines = result.stdout.strip().splitlines()
+    return json.loads(lines[-1]), result.stdout
+
+
+class ImportTimeTest(unittest.TestCase):
+    """Tests for lazy imports and the import-time budget."""
+
+    def setUp(self):
+        """Run the probes in an empty directory to detect created files."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def test_package_import_has_no_side_effects(self):
+        """Importing the packages sets up no logging and loads no heavy modules."""
+        report, stdout = run_probe(
+            "import src, src.audio, src.text, src.ws_client", self.tmp_dir.name
+        )
+        self.assertEqual(report["loaded"], [])
+        self.assertEqual(report["handlers"], 0)
+        self.assertNotIn("Initializing logger", stdout)
+        self.assertEqual(os.listdir(self.tmp_dir.name), [])
+        self.assertLess(report["seconds"], PACKAGE_IMPORT_BUDGET)
+
+    def test_client_import_budget(self):
+        """The client classes import within budget without the heavy modules."""
+        imports = "\n".join(
+            [
+                "from src.audio import AudioManager, AudioProcessor",
+                "from src.text import TextManager",
+                "from src.ws_client import ConnectionState, WhisperWebSocket",
+            ]
+        )
+        report, _ = run_probe(imports, self.tmp_dir.name)
+        self.assertEqual(report["loaded"], [])
+        self.assertLess(report["seconds"], CLIENT_IMPORT_BUDGET)
+
+    def test_lazy_exports(self):
+        """Lazily exported names resolve and unknown names raise AttributeError."""
+        import src.audio
+        import src.ws_client
+        from src.audio.window import TumblingWindow
+        from src.ws_client.state import ConnectionState
+
+        self.assertIs(src.audio.TumblingWindow, TumblingWindow)
+        self.assertIs(src.ws_client.ConnectionState, ConnectionState)
+        self.assertIn("WhisperWebSocket", src.ws_client.__all__)
+        with self.assertRaises(AttributeError):
+            src.audio.NoSuchThing
+
+
+if __name__ == "__main__":
+    unittest.main()
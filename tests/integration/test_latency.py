@@ -0,0 +1,104 @@
+"""
+Latency Tracing Test
+Version: 1.0
+Timestamp: 2026-10-19 11:05 CET
+
+This module tests the audio timeline bookkeeping and the per-sentence
+latency records built from it.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add project directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.latency import BYTES_PER_SAMPLE, AudioTimeline, LatencyTracker, merge_traces
+
+RATE = 16000
+
+
+class AudioTimelineTest(unittest.TestCase):
+    """Tests for the AudioTimeline class."""
+
+    def setUp(self):
+        """Set up a timeline with one second frames captured at t=100, 101, 102."""
+        self.timeline = AudioTimeline(rate=RATE, max_seconds=60)
+        for i in range(3):
+            self.timeline.record_frame(
+                RATE * BYTES_PER_SAMPLE, capture_time=101.0 + i, send_time=101.1 + i
+            )
+
+    def test_lookup_interpolates_capture_time(self):
+        """Positions inside a frame map back to their capture time."""
+        capture_time, send_time = self.timeline.lookup(1.5)
+        self.assertAlmostEqual(capture_time, 101.5)
+        self.assertAlmostEqual(send_time, 102.1)
+
+    def test_lookup_past_end_clamps(self):
+        """Positions after the last frame map to the newest sample."""
+        capture_time, _ = self.timeline.lookup(10.0)
+        self.assertAlmostEqual(capture_time, 103.0)
+
+    def test_reset_starts_new_session(self):
+        """A reset timeline starts at offset 0 and has no frames."""
+        self.timeline.reset()
+        self.assertIsNone(self.timeline.lookup(0.5))
+        self.timeline.record_frame(RATE * BYTES_PER_SAMPLE, capture_time=200.0)
+        capture_time, _ = self.timeline.lookup(0.5)
+        self.assertAlmostEqual(capture_time, 199.5)
+
+    def test_old_frames_are_dropped(self):
+        """Frames outside the retained window can no longer be looked up."""
+        timeline = AudioTimeline(rate=RATE, max_seconds=1)
+        for i in range(3):
+            timeline.record_frame(RATE * BYTES_PER_SAMPLE, capture_time=float(i))
+        self.assertIsNone(timeline.lookup(0.5))
+        self.assertIsNotNone(timeline.lookup(2.5))
+
+    def test_trace_segment(self):
+        """Segment times (as sent by WhisperLive, strings) are placed on the timeline."""
+        trace = self.timeline.trace_segment(
+            {"text": "Hallo.", "start": "0.500", "end": "2.000"}, "session", received_at=103.4
+        )
+        self.assertEqual(trace["session_id"], "session")
+        self.assertAlmostEqual(trace["audio_start"], 0.5)
+        self.assertAlmostEqual(trace["captured_at"], 102.0)
+        self.assertAlmostEqual(trace["received_at"], 103.4)
+
+
+class LatencyTrackerTest(unittest.TestCase):
+    """Tests for the LatencyTracker class."""
+
+    def test_record_sentence(self):
+        """Records split end-to-end latency into server and client parts."""
+        tracker = LatencyTracker(trace_file=None)
+        trace = {
+            "session_id": "session",
+            "audio_start": 0.0,
+            "audio_end": 2.0,
+            "captured_at": 102.0,
+            "sent_at": 102.1,
+            "received_at": 103.0,
+        }
+        record = tracker.record_sentence("Hallo.", trace, output_at=103.25)
+        self.assertAlmostEqual(record.end_to_end, 1.25)
+        self.assertAlmostEqual(record.server_latency, 1.0)
+        self.assertAlmostEqual(record.client_latency, 0.25)
+        self.assertEqual(tracker.get_records(), [record])
+
+    def test_merge_traces(self):
+        """Merged traces keep the first audio start and the newest timestamps."""
+        first = {"session_id": "s", "audio_start": 0.0, "audio_end": 1.0, "received_at": 1.0}
+        latest = {"session_id": "s", "audio_start": 0.5, "audio_end": 2.0, "received_at": 2.0}
+        merged = merge_traces(first, latest)
+        self.assertEqual(merged["audio_start"], 0.0)
+        self.assertEqual(merged["audio_end"], 2.0)
+        self.assertIs(merge_traces(first, None), first)
+        self.assertIs(merge_traces(None, latest), latest)
+
+
+if __name__ == "__main__":
+    unittest.main()
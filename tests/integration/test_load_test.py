@@ -0,0 +1,50 @@
+"""
+Load Generator Test
+Version: 1.0
+Timestamp: 2026-10-19 15:10 CET
+
+This module runs the load generator with a few sessions against the fake
+WhisperLive server.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add project directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.fake_server import FakeServerConfig, FakeWhisperServer
+from tools.load_test import LoadGenerator, format_report
+
+
+class LoadGeneratorTest(unittest.TestCase):
+    """Tests for the LoadGenerator class."""
+
+    def test_concurrent_sessions(self):
+        """All sessions connect, stream their audio and receive text."""
+        with FakeWhisperServer(FakeServerConfig(word_duration=0.2)) as server:
+            report = LoadGenerator(sessions=3, url=server.url, duration=2.0, speed=0).run()
+            self.assertEqual(len(server.sessions), 3)
+
+        self.assertEqual(report["connected"], 3)
+        self.assertEqual(report["failed"], 0)
+        for session in report["per_session"]:
+            # Two seconds of float32 audio at 16 kHz, windowed with overlap
+            self.assertGreaterEqual(session["bytes_sent"], 2 * 16000 * 4)
+            self.assertGreater(session["messages"], 0)
+        self.assertGreater(report["message_latency"]["p50"], 0.0)
+        self.assertGreater(report["cpu"]["seconds"], 0.0)
+        self.assertIn("Msg latency", format_report(report))
+
+    def test_unreachable_server(self):
+        """Failed connections are reported, not raised."""
+        with FakeWhisperServer(FakeServerConfig(refuse_connections=100)) as server:
+            report = LoadGenerator(sessions=1, url=server.url, duration=0.5, speed=0).run()
+        self.assertEqual(report["connected"], 0)
+        self.assertEqual(report["failed"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
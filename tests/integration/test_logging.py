@@ -0,0 +1,162 @@
+"""
+Logging Helper Test
+Version: 1.2
+Timestamp: 2026-10-19 22:00 CET
+
+This module tests the level-checked, lazily formatted log_* helpers,
+the per-log-type formatter and the queue handler in front of the sinks.
+"""
+
+import logging
+import queue
+import sys
+import unittest
+from pathlib import Path
+
+# Add project directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.logging import (
+    DeferredQueueHandler,
+    WhisperFormatter,
+    log_audio,
+    log_debug,
+    log_error,
+    log_info,
+)
+
+
+class _Unformattable:
+    """Argument that fails the test if it is ever formatted."""
+
+    def __str__(self):
+        raise AssertionError("Argument was formatted although the level is disabled")
+
+
+class _RecordCollector(logging.Handler):
+    """Handler that keeps emitted records for inspection."""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class LoggingHelperTest(unittest.TestCase):
+    """Tests for the log_* helpers in src/logging.py."""
+
+    def setUp(self):
+        """Set up an isolated logger with a collecting handler."""
+        self.logger = logging.getLogger("WhisperClient.test_logging")
+        self.logger.propagate = False
+        self.collector = _RecordCollector()
+        self.logger.addHandler(self.collector)
+        self.logger.setLevel(logging.INFO)
+
+    def tearDown(self):
+        """Remove the collecting handler."""
+        self.logger.removeHandler(self.collector)
+
+    def test_disabled_level_skips_formatting(self):
+        """Disabled levels must not create records or format arguments."""
+        log_debug(self.logger, "Value: %s", _Unformattable())
+        self.assertEqual(self.collector.records, [])
+
+    def test_formatting_is_deferred(self):
+        """Arguments are passed through and only merged on getMessage()."""
+        log_info(self.logger, "Sent %d bytes", 42)
+        record = self.collector.records[0]
+        self.assertEqual(record.msg, "Sent %d bytes")
+        self.assertEqual(record.args, (42,))
+        self.assertEqual(record.getMessage(), "Sent 42 bytes")
+        self.assertEqual(record.log_type, "info")
+
+    def test_audio_size_is_structured(self):
+        """log_audio carries the size as an explicit field."""
+        log_audio(self.logger, "Sent %d bytes in %.3fs", 4096, 0.001, size=4096)
+        record = self.collector.records[0]
+        self.assertEqual(record.log_type, "audio")
+        self.assertEqual(record.size, 4096)
+
+    def test_error_fields_default(self):
+        """log_error always provides the fields used by the regression format."""
+        log_error(self.logger, "Failure: %s", "boom")
+        record = self.collector.records[0]
+        self.assertEqual(record.log_type, "error")
+        self.assertEqual(record.stack, "")
+        self.assertEqual(record.size, 0)
+
+    def test_caller_attribution(self):
+        """Records point at the caller, not at the helper module."""
+        log_info(self.logger, "Caller check")
+        self.assertEqual(self.collector.records[0].funcName, "test_caller_attribution")
+
+
+class WhisperFormatterTest(unittest.TestCase):
+    """Tests for the precompiled per-log-type formatter."""
+
+    def _record(self, message, **fields):
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, message, None, None)
+        record.__dict__.update(fields)
+        return record
+
+    def test_format_by_log_type(self):
+        """Each log type uses its own format, unknown types use the default."""
+        formatter = WhisperFormatter({"default": "D %(message)s", "audio": "A %(message)s"})
+        self.assertEqual(formatter.format(self._record("x", log_type="audio")), "A x")
+        self.assertEqual(formatter.format(self._record("y", log_type="text")), "D y")
+        self.assertEqual(formatter.format(self._record("z")), "D z")
+
+    def test_format_does_not_mutate_shared_state(self):
+        """Formatting one type must not change the format used for another."""
+        formatter = WhisperFormatter({"default": "D %(message)s", "audio": "A %(message)s"})
+        formatter.format(self._record("x", log_type="audio"))
+        self.assertEqual(formatter.format(self._record("y")), "D y")
+        self.assertEqual(formatter._style._fmt, "%(message)s")
+
+
+class DeferredQueueHandlerTest(unittest.TestCase):
+    """Tests that the queue handler leaves the formatting to the sinks."""
+
+    class _FailingFormatter(logging.Formatter):
+        def format(self, record):
+            raise AssertionError("Record was formatted on the calling thread")
+
+    def setUp(self):
+        """Set up a queue handler whose formatter must not be used."""
+        self.queue = queue.SimpleQueue()
+        self.handler = DeferredQueueHandler(self.queue)
+        self.handler.setFormatter(self._FailingFormatter())
+
+    def test_arguments_are_merged(self):
+        """The message is merged so later changes to arguments do not leak in."""
+        values = [1]
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "Values: %s", (values,), None)
+        self.handler.handle(record)
+        values.append(2)
+        queued = self.queue.get_nowait()
+        self.assertEqual(queued.msg, "Values: [1]")
+        self.assertIsNone(queued.args)
+
+    def test_traceback_is_formatted_by_the_sink(self):
+        """The exception stays on the record and is formatted once by the sink."""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            exc_info = sys.exc_info()
+        record = logging.LogRecord("test", logging.ERROR, __file__, 1, "Failed", None, exc_info)
+        self.handler.handle(record)
+        queued = self.queue.get_nowait()
+        self.assertIsNone(queued.exc_text)
+        self.assertIs(queued.exc_info, exc_info)
+
+        output = WhisperFormatter({"default": "%(message)s"}).format(queued)
+        self.assertTrue(output.startswith("Failed\nTraceback"))
+        self.assertEqual(output.count("ValueError: boom"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
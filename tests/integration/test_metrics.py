@@ -0,0 +1,158 @@
+"""
+Metrics Registry Test
+Version: 1.3
+Timestamp: 2026-10-19 23:45 CET
+
+This module tests the counters, gauges, histograms and the JSON exporter
+of the in-process metrics registry, and the per-instance gauges.
+"""
+
+import json
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add project directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.audio.processor import AudioProcessor
+from src.metrics import Histogram, MetricsExporter, MetricsRegistry, registry
+from src.text.buffer import TextBuffer
+
+
+class HistogramTest(unittest.TestCase):
+    """Tests for the HDR-style histogram."""
+
+    def test_percentiles_within_relative_error(self):
+        """Percentiles stay within the bucket precision over a wide range."""
+        histogram = Histogram("latency")
+        rng = random.Random(42)
+        values = [rng.lognormvariate(-3.0, 1.5) for _ in range(20000)]
+        for value in values:
+            histogram.record(value)
+
+        values.sort()
+        for percent in (50.0, 90.0, 99.0):
+            exact = values[int(len(values) * percent / 100.0) - 1]
+            self.assertAlmostEqual(histogram.percentile(percent), exact, delta=exact * 0.02)
+
+    def test_summary(self):
+        """Summary reports count, sum, extremes and percentiles."""
+        histogram = Histogram("latency")
+        for value in (0.010, 0.020, 0.030):
+            histogram.record(value)
+
+        summary = histogram.summary()
+        self.assertEqual(summary["count"], 3)
+        self.assertAlmostEqual(summary["sum"], 0.060)
+        self.assertAlmostEqual(summary["min"], 0.010)
+        self.assertAlmostEqual(summary["max"], 0.030)
+        self.assertAlmostEqual(summary["p50"], 0.020, delta=0.0005)
+
+    def test_empty_histogram(self):
+        """An empty histogram reports zeros instead of failing."""
+        summary = Histogram("empty").summary()
+        self.assertEqual(summary["count"], 0)
+        self.assertEqual(summary["p99"], 0.0)
+
+    def test_time_context_manager(self):
+        """time() records one value per block."""
+        histogram = Histogram("block")
+        with histogram.time():
+            pass
+        self.assertEqual(histogram.count, 1)
+
+
+class MetricsRegistryTest(unittest.TestCase):
+    """Tests for the registry and the exporter."""
+
+    def setUp(self):
+        """Set up a fresh registry."""
+        self.registry = MetricsRegistry()
+
+    def test_metrics_are_created_once(self):
+        """Repeated lookups return the same metric object."""
+        self.assertIs(self.registry.counter("a"), self.registry.counter("a"))
+        self.assertIs(self.registry.gauge("b"), self.registry.gauge("b"))
+        self.assertIs(self.registry.histogram("c"), self.registry.histogram("c"))
+
+    def test_snapshot(self):
+        """Snapshot contains counters, gauges (incl. callbacks) and histograms."""
+        self.registry.counter("ws.send.bytes").inc(4096)
+        self.registry.gauge("queue").set(3)
+        self.registry.gauge("callback", callback=lambda: 7)
+        self.registry.histogram("ws.send.seconds").record(0.002)
+
+        snapshot = self.registry.snapshot()
+        self.assertEqual(snapshot["counters"]["ws.send.bytes"], 4096)
+        self.assertEqual(snapshot["gauges"]["queue"], 3)
+        self.assertEqual(snapshot["gauges"]["callback"], 7)
+        self.assertEqual(snapshot["histograms"]["ws.send.seconds"]["count"], 1)
+
+    def test_labelled_gauges(self):
+        """Gauges with different labels are separate metrics."""
+        first = self.registry.gauge("depth", callback=lambda: 1, labels={"object": "1"})
+        second = self.registry.gauge("depth", callback=lambda: 2, labels={"object": "2"})
+        self.assertIsNot(first, second)
+        self.assertIs(self.registry.gauge("depth", labels={"object": "1"}), first)
+
+        gauges = self.registry.snapshot()["gauges"]
+        self.assertEqual(gauges['depth{object="1"}'], 1)
+        self.assertEqual(gauges['depth{object="2"}'], 2)
+
+    def test_unregister(self):
+        """unregister() removes only the given gauge object."""
+        old = self.registry.gauge("depth", labels={"object": "1"})
+        self.registry.unregister(old)
+        new = self.registry.gauge("depth", labels={"object": "1"})
+        self.registry.unregister(old)
+        self.assertEqual(list(self.registry.gauges.values()), [new])
+
+    def test_exporter_writes_json(self):
+        """The exporter writes a parseable snapshot file."""
+        self.registry.counter("exported").inc()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = str(Path(tmp_dir) / "metrics.json")
+            MetricsExporter(self.registry, path=path, interval=60).export()
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        self.assertEqual(data["counters"]["exported"], 1)
+
+
+class InstanceGaugeTest(unittest.TestCase):
+    """Tests for the per-instance gauges."""
+
+    def test_text_buffers_report_separately(self):
+        """Each buffer has its own gauges, which close() removes."""
+        buffers = [TextBuffer(), TextBuffer()]
+        buffers[0].add_segment("Hallo Welt.")
+        values = [gauge.value for buffer in buffers for gauge in buffer.gauges]
+        self.assertEqual(values, [1, 1, 0, 0])
+
+        for buffer in buffers:
+            buffer.close()
+            for gauge in buffer.gauges:
+                self.assertNotIn(gauge, registry.gauges.values())
+
+    def test_audio_processor_gauge_while_processing(self):
+        """The queue depth of each processor is registered while it runs."""
+        processors = [AudioProcessor(test_mode=True), AudioProcessor(test_mode=True)]
+        for processor in processors:
+            processor.start_processing(lambda window: None)
+        try:
+            gauges = [processor.queue_depth for processor in processors]
+            self.assertIsNot(gauges[0], gauges[1])
+            for gauge in gauges:
+                self.assertIn(gauge, registry.gauges.values())
+        finally:
+            for processor in processors:
+                processor.stop_processing()
+        for gauge in gauges:
+            self.assertNotIn(gauge, registry.gauges.values())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+Metrics HTTP Exporter Test
+Version: 1.2
+Timestamp: 2026-10-19 23:45 CET
+
+This module tests the Prometheus text rendering of the metrics registry and
+the /metrics endpoint.
+"""
+
+import sys
+import unittest
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+# Add project directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.metrics import MetricsRegistry, instance_labels
+from src.metrics_http import MetricsHTTPServer, metric_name, render_metrics
+
+
+class RenderMetricsTest(unittest.TestCase):
+    """Tests for the Prometheus text rendering."""
+
+    def setUp(self):
+        """Set up a registry with one metric of each type."""
+        self.registry = MetricsRegistry()
+        self.registry.counter("ws.send.bytes", "Audio bytes sent").inc(8192)
+        self.registry.gauge("audio.processor.queue_depth", callback=lambda: 3)
+        histogram = self.registry.histogram("latency.end_to_end_seconds")
+        for value in (0.2, 0.4, 3.0):
+            histogram.record(value)
+
+    def test_metric_name(self):
+        """Dotted registry names become prefixed Prometheus names."""
+        self.assertEqual(
+            metric_name("ws.send.bytes", "_total"), "whisper_client_ws_send_bytes_total"
+        )
+
+    def test_counter_and_gauge(self):
+        """Counters get a _total suffix, callback gauges are evaluated."""
+        text = render_metrics(self.registry)
+        self.assertIn("# HELP whisper_client_ws_send_bytes_total Audio bytes sent", text)
+        self.assertIn("# TYPE whisper_client_ws_send_bytes_total counter", text)
+        self.assertIn("whisper_client_ws_send_bytes_total 8192\n", text)
+        self.assertIn("whisper_client_audio_processor_queue_depth 3\n", text)
+
+    def test_labelled_gauges(self):
+        """Labelled gauges share one header and carry their labels."""
+        labels = [instance_labels(), instance_labels()]
+        for label_set in labels:
+            self.registry.gauge(
+                "text.buffer.segments", "Segments", callback=lambda: 5, labels=label_set
+            )
+        text = render_metrics(self.registry)
+        name = "whisper_client_text_buffer_segments"
+        self.assertEqual(text.count(f"# TYPE {name} gauge"), 1)
+        for label_set in labels:
+            self.assertIn(f'{name}{{object="{label_set["object"]}"}} 5\n', text)
+        # instance is the scrape target's label in Prometheus
+        self.assertNotIn("instance=", text)
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Histogram buckets count all values up to their bound."""
+        text = render_metrics(self.registry)
+        name = "whisper_client_latency_end_to_end_seconds"
+        self.assertIn(f'{name}_bucket{{le="0.1"}} 0\n', text)
+        self.assertIn(f'{name}_bucket{{le="0.5"}} 2\n', text)
+        self.assertIn(f'{name}_bucket{{le="5.0"}} 3\n', text)
+        self.assertIn(f'{name}_bucket{{le="+Inf"}} 3\n', text)
+        self.assertIn(f"{name}_count 3\n", text)
+
+
+class MetricsHTTPServerTest(unittest.TestCase):
+    """Tests for the /metrics endpoint."""
+
+    def setUp(self):
+        """Start a server on a free local port."""
+        self.registry = MetricsRegistry()
+        self.registry.counter("ws.reconnects").inc()
+        self.server = MetricsHTTPServer(host="127.0.0.1", port=0, metrics_registry=self.registry)
+        self.server.start()
+        self.base_url = "http://%s:%d" % self.server.address
+
+    def tearDown(self):
+        """Stop the server."""
+        self.server.stop()
+
+    def test_scrape(self):
+        """GET /metrics returns the rendered registry."""
+        with urllib.request.urlopen(self.base_url + "/metrics", timeout=5) as response:
+            body = response.read().decode("utf-8")
+            self.assertTrue(response.headers["Content-Type"].startswith("text/plain"))
+        self.assertIn("whisper_client_ws_reconnects_total 1\n", body)
+
+    def test_unknown_path(self):
+        """Other paths are answered with 404."""
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            urllib.request.urlopen(self.base_url + "/", timeout=5)
+        self.assertEqual(context.exception.code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
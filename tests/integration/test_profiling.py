@@ -0,0 +1,154 @@
+"""
+Profiling Test
+Version: 1.3
+Timestamp: 2026-10-20 00:05 CET
+
+This module tests the tracemalloc based memory profiler and the attribution
+of allocations to the client's subsystems, and the sampling CPU profiler.
+"""
+
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import unittest
+from pathlib import Path
+
+# Add project directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.audio import AudioProcessor
+from src.metrics import registry
+from src.profiling import CpuProfiler, MemoryProfiler, subsystem_sizes
+from src.text.buffer import TextBuffer
+
+
+class MemoryProfilerTest(unittest.TestCase):
+    """Tests for the MemoryProfiler class."""
+
+    def setUp(self):
+        """Create a temporary report directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.profiler = MemoryProfiler(output_dir=self.tmp_dir.name, interval=0, top=5)
+        self.addCleanup(self.profiler.stop)
+
+    def test_text_buffer_growth_is_attributed(self):
+        """Segments added to a TextBuffer count for the text subsystem."""
+        self.profiler.start()
+        self.assertTrue(tracemalloc.is_tracing())
+        before = self.profiler.previous_sizes["text"]
+
+        buffer = TextBuffer(max_size=5000, max_age=3600)
+        for i in range(500):
+            buffer.add_segment(f"Das ist der Testsatz Nummer {i} für den Speicher.")
+
+        path = self.profiler.snapshot()
+        self.assertIsNotNone(path)
+        growth = self.profiler.previous_sizes["text"] - before
+        self.assertGreater(growth, 500 * 50)
+
+        report = Path(path).read_text(encoding="utf-8")
+        self.assertIn("Subsystem", report)
+        self.assertIn("text", report)
+        self.assertIn("Top 5 allocation sites", report)
+        del buffer
+
+    def test_on_demand_start(self):
+        """The first on-demand snapshot starts tracing, stop ends it."""
+        self.assertIsNone(self.profiler.snapshot())
+        self.assertTrue(tracemalloc.is_tracing())
+        self.assertIn(self.profiler.gauges[0], registry.gauges.values())
+        self.profiler.stop()
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertEqual(len(list(Path(self.tmp_dir.name).glob("memory_*.txt"))), 1)
+        for gauge in self.profiler.gauges:
+            self.assertNotIn(gauge, registry.gauges.values())
+
+    def test_restart(self):
+        """start() while running is a no-op; a restart takes a new baseline."""
+        self.profiler.start()
+        gauges = self.profiler.gauges
+        baseline = self.profiler.previous
+        self.profiler.start()
+        self.assertIs(self.profiler.gauges, gauges)
+        self.assertIs(self.profiler.previous, baseline)
+
+        self.profiler.stop()
+        self.assertIsNone(self.profiler.previous)
+        self.assertEqual(self.profiler.previous_sizes, {})
+        self.assertEqual(self.profiler.first_sizes, {})
+        for gauge in gauges:
+            self.assertNotIn(gauge, registry.gauges.values())
+
+        self.profiler.start()
+        self.assertIsNot(self.profiler.previous, baseline)
+        self.assertIsNotNone(self.profiler.previous)
+        for gauge in self.profiler.gauges:
+            self.assertIn(gauge, registry.gauges.values())
+
+    def test_subsystem_sizes_keys(self):
+        """Every subsystem and "other" are reported."""
+        tracemalloc.start(5)
+        try:
+            sizes = subsystem_sizes(tracemalloc.take_snapshot())
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(set(sizes), {"audio", "ws_client", "text", "logging", "metrics", "other"})
+
+
+def busy_loop(stop_event):
+    """Burns CPU until stopped."""
+    while not stop_event.is_set():
+        sum(range(1000))
+
+
+class CpuProfilerTest(unittest.TestCase):
+    """Tests for the CpuProfiler class."""
+
+    def setUp(self):
+        """Create a temporary profile directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.profiler = CpuProfiler(output_dir=self.tmp_dir.name, interval=0.005)
+        self.addCleanup(self.profiler.stop)
+
+    def test_collapsed_stacks(self):
+        """Samples of a named thread start with its name and end in its frames."""
+        stop_event = threading.Event()
+        worker = threading.Thread(target=busy_loop, args=(stop_event,), name="BusyWorker")
+        worker.start()
+        try:
+            self.profiler.toggle()
+            time.sleep(0.3)
+            path = self.profiler.toggle()
+        finally:
+            stop_event.set()
+            worker.join()
+
+        self.assertGreater(self.profiler.sample_count, 10)
+        lines = Path(path).read_text(encoding="utf-8").splitlines()
+        busy = [line for line in lines if line.startswith("BusyWorker;")]
+        self.assertTrue(busy)
+        stack, count = busy[0].rsplit(" ", 1)
+        self.assertGreater(int(count), 0)
+        self.assertIn("busy_loop (tests", stack)
+        self.assertFalse(any(line.startswith("CpuProfiler;") for line in lines))
+
+    def test_client_threads_are_named(self):
+        """Audio processing samples are attributed to their thread."""
+        processor = AudioProcessor()
+        processor.start_processing(lambda window: None)
+        try:
+            self.profiler.sample()
+        finally:
+            processor.stop_processing()
+        self.assertTrue(
+            any(line.startswith("AudioProcessing;") for line in self.profiler.collapsed())
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,243 @@
+"""
+Audio Replay Test
+Version: 1.5
+Timestamp: 2026-10-19 23:55 CET
+
+This module tests the replay buffer: sent audio is trimmed as segments are
+completed, the buffer is bounded, and after a dropped connection the
+unconfirmed audio and the audio of the outage reach the new session, after
+the replay callback has marked the discontinuity.
+"""
+
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+import websocket
+
+# Add project directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.metrics import registry
+from src.ws_client import WhisperWebSocket
+from src.ws_client.callbacks import on_error
+from src.ws_client.connection import ConnectionManager
+from src.ws_client.processing import send_audio_data
+from src.ws_client.replay import ReplayBuffer, confirmed_end
+from src.ws_client.state import ConnectionState
+from tools.fake_server import FakeServerConfig, FakeWhisperServer
+
+# One second of float32 audio at 16 kHz
+ONE_SECOND = bytes(16000 * 4)
+
+
+def wait_for(condition, timeout):
+    """Polls condition until it is true; returns its last result."""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return condition()
+
+
+class ReplayBufferTest(unittest.TestCase):
+    """Tests for the ReplayBuffer."""
+
+    def test_confirmed_audio_is_trimmed(self):
+        """Frames that end before the confirmed position are dropped."""
+        replay = ReplayBuffer(max_seconds=10)
+        for index in range(4):
+            replay.record(ONE_SECOND, capture_time=float(index))
+        replay.confirm(1.5)
+        self.assertEqual(replay.seconds, 3.0)
+        replay.confirm(3.0)
+        self.assertEqual(replay.seconds, 1.0)
+        self.assertEqual(replay.take(), [(ONE_SECOND, 3.0)])
+        self.assertEqual(replay.seconds, 0.0)
+
+    def test_unsent_audio_is_not_confirmed(self):
+        """Held frames stay until they are replayed."""
+        replay = ReplayBuffer(max_seconds=10)
+        replay.record(ONE_SECOND)
+        replay.hold()
+        replay.record(ONE_SECOND, sent=False)
+        replay.confirm(5.0)
+        self.assertEqual(replay.seconds, 1.0)
+        self.assertTrue(replay.holding)
+        self.assertEqual(len(replay.take()), 1)
+        self.assertFalse(replay.holding)
+
+    def test_buffer_is_bounded(self):
+        """The oldest audio is dropped when the buffer is full."""
+        replay = ReplayBuffer(max_seconds=2)
+        for index in range(5):
+            replay.record(ONE_SECOND, capture_time=float(index))
+        self.assertEqual(replay.seconds, 2.0)
+        self.assertEqual([capture_time for _, capture_time in replay.take()], [3.0, 4.0])
+
+    def test_gauge_per_buffer(self):
+        """Each buffer reports its own audio; close() unregisters the gauge only."""
+        buffers = [ReplayBuffer(max_seconds=10), ReplayBuffer(max_seconds=10)]
+        buffers[0].record(ONE_SECOND)
+        buffers[1].record(ONE_SECOND + ONE_SECOND)
+        self.assertEqual([replay.gauge.value for replay in buffers], [1.0, 2.0])
+
+        gauge = buffers[0].gauge
+        buffers[0].close()
+        self.assertNotIn(gauge, registry.gauges.values())
+        self.assertEqual(buffers[0].seconds, 1.0)
+
+    def test_copies_only_buffers_in_use(self):
+        """Views are copied; handed over frames and bytes are kept as they are."""
+        replay = ReplayBuffer(max_seconds=10)
+        frame = bytearray(ONE_SECOND)
+        replay.record(ONE_SECOND)
+        replay.record(memoryview(frame))
+        replay.record(frame, copy=False)
+        data = [entry.data for entry in replay.entries]
+        self.assertIs(data[0], ONE_SECOND)
+        self.assertIsInstance(data[1], bytes)
+        self.assertIs(data[2], frame)
+
+    def test_counts_bytes_of_arrays(self):
+        """Handed-over arrays and views count their bytes, not their elements."""
+        replay = ReplayBuffer(max_seconds=10)
+        samples = np.zeros(16000, dtype=np.float32)
+        replay.record(samples, copy=False)
+        replay.record(memoryview(samples), copy=False)
+        self.assertEqual(replay.seconds, 2.0)
+        replay.confirm(1.0)
+        self.assertEqual(replay.seconds, 1.0)
+
+    def test_confirmed_end(self):
+        """Completed segments are final; without the flag all but the last one."""
+        segments = [
+            {"start": "0.000", "end": "1.600", "completed": True},
+            {"start": "1.600", "end": "2.000", "completed": False},
+        ]
+        self.assertEqual(confirmed_end(segments), 1.6)
+        self.assertIsNone(confirmed_end(segments[1:]))
+        self.assertEqual(
+            confirmed_end([{"start": "0.0", "end": "1.0"}, {"start": "1.0", "end": "1.5"}]), 1.0
+        )
+
+
+class BlockingConnection:
+    """WebSocket stand-in whose sends block until released."""
+
+    sock = None
+
+    def __init__(self):
+        self.sending = threading.Event()
+        self.release = threading.Event()
+
+    def send(self, data, opcode):
+        self.sending.set()
+        self.release.wait(5)
+
+
+class RecordingConnection:
+    """WebSocket stand-in that keeps the sent payloads."""
+
+    sock = None
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, data, opcode):
+        self.sent.append(data)
+
+
+class ReplayLockTest(unittest.TestCase):
+    """Tests that sends do not block the receive thread's use of the buffer."""
+
+    def setUp(self):
+        """Set up a client in a running session on a blocking connection."""
+        self.client = WhisperWebSocket(url="ws://localhost:1", replay_seconds=10)
+        self.addCleanup(ConnectionManager.unregister_instance, self.client.client_id)
+        self.client.ws = BlockingConnection()
+        self.client.state = ConnectionState.READY
+
+    def test_confirm_during_blocked_send(self):
+        """confirm() and hold() do not wait for a send in progress."""
+        connection = self.client.ws
+        sender = threading.Thread(target=self.client.send_audio, args=(ONE_SECOND,))
+        sender.start()
+        self.addCleanup(sender.join)
+        self.addCleanup(connection.release.set)
+        self.assertTrue(connection.sending.wait(5))
+
+        receiver = threading.Thread(
+            target=lambda: (self.client.replay.confirm(1.0), self.client.replay.hold())
+        )
+        receiver.start()
+        receiver.join(timeout=1)
+        self.assertFalse(receiver.is_alive())
+
+    def test_callback_error_does_not_hold(self):
+        """An exception from a callback leaves the audio flowing."""
+        on_error(self.client, self.client.ws, ValueError("callback failed"))
+        self.assertFalse(self.client.replay.holding)
+        self.assertTrue(self.client.reconnect_pending)
+
+    def test_send_counts_bytes(self):
+        """Timeline and replay positions of array payloads are counted in bytes."""
+        self.client.ws = RecordingConnection()
+        samples = np.zeros(16000, dtype=np.float32)
+        self.assertTrue(send_audio_data(self.client, samples, copy=False))
+        self.assertTrue(send_audio_data(self.client, memoryview(samples)))
+        self.assertEqual(self.client.timeline.total_samples, 32000)
+        self.assertEqual(self.client.replay.seconds, 2.0)
+        self.assertEqual(sum(len(data) for data in self.client.ws.sent), 2 * 16000 * 4)
+
+    def test_dead_peer_holds(self):
+        """A missing pong holds the audio for the reconnect."""
+        on_error(
+            self.client, self.client.ws, websocket.WebSocketTimeoutException("ping/pong timed out")
+        )
+        self.assertTrue(self.client.replay.holding)
+
+
+class ReplayAfterReconnectTest(unittest.TestCase):
+    """Drops the connection of a running session at the fake server."""
+
+    def test_unconfirmed_audio_reaches_new_session(self):
+        """Audio after the last completed segment is replayed after the reconnect."""
+        with FakeWhisperServer(FakeServerConfig(drop_after_audio_messages=5)) as server:
+            client = WhisperWebSocket(url=server.url)
+            # Runs once, before the held audio is taken for the new session
+            replays = []
+            client.set_replay_callback(lambda: replays.append(client.replay.seconds))
+            try:
+                self.assertTrue(client.connect())
+                self.assertTrue(client.start_processing())
+                # Four seconds complete the first two sentences of the script
+                for _ in range(4):
+                    self.assertTrue(client.send_audio(ONE_SECOND))
+                self.assertTrue(wait_for(lambda: client.replay.seconds == 0, timeout=5))
+
+                # The server drops the connection on the fifth second
+                for _ in range(4):
+                    self.assertTrue(client.send_audio(ONE_SECOND))
+                    time.sleep(0.05)
+
+                self.assertTrue(wait_for(lambda: client.connection_count == 2, timeout=10))
+                self.assertTrue(
+                    wait_for(lambda: server.sessions[-1].audio_bytes == 4 * len(ONE_SECOND), 5)
+                )
+                self.assertEqual(len(server.sessions), 2)
+                self.assertEqual(server.sessions[0].audio_messages, 5)
+                self.assertEqual(server.sessions[1].audio_messages, 4)
+                self.assertFalse(client.replay.holding)
+                self.assertEqual(len(replays), 1)
+                self.assertGreater(replays[0], 0)
+            finally:
+                client.cleanup()
+
+
+if __name__ == "__main__":
+    unittest.main()
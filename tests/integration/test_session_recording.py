@@ -0,0 +1,99 @@
+"""
+Session Recording Test
+Version: 1.0
+Timestamp: 2026-10-19 14:40 CET
+
+This module records a client session against the fake WhisperLive server and
+replays the recording into the text pipeline.
+"""
+
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add project directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.recording import SessionRecorder, read_recording, replay_session
+from src.text import TextManager
+from src.ws_client import WhisperWebSocket
+from tools.fake_server import FakeServerConfig, FakeWhisperServer
+
+# One second of float32 silence at 16 kHz
+ONE_SECOND = bytes(16000 * 4)
+
+
+class SessionRecorderTest(unittest.TestCase):
+    """Tests for the SessionRecorder and the replay."""
+
+    def setUp(self):
+        """Create a temporary recording directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def write_recording(self, messages, interval=0.0):
+        recorder = SessionRecorder(self.tmp_dir.name)
+        recorder.start("client-id", "session-0123456789")
+        for message in messages:
+            recorder.record(message)
+            time.sleep(interval)
+        recorder.stop()
+        return recorder.path
+
+    def test_roundtrip(self):
+        """Header and messages are read back unchanged."""
+        path = self.write_recording(['{"message": "SERVER_READY"}', b'{"segments": []}'])
+        header, messages = read_recording(path)
+        self.assertEqual(header["session_id"], "session-0123456789")
+        self.assertEqual(
+            [m for _, m in messages], ['{"message": "SERVER_READY"}', '{"segments": []}']
+        )
+        self.assertLessEqual(messages[0][0], messages[1][0])
+
+    def test_accelerated_replay(self):
+        """Replay keeps the relative timing, scaled by the speed."""
+        path = self.write_recording(['{"segments": []}'] * 3, interval=0.2)
+        start = time.perf_counter()
+        replay_session(path, TextManager(test_mode=True), speed=2.0)
+        self.assertGreaterEqual(time.perf_counter() - start, 0.18)
+
+    def test_record_and_replay_session(self):
+        """A replayed session produces the same sentences as the live one."""
+        script = ["Das ist ein Test.", "Hier kommt der zweite Satz."]
+        live = TextManager(test_mode=True)
+        client = WhisperWebSocket()
+        client.recorder = SessionRecorder(self.tmp_dir.name)
+        done = threading.Event()
+
+        def on_text(segments):
+            live.process_segments(segments)
+            if segments[-1]["text"].strip() == script[-1]:
+                done.set()
+
+        with FakeWhisperServer(FakeServerConfig(script=script, word_duration=0.2)) as server:
+            client.url = server.url
+            client.set_text_callback(on_text)
+            try:
+                self.assertTrue(client.connect())
+                for _ in range(3):
+                    client.send_audio(ONE_SECOND)
+                self.assertTrue(done.wait(timeout=5))
+            finally:
+                client.cleanup()
+        live.output_sentence()
+        live_sentences = live.get_test_output()
+        self.assertTrue(live_sentences)
+
+        self.assertFalse(client.recorder.active)
+        replayed = TextManager(test_mode=True)
+        count = replay_session(client.recorder.path, replayed, speed=0)
+        self.assertEqual(count, client.recorder.message_count)
+        self.assertEqual(replayed.get_test_output(), live_sentences)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Soak Test Runner Test
+Version: 1.0
+Timestamp: 2026-10-19 16:55 CET
+
+This module tests the growth detection of the soak test runner and runs a
+short soak against the fake WhisperLive server.
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add project directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.fake_server import FakeServerConfig, FakeWhisperServer
+from tools.soak_test import SERIES, SoakRunner, detect_growth, format_summary
+
+TIMES = list(range(100))
+
+
+class DetectGrowthTest(unittest.TestCase):
+    """Tests for detect_growth."""
+
+    def test_leak_is_flagged(self):
+        """A sawtooth with a rising floor is flagged."""
+        values = [i * 10 + (i % 7) * 100 for i in TIMES]
+        result = detect_growth("rss", TIMES, values, min_growth=100)
+        self.assertTrue(result.monotonic)
+        self.assertGreater(result.slope_per_hour, 0)
+
+    def test_stable_sawtooth_is_not_flagged(self):
+        """A sawtooth around a constant floor is not flagged."""
+        values = [1000 + (i % 7) * 100 for i in TIMES]
+        self.assertFalse(detect_growth("rss", TIMES, values).monotonic)
+
+    def test_small_growth_is_not_flagged(self):
+        """Rising minima below the threshold are not flagged."""
+        self.assertFalse(detect_growth("threads", TIMES, TIMES, min_growth=1000).monotonic)
+
+    def test_missing_values(self):
+        """Series without values (e.g. sockets on Windows) are not flagged."""
+        result = detect_growth("sockets", TIMES, [None] * 100)
+        self.assertFalse(result.monotonic)
+
+
+class SoakRunnerTest(unittest.TestCase):
+    """Runs a short soak against the fake server."""
+
+    def test_short_soak(self):
+        """Cycles run, all series are sampled and the results are written."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with FakeWhisperServer(FakeServerConfig(word_duration=0.2)) as server:
+                runner = SoakRunner(
+                    server.url,
+                    # A cycle includes the reconnect, so bound it by cycles, not time
+                    duration=60.0,
+                    max_cycles=3,
+                    cycle_seconds=0.5,
+                    pause_seconds=0.1,
+                    cleanup_every=2,
+                    sample_interval=0.2,
+                    output_dir=tmp_dir,
+                )
+                summary = runner.run()
+            stem = runner.write(summary)
+
+            self.assertEqual(summary["errors"], [])
+            self.assertGreaterEqual(summary["cycles"], 2)
+            self.assertGreaterEqual(summary["connections"], 2)
+            self.assertGreater(summary["samples"], 5)
+            self.assertEqual({t["name"] for t in summary["trends"]}, set(SERIES))
+            self.assertTrue(Path(stem + "_samples.csv").exists())
+            self.assertTrue(Path(stem + "_summary.json").exists())
+            self.assertIn("ws_instances", format_summary(summary))
+
+
+if __name__ == "__main__":
+    unittest.main()
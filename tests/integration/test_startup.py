@@ -0,0 +1,122 @@
+"""
+Startup Graph Test
+Version: 1.0
+Timestamp: 2026-10-19 18:00 CET
+
+This module tests the concurrent startup orchestration: dependency order,
+overlap of independent steps, failure handling and deferred steps.
+"""
+
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add project directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.startup import StartupError, StartupGraph
+
+
+class StartupGraphTest(unittest.TestCase):
+    """Tests for the StartupGraph."""
+
+    def setUp(self):
+        """Collect the order in which steps finish."""
+        self.finished = []
+        self.lock = threading.Lock()
+
+    def step(self, name, seconds=0.0, error=None):
+        def run():
+            time.sleep(seconds)
+            if error:
+                raise error
+            with self.lock:
+                self.finished.append(name)
+            return name
+
+        return run
+
+    def test_independent_steps_overlap(self):
+        """Independent slow steps run concurrently, dependents run after."""
+        graph = StartupGraph()
+        graph.add("server", self.step("server", 0.3))
+        graph.add("microphone", self.step("microphone", 0.3))
+        graph.add("hotkeys", self.step("hotkeys", 0.3))
+        graph.add("connect", self.step("connect", 0.1), requires=("server",))
+
+        start = time.perf_counter()
+        results = graph.run()
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 0.7)
+        self.assertEqual(results["connect"], "connect")
+        self.assertEqual(self.finished[-1], "connect")
+        connect = graph.steps["connect"]
+        self.assertGreaterEqual(connect.offset, graph.steps["server"].seconds)
+        self.assertIn("microphone", graph.format_report())
+
+    def test_essential_failure(self):
+        """A failing essential step raises and its dependents are skipped."""
+        graph = StartupGraph()
+        graph.add("server", self.step("server", error=ConnectionError("unreachable")))
+        graph.add("connect", self.step("connect"), requires=("server",))
+        graph.add("microphone", self.step("microphone", 0.1))
+
+        with self.assertRaises(StartupError) as context:
+            graph.run()
+        self.assertEqual(context.exception.step, "server")
+        self.assertIsInstance(context.exception.error, ConnectionError)
+        self.assertEqual(graph.steps["connect"].status, "skipped")
+        # Steps that were already running are allowed to finish
+        self.assertEqual(graph.steps["microphone"].status, "done")
+
+    def test_optional_failure(self):
+        """A failing optional step only skips the steps that require it."""
+        graph = StartupGraph()
+        graph.add("metrics", self.step("metrics", error=OSError("port in use")), essential=False)
+        graph.add("exporter", self.step("exporter"), requires=("metrics",))
+        graph.add("report", self.step("report"), requires=("exporter",))
+        graph.add("hotkeys", self.step("hotkeys"))
+
+        results = graph.run()
+        self.assertEqual(set(results), {"hotkeys"})
+        self.assertEqual(graph.steps["metrics"].status, "failed")
+        self.assertEqual(graph.steps["exporter"].status, "skipped")
+        self.assertEqual(graph.steps["report"].status, "skipped")
+
+    def test_deferred_steps(self):
+        """Deferred steps run in the background after the startup."""
+        release = threading.Event()
+        graph = StartupGraph()
+        graph.add("connect", self.step("connect"))
+        graph.add("history", release.wait, deferred=True)
+
+        graph.run()
+        self.assertEqual(graph.steps["history"].status, "running")
+        release.set()
+        graph.deferred_thread.join(timeout=2)
+        self.assertEqual(graph.steps["history"].status, "done")
+
+    def test_invalid_graphs(self):
+        """Unknown requirements and cycles are rejected before running."""
+        graph = StartupGraph()
+        graph.add("connect", self.step("connect"), requires=("server",))
+        with self.assertRaises(ValueError):
+            graph.run()
+
+        graph = StartupGraph()
+        graph.add("a", self.step("a"), requires=("b",))
+        graph.add("b", self.step("b"), requires=("a",))
+        with self.assertRaises(ValueError):
+            graph.run()
+        self.assertEqual(self.finished, [])
+
+        with self.assertRaises(ValueError):
+            graph.add("a", self.step("a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,10 @@
 """
 Text Buffer Test Script
-Version: 1.0
-Timestamp: 2025-02-28 22:21 CET
+Version: 1.1
+Timestamp: 2026-10-19 17:35 CET
 """
 
 import sys
-import time
 import unittest
 from pathlib import Path
 
@@ -14,6 +13,7 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 import config
+from src.clock import FakeClock
 from src.text import TextBuffer, TextSegment
 
 
@@ -23,7 +23,8 @@ class TextBufferTest(unittest.TestCase):
     def setUp(self):
         """Set up test environment."""
         # Use a smaller buffer size and age for testing
-        self.buffer = TextBuffer(max_size=10, max_age=5.0)
+        self.clock = FakeClock()
+        self.buffer = TextBuffer(max_size=10, max_age=5.0, clock=self.clock)
 
     def test_add_segment(self):
         """Test adding segments to the buffer."""
@@ -138,7 +139,7 @@ class TextBufferTest(unittest.TestCase):
         self.buffer.add_segment("Segment 2")
 
         # Wait for segments to age
-        time.sleep(6.0)  # Longer than max_age
+        self.clock.advance(6.0)  # Longer than max_age
 
         # Add a new segment to trigger cleanup
         self.buffer.add_segment("Segment 3")
@@ -1,10 +1,11 @@
 """
 Tumbling Window Integration Test
-Version: 1.0
-Timestamp: 2025-02-28 23:10 CET
+Version: 1.3
+Timestamp: 2026-10-19 23:20 CET
 
 This module tests the integration of the Tumbling Window implementation
-for audio processing in the WhisperClient.
+for audio processing in the WhisperClient, including the exact-once mode
+that sends every captured sample once.
 """
 
 import sys
@@ -22,12 +23,33 @@ sys.path.insert(0, str(project_root))
 
 import config
 from src import logging
-from src.audio import AudioProcessor, TumblingWindow
+from src.audio import AudioManager, AudioProcessor, AudioSource, SyntheticSource, TumblingWindow
 
 # Configure logger
 logger = logging.get_logger()
 
 
+class GapSource(AudioSource):
+    """Finite noise source that loses one chunk without filling it."""
+
+    def __init__(self, lost_chunk, total_chunks, chunk=1000):
+        super().__init__(16000, chunk, realtime=False)
+        self.fill_gaps = False
+        self.lost_chunk = lost_chunk
+        self.total_chunks = total_chunks
+        self.rng = np.random.default_rng(0)
+        self.index = 0
+
+    def _read_frames(self):
+        if self.index == self.lost_chunk:
+            self._record_gap(self.chunk, "overflow")
+            self.index += 1
+        if self.index >= self.total_chunks:
+            return b""
+        self.index += 1
+        return self.rng.integers(-32768, 32768, self.chunk, dtype=np.int16).tobytes()
+
+
 class TumblingWindowTest(unittest.TestCase):
     """Tests for the TumblingWindow class."""
 
@@ -248,10 +270,9 @@ class AudioProcessorIntegrationTest(unittest.TestCase):
         # Verify TumblingWindow is initialized
         self.assertIsNotNone(self.audio_processor.tumbling_window)
 
-        # Create a simple sine wave
+        # Create a simple sine wave as the AudioManager delivers it
         samples = 5000
-        audio = np.sin(2 * np.pi * 440 * np.linspace(0, 1, samples))
-        audio = (audio * 32767).astype(np.int16)
+        audio = np.sin(2 * np.pi * 440 * np.linspace(0, 1, samples)).astype(np.float32)
 
         # Process audio
         self.audio_processor.process_audio(audio.tobytes())
@@ -260,5 +281,115 @@ class AudioProcessorIntegrationTest(unittest.TestCase):
         self.assertGreater(len(self.audio_processor.processed_windows), 0)
 
 
+class ExactOnceTest(unittest.TestCase):
+    """Tests for the exact-once mode of the TumblingWindow."""
+
+    def setUp(self):
+        """Ramp audio, so every sample is identifiable."""
+        self.audio = np.arange(10000, dtype=np.int16)
+        self.window = TumblingWindow(window_size=2048, overlap=0.25, exact_once=True)
+
+    def test_every_sample_is_sent_once(self):
+        """Windows and the flushed rest together are exactly the input."""
+        for start in range(0, len(self.audio), 700):
+            self.window.add_chunk(self.audio[start : start + 700])
+        windows = list(self.window.get_windows())
+        self.assertEqual(len(windows), 10000 // 2048)
+
+        rest = self.window.flush()
+        self.assertEqual(len(rest), 10000 % 2048)
+        np.testing.assert_array_equal(np.concatenate(windows + [rest]), self.audio)
+        self.assertEqual(len(self.window.flush()), 0)
+
+    def test_overlap_mode_resends_samples(self):
+        """With overlapping windows the overlap is sent twice."""
+        window = TumblingWindow(window_size=2048, overlap=0.25)
+        window.add_chunk(self.audio)
+        sent = sum(len(w) for w in window.get_windows()) + len(window.flush())
+        self.assertGreater(sent, len(self.audio) * 1.2)
+
+    def test_crossfade_at_discontinuity(self):
+        """A discontinuity crossfades the next window without adding samples."""
+        self.window.add_chunk(self.audio[:2048])
+        first = next(self.window.get_windows())
+        self.window.mark_discontinuity()
+        self.window.add_chunk(np.zeros(4096, dtype=np.int16))
+        second, third = list(self.window.get_windows())
+
+        overlap = self.window.overlap_size
+        fade_out = np.linspace(1, 0, overlap)
+        expected = (first[-overlap:] * fade_out).astype(np.int16)
+        np.testing.assert_array_equal(second[:overlap], expected)
+        self.assertEqual(len(second), 2048)
+        # Continuous audio after the discontinuity is not crossfaded
+        np.testing.assert_array_equal(third, np.zeros(2048, dtype=np.int16))
+
+    def test_samples_sent_equal_samples_captured(self):
+        """Recording through AudioManager and AudioProcessor sends each sample once."""
+        captured = []
+        sent = []
+        processor = AudioProcessor()
+        processor.tumbling_window = TumblingWindow(exact_once=True, dtype=np.float32)
+        manager = AudioManager(
+            source=SyntheticSource("noise", duration=2.3, realtime=False, chunk=1000)
+        )
+
+        def on_audio(data):
+            captured.append(data)
+            processor.process_audio(data)
+
+        processor.start_processing(sent.append)
+        manager.start_recording(on_audio)
+        self.assertTrue(manager.wait_until_finished(timeout=10))
+        manager.stop_recording()
+        processor.stop_processing()
+        manager.cleanup()
+
+        self.assertEqual(sum(len(data) for data in captured), int(2.3 * 16000) * 4)
+        self.assertEqual(b"".join(sent), b"".join(captured))
+
+    def test_crossfade_at_unfilled_gap(self):
+        """An unfilled capture gap ends a window and crossfades the float32 audio after it."""
+        captured = []
+        sent = []
+        processor = AudioProcessor()
+        processor.tumbling_window = TumblingWindow(exact_once=True, dtype=np.float32)
+        manager = AudioManager(source=GapSource(lost_chunk=37, total_chunks=60))
+
+        def on_audio(data):
+            captured.append(data)
+            processor.process_audio(data)
+
+        processor.start_processing(sent.append)
+        manager.start_recording(on_audio, processor.mark_discontinuity)
+        self.assertTrue(manager.wait_until_finished(timeout=10))
+        manager.stop_recording()
+        processor.stop_processing()
+        manager.cleanup()
+
+        captured = np.frombuffer(b"".join(captured), dtype=np.float32)
+        windows = [np.frombuffer(window, dtype=np.float32) for window in sent]
+        audio = np.concatenate(windows)
+        gap = 37 * 1000
+        self.assertEqual(len(captured), 59 * 1000)
+        self.assertEqual(len(audio), len(captured))
+        self.assertTrue(np.all(np.isfinite(audio)))
+        self.assertLessEqual(np.max(np.abs(audio)), 1.0)
+
+        # The audio up to the gap is sent unchanged and ends a window
+        ends = np.cumsum([len(window) for window in windows])
+        self.assertIn(gap, ends)
+        np.testing.assert_array_equal(audio[:gap], captured[:gap])
+
+        # The window after the gap fades in over the tail of the one before it
+        before = windows[list(ends).index(gap)]
+        size = min(processor.tumbling_window.overlap_size, len(before))
+        fade_out = np.linspace(1, 0, size, dtype=np.float32)
+        fade_in = np.linspace(0, 1, size, dtype=np.float32)
+        expected = before[-size:] * fade_out + captured[gap : gap + size] * fade_in
+        np.testing.assert_allclose(audio[gap : gap + size], expected, rtol=1e-6)
+        np.testing.assert_array_equal(audio[gap + size :], captured[gap + size :])
+
+
 if __name__ == "__main__":
     unittest.main()
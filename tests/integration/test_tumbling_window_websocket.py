@@ -1,7 +1,7 @@
 """
 Tumbling Window WebSocket Integration Test
-Version: 1.1
-Timestamp: 2025-04-20 17:39 CET
+Version: 1.2
+Timestamp: 2026-10-19 23:20 CET
 
 This module tests the integration of the Tumbling Window with the WebSocket client
 to ensure proper audio processing flow in the WhisperClient.
@@ -1,7 +1,7 @@
 """
 WebSocket Connection State Tracking Test
-Version: 1.1
-Timestamp: 2025-04-20 17:36 CET
+Version: 1.2
+Timestamp: 2026-10-19 21:10 CET
 
 This module tests the connection state tracking system implemented in the WebSocket client
 to ensure proper state transitions, reconnection behavior, and error handling.
@@ -29,18 +29,21 @@ logger = logging.get_logger()
 class MockWebSocketApp:
     """Mock WebSocketApp for testing."""
 
-    def __init__(self, url, on_open=None, on_message=None, on_error=None, on_close=None):
+    def __init__(
+        self, url, on_open=None, on_message=None, on_error=None, on_close=None, on_pong=None
+    ):
         self.url = url
         self.on_open = on_open
         self.on_message = on_message
         self.on_error = on_error
         self.on_close = on_close
+        self.on_pong = on_pong
         self.sock = None
         self.connected = False
         self.closed = False
         self.messages_sent = []
 
-    def run_forever(self):
+    def run_forever(self, ping_interval=0, ping_timeout=None):
         """Simulate running the WebSocket."""
         self.sock = MagicMock()
         self.sock.connected = True
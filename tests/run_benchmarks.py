@@ -0,0 +1,74 @@
+"""
+Benchmark Runner for the Whisper Client
+Version: 1.0
+Timestamp: 2026-10-19 14:05 CET
+
+Runs the hot path benchmarks in tests/benchmarks with pytest-benchmark and
+compares them against the stored baseline of this machine. A benchmark whose
+median regresses by more than the threshold fails the run, so the script can
+be used as a CI step. The median is used because it is far less sensitive to
+scheduler noise on shared CI runners than the mean.
+
+Usage:
+    python tests/run_benchmarks.py                  # compare against the latest baseline
+    python tests/run_benchmarks.py --save main      # store a new baseline
+    python tests/run_benchmarks.py --threshold median:10%
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import pytest
+
+BENCHMARK_DIR = Path(__file__).parent / "benchmarks"
+BASELINE_DIR = BENCHMARK_DIR / "baselines"
+DEFAULT_THRESHOLD = "median:30%"
+
+
+def has_baseline():
+    """Checks if any baseline has been stored (one subdirectory per machine)."""
+    return any(BASELINE_DIR.glob("*/*.json"))
+
+
+def build_args(save=None, compare=True, threshold=DEFAULT_THRESHOLD, extra=()):
+    """Builds the pytest arguments for a benchmark run."""
+    args = [
+        str(BENCHMARK_DIR),
+        "--no-cov",
+        "--benchmark-only",
+        f"--benchmark-storage=file://{BASELINE_DIR.resolve()}",
+        "--benchmark-sort=name",
+    ]
+    if save:
+        args.append(f"--benchmark-save={save}")
+    if compare and has_baseline():
+        args += ["--benchmark-compare", f"--benchmark-compare-fail={threshold}"]
+    return args + list(extra)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the hot path benchmarks")
+    parser.add_argument("--save", metavar="NAME", help="Store the results as new baseline")
+    parser.add_argument("--no-compare", action="store_true", help="Skip the baseline comparison")
+    parser.add_argument(
+        "--threshold",
+        default=DEFAULT_THRESHOLD,
+        help="Allowed regression, e.g. median:10%% or min:0.001 (default: %(default)s)",
+    )
+    args, extra = parser.parse_known_args()
+
+    try:
+        import pytest_benchmark  # noqa: F401
+    except ImportError:
+        print("pytest-benchmark is not installed (pip install -r requirements-dev.txt)")
+        return 1
+
+    if not args.no_compare and not has_baseline():
+        print(f"No baseline in {BASELINE_DIR}, run with --save to create one")
+
+    return pytest.main(build_args(args.save, not args.no_compare, args.threshold, extra))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,7 @@
 """
 Alpha Test Script for WhisperClient
-Version: 1.1
-Timestamp: 2025-04-20 17:34 CET
+Version: 1.3
+Timestamp: 2026-10-19 23:05 CET
 
 This script provides a simple test to verify the basic functionality of the WhisperClient.
 It checks if the WhisperLive server is running, initializes the client, records a short
@@ -27,6 +27,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src import logger
 from src.audio import AudioManager, AudioProcessor
+from src.logging import get_logger
 from src.text import TextManager
 from src.utils import check_server_status
 from src.ws_client import ConnectionState, WhisperWebSocket
@@ -57,6 +58,7 @@ class AlphaTest:
 
         # Set callbacks
         self.websocket.set_text_callback(self.on_text_segments)
+        self.websocket.set_replay_callback(self.audio_processor.mark_discontinuity)
 
         # Event to signal test completion
         self.test_complete = threading.Event()
@@ -135,7 +137,9 @@ class AlphaTest:
         self.websocket.start_processing()
 
         # Start recording
-        self.audio_manager.start_recording(self.on_audio_data)
+        self.audio_manager.start_recording(
+            self.on_audio_data, self.audio_processor.mark_discontinuity
+        )
         self.test_results["recording"] = True
 
         # Wait for the specified duration
@@ -252,6 +256,8 @@ class AlphaTest:
 
 def main():
     """Main function."""
+    get_logger()
+
     # Parse command line arguments
     import argparse
 
@@ -0,0 +1,532 @@
+"""
+Fake WhisperLive Server
+Version: 1.2
+Timestamp: 2026-10-19 22:05 CET
+
+This module provides a scriptable stand-in for the WhisperLive server so that
+the client can be tested and benchmarked without a GPU server or microphone.
+It speaks the protocol described in docs/websocket_protocol.md over a minimal
+stdlib RFC 6455 implementation:
+
+    client -> config (JSON text frame)
+    server -> {"uid": ..., "message": "SERVER_READY"}
+    client -> audio (binary frames, float32 samples)
+    server -> {"uid": ..., "segments": [...]}   (cumulative, last N segments)
+    client -> END_OF_AUDIO
+    server -> remaining segments, {"uid": ..., "message": "END_OF_AUDIO_RECEIVED"}
+
+Transcripts come from a script of sentences that is "recognized" word by word
+as audio arrives. Per-message latency and jitter, the segment revision
+pattern and failure injection are configured with FakeServerConfig; a seeded
+random generator keeps every run reproducible.
+
+Usage:
+    python tools/fake_server.py --port 9090 --latency 0.2 --jitter 0.05
+
+In tests:
+    with FakeWhisperServer(FakeServerConfig(latency=0.05)) as server:
+        ws = WhisperWebSocket(url=server.url)
+"""
+
+import base64
+import hashlib
+import json
+import os
+import queue
+import random
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+# Add parent directory to path to import from main project
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import logger
+from src.logging import get_logger, log_connection, log_debug, log_error, log_info
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OPCODE_CONTINUATION = 0x0
+OPCODE_TEXT = 0x1
+OPCODE_BINARY = 0x2
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+# Revision patterns for the segment currently being "recognized"
+REVISION_APPEND = "append"  # Partial segment grows word by word
+REVISION_REVISE = "revise"  # Newest word first appears truncated, corrected next update
+REVISION_STABLE = "stable"  # Only completed sentences are sent
+REVISION_PATTERNS = (REVISION_APPEND, REVISION_REVISE, REVISION_STABLE)
+
+DEFAULT_SCRIPT = (
+    "Das ist ein Test.",
+    "Der Server antwortet mit kumulativen Segmenten.",
+    "Jeder Satz wird Wort für Wort erkannt.",
+)
+
+
+@dataclass
+class FakeServerConfig:
+    """Behavior of the fake server."""
+
+    script: List[str] = field(default_factory=lambda: list(DEFAULT_SCRIPT))
+    word_duration: float = 0.4  # Seconds of audio per recognized word
+    sample_rate: int = 16000
+    bytes_per_sample: int = 4  # The client sends float32 samples
+    latency: float = 0.0  # Delay of every server message in seconds
+    jitter: float = 0.0  # Uniform +/- jitter added to the latency
+    revision_pattern: str = REVISION_APPEND
+    send_last_n_segments: int = 10  # Segments repeated in every update
+    seed: int = 0
+
+    # Failure injection
+    refuse_connections: int = 0  # Close the first N connections before the handshake
+    skip_server_ready: bool = False  # Never send SERVER_READY
+    drop_after_audio_messages: Optional[int] = None  # Abort the TCP connection
+    stall_after_audio_messages: Optional[int] = None  # Stop sending anything
+    # Stop answering entirely, pings included, like a half-open connection
+    blackhole_after_audio_messages: Optional[int] = None
+    error_after_audio_messages: Optional[int] = None  # Send a WhisperLive error and close
+    close_after_end_of_audio: bool = False  # Close normally after the final messages
+
+
+@dataclass
+class FakeSession:
+    """Record of one client connection, for assertions in tests."""
+
+    uid: Optional[str] = None
+    client_config: Optional[dict] = None
+    audio_bytes: int = 0
+    audio_messages: int = 0
+    end_of_audio: bool = False
+    sent_messages: List[dict] = field(default_factory=list)
+    connected_at: float = field(default_factory=time.time)
+    closed_at: Optional[float] = None
+
+
+class _ConnectionClosed(Exception):
+    """Raised when the peer closed the TCP connection."""
+
+
+class _WebSocketConnection:
+    """Server side of a single RFC 6455 connection."""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.send_lock = threading.Lock()
+        self.closed = False
+
+    def _recv_exact(self, size):
+        data = bytearray()
+        while len(data) < size:
+            chunk = self.sock.recv(size - len(data))
+            if not chunk:
+                raise _ConnectionClosed()
+            data.extend(chunk)
+        return bytes(data)
+
+    def handshake(self):
+        """Read the HTTP upgrade request and accept it."""
+        request = bytearray()
+        while b"\r\n\r\n" not in request:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                raise _ConnectionClosed()
+            request.extend(chunk)
+
+        headers = {}
+        for line in request.decode("latin-1").split("\r\n")[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        key = headers.get("sec-websocket-key")
+        if not key:
+            self.sock.sendall(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n")
+            raise _ConnectionClosed()
+
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        self.sock.sendall(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\n"
+                "Connection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+            ).encode()
+        )
+
+    def read_message(self):
+        """Returns (opcode, payload) of the next complete message."""
+        message_opcode = None
+        fragments = []
+        while True:
+            first, second = self._recv_exact(2)
+            fin = first & 0x80
+            opcode = first & 0x0F
+            length = second & 0x7F
+            if length == 126:
+                (length,) = struct.unpack("!H", self._recv_exact(2))
+            elif length == 127:
+                (length,) = struct.unpack("!Q", self._recv_exact(8))
+            mask = self._recv_exact(4) if second & 0x80 else None
+            payload = self._recv_exact(length) if length else b""
+            if mask and payload:
+                # XOR the whole payload at once instead of byte by byte
+                key = (mask * (length // 4 + 1))[:length]
+                payload = (int.from_bytes(payload, "big") ^ int.from_bytes(key, "big")).to_bytes(
+                    length, "big"
+                )
+
+            if opcode >= OPCODE_CLOSE:
+                # Control frames may be interleaved with fragments
+                return opcode, payload
+            if opcode != OPCODE_CONTINUATION:
+                message_opcode = opcode
+            fragments.append(payload)
+            if fin:
+                return message_opcode, b"".join(fragments)
+
+    def send_frame(self, opcode, payload=b""):
+        """Send a single unmasked frame."""
+        length = len(payload)
+        if length < 126:
+            header = struct.pack("!BB", 0x80 | opcode, length)
+        elif length < 1 << 16:
+            header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+        else:
+            header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+        with self.send_lock:
+            if self.closed:
+                return
+            self.sock.sendall(header + payload)
+
+    def close(self, code=1000, reason=""):
+        """Send a close frame and shut the socket down."""
+        try:
+            self.send_frame(OPCODE_CLOSE, struct.pack("!H", code) + reason.encode("utf-8"))
+        except OSError:
+            pass
+        self.abort()
+
+    def abort(self):
+        """Drop the TCP connection without a close handshake."""
+        with self.send_lock:
+            if self.closed:
+                return
+            self.closed = True
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class _TranscriptScript:
+    """Turns received audio duration into cumulative WhisperLive segments."""
+
+    def __init__(self, server_config: FakeServerConfig):
+        self.config = server_config
+        self.words = []  # (sentence_index, word)
+        for index, sentence in enumerate(server_config.script):
+            self.words.extend((index, word) for word in sentence.split())
+        self.recognized = 0
+
+    def update(self, audio_seconds, final=False):
+        """Returns the segments to send, or None if nothing changed."""
+        recognized = len(self.words)
+        if not final:
+            recognized = min(recognized, int(audio_seconds / self.config.word_duration))
+        if recognized <= self.recognized and not final:
+            return None
+        self.recognized = recognized
+        segments = self._segments(final)
+        return segments[-self.config.send_last_n_segments :] if segments else None
+
+    def _segments(self, final):
+        duration = self.config.word_duration
+        segments = []
+        position = 0
+        for index, sentence in enumerate(self.config.script):
+            sentence_words = [word for i, word in self.words if i == index]
+            start = position
+            position += len(sentence_words)
+            visible = min(len(sentence_words), max(0, self.recognized - start))
+            if not visible:
+                break
+
+            completed = visible == len(sentence_words)
+            if not completed and self.config.revision_pattern == REVISION_STABLE:
+                break
+
+            words = sentence_words[:visible]
+            if (
+                not completed
+                and not final
+                and self.config.revision_pattern == REVISION_REVISE
+                and len(words[-1]) > 1
+            ):
+                words = words[:-1] + [words[-1][: len(words[-1]) // 2]]
+
+            segments.append(
+                {
+                    "start": f"{start * duration:.3f}",
+                    "end": f"{(start + visible) * duration:.3f}",
+                    "text": " " + " ".join(words),
+                    "completed": completed,
+                }
+            )
+        return segments
+
+
+class _SessionHandler(socketserver.BaseRequestHandler):
+    """Runs one client session."""
+
+    def setup(self):
+        self.fake: "FakeWhisperServer" = self.server.fake  # type: ignore [attr-defined]
+        self.config = self.fake.config
+        self.session = FakeSession()
+        self.outgoing: "queue.Queue" = queue.Queue()
+        self.stalled = False
+        self.blackholed = False
+        self.send_wait = threading.Event()  # Never set; waiting on it delays a message
+        self.last_due = 0.0
+
+    def handle(self):
+        if self.fake._refuse_connection():
+            log_connection(logger, "Fake server: refusing connection")
+            self.request.close()
+            return
+
+        self.connection = _WebSocketConnection(self.request)
+        sender = threading.Thread(target=self._send_loop, name="FakeServerSender")
+        sender.daemon = True
+        try:
+            self.connection.handshake()
+            self.fake._add_session(self.session)
+            sender.start()
+            self._receive_loop()
+        except (_ConnectionClosed, OSError):
+            pass
+        except Exception as e:
+            log_error(logger, "Fake server error: %s", e)
+        finally:
+            self.session.closed_at = time.time()
+            self.outgoing.put(None)
+            if sender.is_alive():
+                sender.join(timeout=1.0)
+            self.connection.abort()
+
+    def _receive_loop(self):
+        script = _TranscriptScript(self.config)
+        while True:
+            opcode, payload = self.connection.read_message()
+            if self.blackholed:
+                continue
+            if opcode == OPCODE_CLOSE:
+                self.connection.close()
+                return
+            if opcode == OPCODE_PING:
+                self.connection.send_frame(OPCODE_PONG, payload)
+                continue
+            if opcode == OPCODE_PONG:
+                continue
+
+            if self.session.client_config is None and opcode == OPCODE_TEXT:
+                self._on_config(json.loads(payload.decode("utf-8")))
+                continue
+
+            if payload == b"END_OF_AUDIO":
+                self.session.end_of_audio = True
+                segments = script.update(self._audio_seconds(), final=True)
+                if segments:
+                    self._queue({"uid": self.session.uid, "segments": segments})
+                self._queue({"uid": self.session.uid, "message": "END_OF_AUDIO_RECEIVED"})
+                if self.config.close_after_end_of_audio:
+                    self._queue("close")
+                continue
+
+            self.session.audio_bytes += len(payload)
+            self.session.audio_messages += 1
+            if self._inject_failure():
+                return
+
+            segments = script.update(self._audio_seconds())
+            if segments:
+                self._queue({"uid": self.session.uid, "segments": segments})
+
+    def _on_config(self, client_config):
+        self.session.client_config = client_config
+        self.session.uid = client_config.get("uid")
+        log_connection(logger, "Fake server: client %s configured", self.session.uid)
+        if not self.config.skip_server_ready:
+            self._queue(
+                {"uid": self.session.uid, "message": "SERVER_READY", "backend": "fake_whisper"}
+            )
+
+    def _audio_seconds(self):
+        return self.session.audio_bytes / self.config.bytes_per_sample / self.config.sample_rate
+
+    def _inject_failure(self):
+        """Applies the configured failure; returns True if the session ends."""
+        count = self.session.audio_messages
+        if count == self.config.drop_after_audio_messages:
+            log_connection(logger, "Fake server: dropping connection")
+            self.connection.abort()
+            return True
+        if count == self.config.stall_after_audio_messages:
+            log_connection(logger, "Fake server: stalling")
+            self.stalled = True
+        if count == self.config.blackhole_after_audio_messages:
+            log_connection(logger, "Fake server: no longer answering")
+            self.stalled = True
+            self.blackholed = True
+        if count == self.config.error_after_audio_messages:
+            self._queue(
+                {"uid": self.session.uid, "status": "ERROR", "message": "Injected server error"}
+            )
+            self._queue("close")
+        return False
+
+    def _queue(self, message):
+        """Schedule a message (or "close") after the configured latency."""
+        delay = self.config.latency
+        if self.config.jitter:
+            delay += self.fake._random.uniform(-self.config.jitter, self.config.jitter)
+        # Messages keep their order even if the jitter would reorder them
+        self.last_due = max(self.last_due, time.time() + max(0.0, delay))
+        self.outgoing.put((self.last_due, message))
+
+    def _send_loop(self):
+        while True:
+            item = self.outgoing.get()
+            if item is None:
+                return
+            due, message = item
+            wait = due - time.time()
+            if wait > 0:
+                self.send_wait.wait(wait)
+            if self.stalled:
+                continue
+            try:
+                if message == "close":
+                    self.connection.close()
+                    return
+                self.connection.send_frame(OPCODE_TEXT, json.dumps(message).encode("utf-8"))
+                self.session.sent_messages.append(message)
+            except OSError:
+                return
+
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class FakeWhisperServer:
+    """In-process fake WhisperLive server."""
+
+    def __init__(self, server_config: Optional[FakeServerConfig] = None, host="127.0.0.1", port=0):
+        """Initialize the server.
+
+        Args:
+            server_config: Behavior of the server (defaults to FakeServerConfig())
+            host: Bind address
+            port: Bind port (0 picks a free port, see url)
+
+        """
+        self.config = server_config or FakeServerConfig()
+        if self.config.revision_pattern not in REVISION_PATTERNS:
+            raise ValueError(f"Unknown revision pattern: {self.config.revision_pattern}")
+        self.host = host
+        self.port = port
+        self.sessions: List[FakeSession] = []
+        self.connection_attempts = 0
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._server: Optional[_ThreadingServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self):
+        """WebSocket URL of the running server."""
+        host, port = self._server.server_address[:2] if self._server else (self.host, self.port)
+        return f"ws://{host}:{port}"
+
+    def _refuse_connection(self):
+        with self._lock:
+            self.connection_attempts += 1
+            return self.connection_attempts <= self.config.refuse_connections
+
+    def _add_session(self, session):
+        with self._lock:
+            self.sessions.append(session)
+
+    def start(self):
+        """Start serving in a background thread."""
+        self._server = _ThreadingServer((self.host, self.port), _SessionHandler)
+        self._server.fake = self  # type: ignore [attr-defined]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="FakeWhisperServer")
+        self._thread.daemon = True
+        self._thread.start()
+        log_info(logger, "Fake WhisperLive server listening on %s", self.url)
+        return self
+
+    def stop(self):
+        """Stop serving."""
+        if not self._server:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+        self._server = None
+        self._thread = None
+        log_debug(logger, "Fake WhisperLive server stopped")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def main():
+    """Run the fake server from the command line."""
+    import argparse
+
+    get_logger()
+
+    parser = argparse.ArgumentParser(description="Run a fake WhisperLive server")
+    parser.add_argument("--host", default="localhost", help="Bind address")
+    parser.add_argument("--port", type=int, default=9090, help="Bind port")
+    parser.add_argument("--latency", type=float, default=0.0, help="Message latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Latency jitter in seconds")
+    parser.add_argument("--revision", choices=REVISION_PATTERNS, default=REVISION_APPEND)
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the jitter")
+    parser.add_argument("--script", help="Text file with one sentence per line")
+    args = parser.parse_args()
+
+    server_config = FakeServerConfig(
+        latency=args.latency, jitter=args.jitter, revision_pattern=args.revision, seed=args.seed
+    )
+    if args.script:
+        with open(args.script, encoding="utf-8") as f:
+            server_config.script = [line.strip() for line in f if line.strip()]
+
+    server = FakeWhisperServer(server_config, host=args.host, port=args.port).start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
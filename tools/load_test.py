@@ -0,0 +1,318 @@
+"""
+Multi-Client Load Generator
+Version: 1.4
+Timestamp: 2026-10-19 23:05 CET
+
+This script runs N concurrent client sessions through the real client stack
+(AudioManager -> AudioProcessor -> WhisperWebSocket) against a WhisperLive
+server or the local fake server and reports how the client behaves at scale:
+
+- connect time per session
+- send throughput (audio bytes handed to the WebSocket)
+- message latency percentiles (segment received minus send time of the
+  audio frame that contained the segment's end)
+- CPU time and RSS of the process, in total and per session
+
+All sessions run as threads in this process, so CPU and memory are measured
+for the process and divided by the number of sessions (RSS via
+src.profiling.process_rss, see there).
+
+Usage:
+    python tools/load_test.py --sessions 8 --duration 30 --fake-server
+    python tools/load_test.py --sessions 4 --file sample.wav --url ws://gpu-host:9090
+    python tools/load_test.py --sessions 16 --speed 4 --fake-server --json report.json
+    python tools/load_test.py --sessions 16 --fake-server --aggregate-bytes 16384
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+# Add parent directory to path to import from main project
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from src import logger
+from src.audio import AudioManager, AudioProcessor, FileSource, SyntheticSource
+from src.logging import get_logger, log_error, log_info
+from src.metrics import Histogram
+from src.profiling import process_rss
+from src.ws_client import WhisperWebSocket
+from src.ws_client.connection import ConnectionManager
+
+REPORT_PERCENTILES = (50, 90, 99)
+
+
+@dataclass
+class SessionStats:
+    """Measurements of one load session."""
+
+    index: int
+    connected: bool = False
+    connect_seconds: float = 0.0
+    stream_seconds: float = 0.0
+    bytes_sent: int = 0
+    messages: int = 0
+    latencies: List[float] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def send_throughput(self):
+        """Sent audio bytes per second of streaming."""
+        return self.bytes_sent / self.stream_seconds if self.stream_seconds else 0.0
+
+
+def _percentiles(values):
+    histogram = Histogram("load.latency")
+    for value in values:
+        histogram.record(value)
+    return {f"p{p}": histogram.percentile(p) for p in REPORT_PERCENTILES}
+
+
+class LoadGenerator:
+    """Runs concurrent client sessions and aggregates their measurements."""
+
+    def __init__(
+        self,
+        sessions=4,
+        url=None,
+        duration=10.0,
+        audio_file=None,
+        speed=1.0,
+        ramp_up=0.0,
+        aggregate_bytes=None,
+    ):
+        """Initialize the generator.
+
+        Args:
+            sessions: Number of concurrent sessions
+            url: Server URL (defaults to config.WS_URL)
+            duration: Seconds of audio each session streams
+            audio_file: Audio file to stream (looped when paced), synthetic
+                        noise if None
+            speed: Audio pacing as a multiple of real time (0 = unpaced)
+            ramp_up: Seconds over which the session starts are spread
+            aggregate_bytes: Frame aggregation target of the sessions
+                             (defaults to config.WS_AGGREGATE_BYTES, 0 = off)
+
+        """
+        self.sessions = max(1, sessions)
+        self.url = url
+        self.duration = duration
+        self.audio_file = audio_file
+        self.speed = speed
+        self.ramp_up = ramp_up
+        self.aggregate_bytes = aggregate_bytes
+
+    def _create_source(self, index):
+        realtime = self.speed > 0
+        speed = self.speed or 1.0
+        if self.audio_file:
+            # Paced files loop until the duration is over, unpaced ones play once
+            return FileSource(self.audio_file, realtime=realtime, speed=speed, loop=realtime)
+        return SyntheticSource(
+            "noise", duration=self.duration, realtime=realtime, speed=speed, seed=index
+        )
+
+    def _run_session(self, stats: SessionStats):
+        websocket = WhisperWebSocket(url=self.url, aggregate_bytes=self.aggregate_bytes)
+        processor = AudioProcessor()
+        audio_manager = None
+
+        def on_text(segments):
+            stats.messages += 1
+            trace = segments[-1].get("trace")
+            if trace:
+                stats.latencies.append(trace["received_at"] - trace["sent_at"])
+
+        def on_window(window):
+            if websocket.send_audio(window, capture_time=processor.last_capture_time):
+                stats.bytes_sent += len(window)
+
+        websocket.set_text_callback(on_text)
+        websocket.set_replay_callback(processor.mark_discontinuity)
+        try:
+            source = self._create_source(stats.index)
+            audio_manager = AudioManager(source=source)
+
+            connect_start = time.perf_counter()
+            stats.connected = websocket.connect()
+            stats.connect_seconds = time.perf_counter() - connect_start
+            if not stats.connected:
+                raise RuntimeError("Could not connect to server")
+            websocket.start_processing()
+
+            stream_start = time.perf_counter()
+            processor.start_processing(on_window)
+            audio_manager.start_recording(processor.process_audio, processor.mark_discontinuity)
+            # Paced files loop, so the duration is enforced here
+            wall_limit = self.duration / self.speed if self.speed > 0 else None
+            if not audio_manager.wait_until_finished(timeout=wall_limit):
+                audio_manager.stop_recording()
+            processor.wait_until_idle()
+            stats.stream_seconds = time.perf_counter() - stream_start
+
+            websocket.stop_processing()
+        except Exception as e:
+            stats.error = str(e)
+            log_error(logger, "⚠️ Load session %d failed: %s", stats.index, e)
+        finally:
+            processor.stop_processing()
+            if audio_manager:
+                audio_manager.cleanup()
+            websocket.cleanup()
+            ConnectionManager.unregister_instance(websocket.client_id)
+
+    def run(self):
+        """Runs all sessions and returns the report."""
+        stats = [SessionStats(index=i) for i in range(self.sessions)]
+        threads = [
+            threading.Thread(target=self._run_session, args=(s,), name=f"LoadSession-{s.index}")
+            for s in stats
+        ]
+        log_info(
+            logger,
+            "🚀 Starting %d sessions against %s (%.0fs audio each)",
+            self.sessions,
+            self.url or config.WS_URL,
+            self.duration,
+        )
+
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        for i, thread in enumerate(threads):
+            thread.start()
+            if self.ramp_up and i < len(threads) - 1:
+                time.sleep(self.ramp_up / (len(threads) - 1))
+        for thread in threads:
+            thread.join()
+        wall_seconds = time.perf_counter() - wall_start
+        cpu_seconds = time.process_time() - cpu_start
+
+        return self._report(stats, wall_seconds, cpu_seconds, process_rss())
+
+    def _report(self, stats, wall_seconds, cpu_seconds, rss):
+        connected = [s for s in stats if s.connected]
+        latencies = [latency for s in stats for latency in s.latencies]
+        total_bytes = sum(s.bytes_sent for s in stats)
+        return {
+            "sessions": self.sessions,
+            "connected": len(connected),
+            "failed": sum(1 for s in stats if s.error),
+            "wall_seconds": wall_seconds,
+            "connect_seconds": _percentiles([s.connect_seconds for s in connected]),
+            "send_throughput": {
+                "total_bytes_per_second": total_bytes / wall_seconds if wall_seconds else 0.0,
+                "per_session": _percentiles([s.send_throughput for s in connected]),
+            },
+            "messages": sum(s.messages for s in stats),
+            "message_latency": _percentiles(latencies),
+            "cpu": {
+                "seconds": cpu_seconds,
+                "percent": 100.0 * cpu_seconds / wall_seconds if wall_seconds else 0.0,
+                "seconds_per_session": cpu_seconds / self.sessions,
+            },
+            "rss": {
+                "bytes": rss,
+                "bytes_per_session": rss / self.sessions if rss is not None else None,
+            },
+            "per_session": [
+                {
+                    "index": s.index,
+                    "connect_seconds": s.connect_seconds,
+                    "bytes_sent": s.bytes_sent,
+                    "send_throughput": s.send_throughput,
+                    "messages": s.messages,
+                    "message_latency": _percentiles(s.latencies),
+                    "error": s.error,
+                }
+                for s in stats
+            ],
+        }
+
+
+def format_report(report):
+    """Formats the report as a human readable summary."""
+
+    def ms(values):
+        return ", ".join(f"{name} {value * 1000:.1f}ms" for name, value in values.items())
+
+    rss = report["rss"]["bytes"]
+    lines = [
+        f"Sessions:        {report['connected']}/{report['sessions']} connected, "
+        f"{report['failed']} failed, {report['wall_seconds']:.1f}s",
+        f"Connect time:    {ms(report['connect_seconds'])}",
+        f"Send throughput: {report['send_throughput']['total_bytes_per_second'] / 1024:.1f} KiB/s "
+        f"total",
+        f"Messages:        {report['messages']}",
+        f"Msg latency:     {ms(report['message_latency'])}",
+        f"CPU:             {report['cpu']['seconds']:.2f}s ({report['cpu']['percent']:.1f}%), "
+        f"{report['cpu']['seconds_per_session']:.3f}s per session",
+        (
+            f"RSS:             {rss / 2**20:.1f} MiB, "
+            f"{report['rss']['bytes_per_session'] / 2**20:.2f} MiB per session"
+            if rss is not None
+            else "RSS:             n/a"
+        ),
+    ]
+    return "\n".join(lines)
+
+
+def main():
+    import argparse
+
+    get_logger()
+
+    parser = argparse.ArgumentParser(description="Run concurrent client sessions")
+    parser.add_argument("--sessions", type=int, default=4, help="Concurrent sessions")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of audio per session")
+    parser.add_argument("--file", help="Audio file to stream (default: synthetic noise)")
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="Multiple of real time (0 = unpaced)"
+    )
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Seconds to start all sessions")
+    parser.add_argument("--url", default=config.WS_URL, help="WhisperLive server URL")
+    parser.add_argument("--fake-server", action="store_true", help="Start a local fake server")
+    parser.add_argument("--json", help="Write the full report to this file")
+    parser.add_argument(
+        "--aggregate-bytes",
+        type=int,
+        help="Coalesce audio windows into frames of this size (0 = off)",
+    )
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if args.fake_server:
+        from tools.fake_server import FakeServerConfig, FakeWhisperServer
+
+        server = FakeWhisperServer(FakeServerConfig()).start()
+        url = server.url
+
+    try:
+        generator = LoadGenerator(
+            sessions=args.sessions,
+            url=url,
+            duration=args.duration,
+            audio_file=args.file,
+            speed=args.speed,
+            ramp_up=args.ramp_up,
+            aggregate_bytes=args.aggregate_bytes,
+        )
+        report = generator.run()
+    finally:
+        if server:
+            server.stop()
+
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Session Replay Tool
+Version: 1.2
+Timestamp: 2026-10-19 17:35 CET
+
+This script replays recorded WhisperLive sessions (see src/recording.py)
+through the client's text pipeline and prints the sentences the TextManager
+outputs. Recordings are created by the client when
+SESSION_RECORDING_ENABLED is set in config.py.
+
+Usage:
+    python tools/replay_session.py recordings/20261019-144000_1a2b3c4d.jsonl.gz
+    python tools/replay_session.py recordings/*.jsonl.gz --speed 0 --output out.txt
+
+With --speed 0 the text pipeline runs on a fake clock that follows the
+recorded timing, so sentence timeouts behave as in the live session.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path to import from main project
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.clock import FakeClock
+from src.logging import get_logger
+from src.recording import read_recording, replay_session
+from src.text import TextManager
+
+
+def replay(path, speed):
+    """Replays one recording and returns the output sentences."""
+    # Unpaced replays keep the recorded timing on a fake clock
+    text_manager = TextManager(test_mode=True, clock=FakeClock() if speed <= 0 else None)
+    start = time.perf_counter()
+    count = replay_session(path, text_manager, speed=speed)
+    duration = time.perf_counter() - start
+    sentences = text_manager.get_test_output()
+    header, _ = read_recording(path)
+    print(
+        f"# {path}: session {header.get('session_id')}, {count} messages, "
+        f"{len(sentences)} sentences in {duration:.2f}s"
+    )
+    return sentences
+
+
+def main():
+    get_logger()
+    parser = argparse.ArgumentParser(description="Replay recorded WhisperLive sessions")
+    parser.add_argument("recordings", nargs="+", help="Recording files (.jsonl.gz)")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Multiple of the original timing (0 = as fast as possible)",
+    )
+    parser.add_argument("--output", help="Write the sentences to this file")
+    args = parser.parse_args()
+
+    sentences = []
+    for path in args.recordings:
+        sentences.extend(replay(path, args.speed))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write("\n".join(sentences) + "\n")
+    else:
+        print("\n".join(sentences))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+"""
+Soak Test Runner
+Version: 1.3
+Timestamp: 2026-10-19 23:05 CET
+
+This script exercises the client for hours and reports resource trends. It
+drives the same components as main.py (one WhisperWebSocket, AudioManager,
+AudioProcessor and TextManager) through repeated recording cycles:
+
+    start processing -> stream file audio for --cycle seconds -> stop -> pause
+
+stop_processing() closes the connection like in the client, so every cycle
+also reconnects; every --cleanup-every cycles the full cleanup() path runs
+in addition. By default it runs against a local fake WhisperLive server.
+
+A sampler records thread count, RSS, open sockets, the processing queue
+depth, the tumbling window buffer, the text buffer and
+ConnectionManager.get_instance_count() every --sample-interval seconds. At the
+end every series is checked for monotonic growth: after a warm-up, the
+series is split into windows and flagged if the minimum of every window is
+above the minimum of the previous one and the total growth exceeds a
+threshold. Minima are used because memory and queues grow and shrink in a
+sawtooth; a leak raises the floor.
+
+Samples are written as CSV and the summary as JSON. The exit code is 1 if
+any series was flagged.
+
+Usage:
+    python tools/soak_test.py --duration 7200
+    python tools/soak_test.py --duration 14400 --file sample.wav --memory-profile
+    python tools/soak_test.py --duration 3600 --url ws://gpu-host:9090
+"""
+
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Add parent directory to path to import from main project
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import logger
+from src.audio import AudioManager, AudioProcessor, FileSource, SyntheticSource
+from src.logging import get_logger, log_error, log_info, log_warning
+from src.profiling import MemoryProfiler, open_sockets, process_rss
+from src.text import TextManager
+from src.ws_client import WhisperWebSocket
+from src.ws_client.connection import ConnectionManager
+
+# Series that are sampled and checked for growth
+SERIES = (
+    "threads",
+    "rss_bytes",
+    "sockets",
+    "queue_depth",
+    "window_buffer",
+    "text_buffer",
+    "ws_instances",
+)
+
+# Growth below these absolute amounts is never flagged
+MIN_GROWTH = {
+    "threads": 2,
+    "rss_bytes": 16 * 2**20,
+    "sockets": 2,
+    "queue_depth": 50,
+    "window_buffer": 16000,
+    "text_buffer": 50,
+    "ws_instances": 1,
+}
+
+
+@dataclass
+class GrowthResult:
+    """Trend of one sampled series."""
+
+    name: str
+    first: float
+    last: float
+    slope_per_hour: float
+    monotonic: bool
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "first": self.first,
+            "last": self.last,
+            "slope_per_hour": self.slope_per_hour,
+            "monotonic_growth": self.monotonic,
+        }
+
+
+def _slope(times, values):
+    """Least squares slope of values over times (per second)."""
+    n = len(times)
+    if n < 2:
+        return 0.0
+    mean_t = sum(times) / n
+    mean_v = sum(values) / n
+    denominator = sum((t - mean_t) ** 2 for t in times)
+    if not denominator:
+        return 0.0
+    return sum((t - mean_t) * (v - mean_v) for t, v in zip(times, values)) / denominator
+
+
+def detect_growth(name, times, values, windows=5, warmup=0.1, min_growth=0) -> GrowthResult:
+    """Checks a series for monotonic growth.
+
+    Args:
+        name: Series name
+        times: Sample times in seconds
+        values: Sample values
+        windows: Number of windows whose minima must rise
+        warmup: Fraction of samples skipped at the start
+        min_growth: Minimum total growth of the window minima to be flagged
+
+    """
+    points = [(t, v) for t, v in zip(times, values) if v is not None]
+    points = points[int(len(points) * warmup) :]
+    if len(points) < windows * 2:
+        first = points[0][1] if points else 0.0
+        last = points[-1][1] if points else 0.0
+        return GrowthResult(name, first, last, 0.0, False)
+
+    size = len(points) // windows
+    minima = [min(v for _, v in points[i * size : (i + 1) * size]) for i in range(windows)]
+    rising = all(b > a for a, b in zip(minima, minima[1:]))
+    monotonic = rising and minima[-1] - minima[0] > min_growth
+    slope = _slope([t for t, _ in points], [v for _, v in points]) * 3600
+    return GrowthResult(name, points[0][1], points[-1][1], slope, monotonic)
+
+
+class SoakRunner:
+    """Runs recording cycles and samples resource usage over time."""
+
+    def __init__(
+        self,
+        url,
+        duration=7200.0,
+        max_cycles=0,
+        cycle_seconds=30.0,
+        pause_seconds=5.0,
+        cleanup_every=10,
+        audio_file=None,
+        sample_interval=10.0,
+        output_dir="logs/soak",
+        memory_profiler: Optional[MemoryProfiler] = None,
+    ):
+        """Initialize the runner.
+
+        Args:
+            url: Server URL
+            duration: Total run time in seconds
+            max_cycles: Stop after this many cycles (0 = run for the duration)
+            cycle_seconds: Streaming time per recording cycle
+            pause_seconds: Idle time between cycles
+            cleanup_every: Run WhisperWebSocket.cleanup() after this many cycles
+                           (0 = never)
+            audio_file: Audio file to stream (looped), synthetic noise if None
+            sample_interval: Seconds between resource samples
+            output_dir: Directory for samples and summary
+            memory_profiler: Started for the run and stopped at the end
+
+        """
+        self.url = url
+        self.duration = duration
+        self.max_cycles = max_cycles
+        self.cycle_seconds = cycle_seconds
+        self.pause_seconds = pause_seconds
+        self.cleanup_every = cleanup_every
+        self.audio_file = audio_file
+        self.sample_interval = sample_interval
+        self.output_dir = output_dir
+        self.memory_profiler = memory_profiler
+        self.samples: List[Dict[str, Optional[float]]] = []
+        self.cycles = 0
+        self.cleanups = 0
+        self.errors: List[str] = []
+        self.stop_event = threading.Event()
+
+        self.text_manager = TextManager(test_mode=True)
+        self.websocket = WhisperWebSocket(url=url)
+        self.websocket.set_text_callback(self.text_manager.process_segments)
+        self.audio_processor = AudioProcessor()
+        self.websocket.set_replay_callback(self.audio_processor.mark_discontinuity)
+        self.audio_manager = AudioManager(source=self._create_source())
+        self.start_time = 0.0
+
+    def _create_source(self):
+        if self.audio_file:
+            return FileSource(self.audio_file, loop=True)
+        return SyntheticSource("noise")
+
+    def sample(self):
+        """Record one resource sample."""
+        self.samples.append(
+            {
+                "time": time.time() - self.start_time,
+                "threads": threading.active_count(),
+                "rss_bytes": process_rss(),
+                "sockets": open_sockets(),
+                "queue_depth": self.audio_processor.processing_queue.qsize(),
+                "window_buffer": len(self.audio_processor.tumbling_window.buffer),
+                "text_buffer": len(self.text_manager.text_buffer.buffer),
+                "ws_instances": ConnectionManager.get_instance_count(),
+            }
+        )
+
+    def _sample_loop(self):
+        while not self.stop_event.wait(self.sample_interval):
+            self.sample()
+
+    def _on_processed_audio(self, window):
+        self.websocket.send_audio(window, capture_time=self.audio_processor.last_capture_time)
+
+    def _cycle(self):
+        """One recording cycle, mirroring WhisperClient.toggle_recording."""
+        if not self.websocket.is_ready() and not self.websocket.connect():
+            raise RuntimeError("Could not connect to server")
+
+        self.websocket.start_processing()
+        self.audio_processor.start_processing(self._on_processed_audio)
+        self.audio_manager.start_recording(
+            self.audio_processor.process_audio, self.audio_processor.mark_discontinuity
+        )
+        self.stop_event.wait(self.cycle_seconds)
+
+        self.audio_manager.stop_recording()
+        self.audio_processor.stop_processing()
+        self.websocket.stop_processing()
+        # Collected sentences would otherwise grow for the whole run
+        self.text_manager.get_test_output()
+        self.cycles += 1
+
+        if self.cleanup_every and self.cycles % self.cleanup_every == 0:
+            self.websocket.cleanup()
+            self.cleanups += 1
+
+    def run(self):
+        """Run cycles until the duration is over and return the summary."""
+        self.start_time = time.time()
+        if self.memory_profiler:
+            self.memory_profiler.start()
+        self.sample()
+        sampler = threading.Thread(target=self._sample_loop, name="SoakSampler")
+        sampler.daemon = True
+        sampler.start()
+
+        log_info(logger, "🧪 Soak test for %.0fs against %s", self.duration, self.url)
+        deadline = self.start_time + self.duration
+        try:
+            while time.time() < deadline and not self.stop_event.is_set():
+                if self.max_cycles and self.cycles + len(self.errors) >= self.max_cycles:
+                    break
+                try:
+                    self._cycle()
+                except Exception as e:
+                    self.errors.append(f"{time.time() - self.start_time:.0f}s: {e}")
+                    log_error(logger, "⚠️ Soak cycle %d failed: %s", self.cycles + 1, e)
+                self.stop_event.wait(self.pause_seconds)
+        except KeyboardInterrupt:
+            log_warning(logger, "Soak test interrupted")
+        finally:
+            self.stop_event.set()
+            sampler.join()
+            self.audio_manager.cleanup()
+            self.websocket.cleanup()
+            self.text_manager.close()
+            self.sample()
+            if self.memory_profiler:
+                self.memory_profiler.stop()
+
+        return self.summary()
+
+    def trends(self) -> List[GrowthResult]:
+        """Growth analysis of every sampled series."""
+        times = [s["time"] for s in self.samples]
+        return [
+            detect_growth(name, times, [s[name] for s in self.samples], min_growth=MIN_GROWTH[name])
+            for name in SERIES
+        ]
+
+    def summary(self):
+        trends = self.trends()
+        return {
+            "duration": time.time() - self.start_time,
+            "cycles": self.cycles,
+            "connections": self.websocket.connection_count,
+            "cleanups": self.cleanups,
+            "errors": self.errors,
+            "samples": len(self.samples),
+            "trends": [t.to_dict() for t in trends],
+            "flagged": [t.name for t in trends if t.monotonic],
+        }
+
+    def write(self, summary):
+        """Write samples (CSV) and summary (JSON) to the output directory."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        stem = os.path.join(self.output_dir, f"soak_{datetime.now():%Y%m%d-%H%M%S}")
+        with open(stem + "_samples.csv", "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=("time",) + SERIES)
+            writer.writeheader()
+            writer.writerows(self.samples)
+        with open(stem + "_summary.json", "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        return stem
+
+
+def format_summary(summary):
+    """Formats the summary as a human readable report."""
+    lines = [
+        f"Duration: {summary['duration']:.0f}s, {summary['cycles']} cycles, "
+        f"{summary['connections']} connections, {summary['cleanups']} cleanups, "
+        f"{len(summary['errors'])} errors, "
+        f"{summary['samples']} samples",
+        "",
+        f"{'Series':<15}{'First':>14}{'Last':>14}{'Slope/h':>14}  Trend",
+    ]
+    for trend in summary["trends"]:
+        lines.append(
+            f"{trend['name']:<15}{trend['first']:>14.0f}{trend['last']:>14.0f}"
+            f"{trend['slope_per_hour']:>+14.1f}  "
+            f"{'⚠️ GROWING' if trend['monotonic_growth'] else 'ok'}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    import argparse
+
+    get_logger()
+
+    parser = argparse.ArgumentParser(description="Run a multi-hour soak test")
+    parser.add_argument("--duration", type=float, default=7200.0, help="Run time in seconds")
+    parser.add_argument(
+        "--cycles", type=int, default=0, help="Stop after N cycles (0 = run for the duration)"
+    )
+    parser.add_argument("--cycle", type=float, default=30.0, help="Streaming seconds per cycle")
+    parser.add_argument("--pause", type=float, default=5.0, help="Idle seconds between cycles")
+    parser.add_argument(
+        "--cleanup-every", type=int, default=10, help="Full cleanup after N cycles (0 = never)"
+    )
+    parser.add_argument("--file", help="Audio file to stream (default: synthetic noise)")
+    parser.add_argument("--url", help="WhisperLive server URL (default: local fake server)")
+    parser.add_argument(
+        "--sample-interval", type=float, default=10.0, help="Seconds between samples"
+    )
+    parser.add_argument("--output-dir", default="logs/soak", help="Output directory")
+    parser.add_argument(
+        "--memory-profile", action="store_true", help="Run the tracemalloc memory profiler"
+    )
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if not url:
+        from tools.fake_server import FakeServerConfig, FakeWhisperServer
+
+        server = FakeWhisperServer(FakeServerConfig()).start()
+        url = server.url
+
+    try:
+        runner = SoakRunner(
+            url,
+            duration=args.duration,
+            max_cycles=args.cycles,
+            cycle_seconds=args.cycle,
+            pause_seconds=args.pause,
+            cleanup_every=args.cleanup_every,
+            audio_file=args.file,
+            sample_interval=args.sample_interval,
+            output_dir=args.output_dir,
+            memory_profiler=MemoryProfiler() if args.memory_profile else None,
+        )
+        summary = runner.run()
+    finally:
+        if server:
+            server.stop()
+
+    stem = runner.write(summary)
+    print(format_summary(summary))
+    print(f"\nSamples and summary: {stem}_*")
+    sys.exit(1 if summary["flagged"] else 0)
+
+
+if __name__ == "__main__":
+    main()